@@ -3,7 +3,9 @@
 from flask import Flask
 from flask_cors import CORS
 from app.config import config
-from app.utils.data_loader import populate_database, ac_engine, gse_engine, init_db_engines
+from app.utils.data_loader import (
+    populate_database_if_changed, get_engine, init_db_engines, start_readiness_check
+)
 
 def create_app(config_name="default"):
     """Application factory function that creates and configures the Flask app.
@@ -36,10 +38,13 @@ def create_app(config_name="default"):
         if not app.config["TESTING"]:
             print("Populating databases...")
             try:
-                populate_database("ac_data.csv", ac_engine, "ac_data")
-                populate_database("gse_data.csv", gse_engine, "gse_data")
+                # Only rebuilds tables whose CSV changed since the last load
+                populate_database_if_changed("ac_data.csv", get_engine("ac"), "ac_data")
+                populate_database_if_changed("gse_data.csv", get_engine("gse"), "gse_data")
             except Exception as e:
                 print(f"Error populating databases: {e}")
+            # Confirm every queryable table once, off the request path
+            start_readiness_check(app)
         else:
             print("Skipping database population for testing environment")
 
@@ -15,6 +15,14 @@ class Config:
                               f"sqlite:///{os.path.join(DATA_DIR, 'ac_data.db')}")
     GSE_DB_URI = os.environ.get('GSE_DB_CONNECTION_STRING', 
                                f"sqlite:///{os.path.join(DATA_DIR, 'gse_data.db')}")
+    
+    # Connection pool per database engine (see app.utils.data_loader.create_db_engine)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = 30
+    DB_POOL_RECYCLE = 3600
+    # Pragmas for new SQLite connections; None uses the data loader defaults (WAL, mmap, cache)
+    SQLITE_PRAGMAS = None
 
 class DevelopmentConfig(Config):
     """Development configuration."""
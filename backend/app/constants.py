@@ -5,6 +5,8 @@ import pandas as pd
 # ===========================
 # 📌 HYDROGEN UTILIZATION CONSTANTS
 # ===========================
+DEFAULT_CARRIER = "DL"  # BTS UNIQUE_CARRIER code analysed by default (Delta)
+DEFAULT_AIRPORT = "ATL"  # BTS ORIGIN airport analysed by default
 DELTA_PART_FLIGHTS = 0.67  # Percentage of flights departed from ATL that are operated by Delta
 DELTA_PART_DOMESTIC = 0.89 # Percentage of flights operated by Delta from ATl that are domestic
 HYDROGEN_FLIGHT_FRACTION = 0.3  # Fraction of flights converted to H2
@@ -33,6 +35,17 @@ growth_rate_data = pd.DataFrame({
     ]
 })
 
+# ===========================
+# 📌 GSE FUEL PROPERTIES
+# ===========================
+# "H2 Volume Ratio": fuel volume per unit volume of H2 with the same energy
+# "Density (lb/ft3)": used to convert fuel volume to weight
+GSE_FUEL_PROPERTIES = pd.DataFrame({
+    "Fuel used": ["Diesel", "Gasoline"],
+    "H2 Volume Ratio": [2.81, 2.76],
+    "Density (lb/ft3)": [52.28, 46.38]
+}).set_index("Fuel used")
+
 # ===========================
 # 📌 STORAGE TANK CONSTANTS
 # ===========================
@@ -1,7 +1,16 @@
 # File: backend/app/routes/buffer_zones.py
 from flask import Blueprint, jsonify, request, current_app
-from app.services.buffer_zone_service import generate_buffer_zones, calculate_available_storage_areas
+import numpy as np
+from app.services.buffer_zone_service import (
+    get_buffer_zones_payload, calculate_available_storage_areas, calculate_storage_compliance_sweep
+)
+from app.services.map_layer_service import layer_payload_from_args
 from app.utils.response import APIResponse
+from app.utils.http_cache import conditional_response
+from app.utils.validation import ValidationError
+
+# Upper bound on the number of volumes in one compliance sweep
+MAX_VOLUME_SWEEP = 1000
 
 buffer_zones_bp = Blueprint("buffer_zones", __name__)
 
@@ -10,12 +19,25 @@ def get_buffer_zones():
     """
     API endpoint to retrieve buffer zones around hazardous facilities.
     Returns a GeoJSON FeatureCollection of buffer zones.
+
+    Buffers are only regenerated when the facilities or distance requirements change;
+    clients sending a matching If-None-Match get 304 Not Modified.
+
+    Query parameters:
+        tolerance: Optional simplification in feet, or
+        zoom: Optional web map zoom level used to pick the simplification
+        bbox: Optional minx,miny,maxx,maxy (WGS84) the buffers must intersect
+        amenity: Optional amenity type of the facilities whose buffers are kept
     """
     try:
-        buffer_geojson = generate_buffer_zones()
-        if not buffer_geojson or "features" not in buffer_geojson:
-            raise ValueError("Invalid buffer zones data generated.")
-        return jsonify(buffer_geojson)  # Return the GeoJSON directly
+        payload = layer_payload_from_args("buffers", request.args)
+        if payload is not None:
+            return conditional_response(payload["body"], payload["etag"], variants=payload["variants"])
+
+        body, etag = get_buffer_zones_payload()
+        return conditional_response(body, etag)  # Return the GeoJSON directly
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
     except Exception as e:
         current_app.logger.error(f"Error in get_buffer_zones: {str(e)}")
         return APIResponse.error(f"Error retrieving buffer zones: {str(e)}", 500)
@@ -43,4 +65,61 @@ def analyze_storage_areas():
     
     except Exception as e:
         current_app.logger.error(f"Error in storage area analysis: {str(e)}")
-        return APIResponse.error(f"Error analyzing storage areas: {str(e)}", 500)
\ No newline at end of file
+        return APIResponse.error(f"Error analyzing storage areas: {str(e)}", 500)
+
+def parse_volume_sweep(args):
+    """
+    Read the storage volumes of a compliance sweep from query parameters.
+
+    Either storage_volumes_gal (comma-separated list) or volume_start, volume_stop and
+    volume_step (inclusive range) must be given.
+    """
+    if args.get("storage_volumes_gal"):
+        try:
+            volumes = [float(value) for value in args["storage_volumes_gal"].split(",") if value.strip()]
+        except ValueError:
+            raise ValidationError("storage_volumes_gal must be a comma-separated list of numbers")
+    elif all(args.get(param) for param in ("volume_start", "volume_stop", "volume_step")):
+        start = args.get("volume_start", type=float)
+        stop = args.get("volume_stop", type=float)
+        step = args.get("volume_step", type=float)
+        if start is None or stop is None or step is None:
+            raise ValidationError("volume_start, volume_stop and volume_step must be numbers")
+        if step <= 0:
+            raise ValidationError("volume_step must be positive")
+        if stop < start:
+            raise ValidationError("volume_stop cannot be less than volume_start")
+        if (stop - start) / step >= MAX_VOLUME_SWEEP:
+            raise ValidationError(f"Volume sweep cannot have more than {MAX_VOLUME_SWEEP} values")
+        volumes = np.arange(start, stop + step / 2, step).tolist()
+    else:
+        raise ValidationError("Provide storage_volumes_gal or volume_start, volume_stop and volume_step")
+
+    if not volumes:
+        raise ValidationError("storage_volumes_gal cannot be empty")
+    if len(volumes) > MAX_VOLUME_SWEEP:
+        raise ValidationError(f"Volume sweep cannot have more than {MAX_VOLUME_SWEEP} values")
+    if any(not np.isfinite(volume) or volume <= 0 for volume in volumes):
+        raise ValidationError("Storage volumes must be positive numbers")
+    return volumes
+
+@buffer_zones_bp.route("/storage-area-analysis/sweep", methods=["GET"])
+def analyze_storage_areas_sweep():
+    """
+    API endpoint to check potential storage areas against a range of storage volumes.
+
+    Available areas are computed once; the response holds a sites x volumes compliance matrix.
+
+    Query parameters:
+        storage_volumes_gal: Comma-separated hydrogen storage volumes in gallons, or
+        volume_start, volume_stop, volume_step: Inclusive range of volumes in gallons
+    """
+    try:
+        storage_volumes_gal = parse_volume_sweep(request.args)
+        return jsonify(calculate_storage_compliance_sweep(storage_volumes_gal))
+
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        current_app.logger.error(f"Error in storage area sweep: {str(e)}")
+        return APIResponse.error(f"Error analyzing storage areas: {str(e)}", 500)
@@ -4,6 +4,8 @@
 from flask import Blueprint, request, jsonify
 from app.services.economic_service import calculate_economic_impact, EconomicCalculationError
 from app.utils.response import APIResponse
+from app.utils.validation import validate_optional_code, ValidationError
+from app.constants import DEFAULT_CARRIER, DEFAULT_AIRPORT
 from datetime import datetime  # Import datetime for current year
 
 
@@ -35,7 +37,14 @@ def get_economic_impact():
             turn_time_decrease_rates = data.get("turnTimeDecreaseRates", [0, 1, 2, 3, 4, 5])
             # Extract final_h2_year from request, defaulting to end_year if not provided.
             final_h2_year = int(data.get("finalH2Year", end_year))
+            # Carrier (BTS UNIQUE_CARRIER code) and departure airport to analyse
+            validate_optional_code(data.get("carrier"), "carrier")
+            validate_optional_code(data.get("airport"), "airport")
+            carrier = data.get("carrier") or DEFAULT_CARRIER
+            airport = data.get("airport") or DEFAULT_AIRPORT
                
+        except ValidationError as e:
+            return APIResponse.error(str(e), 400)
         except (ValueError, TypeError) as e:
             return APIResponse.error(f"Invalid parameter format: {str(e)}", 400)
 
@@ -53,7 +62,9 @@ def get_economic_impact():
             growth_rate=growth_rate,
             extra_turn_time=extra_turn_time,
             turn_time_decrease_rates=turn_time_decrease_rates,
-            final_h2_year=final_h2_year
+            final_h2_year=final_h2_year,
+            carrier=carrier,
+            airport=airport
         )
 
 
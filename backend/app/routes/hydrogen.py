@@ -4,14 +4,16 @@ from flask import Blueprint, request
 from app.utils.data_loader import load_data_from_db
 
 from app.services.hydrogen_service import (
-    compute_h2_demand_ac, compute_h2_demand_gse,
+    compute_h2_demand_ac, compute_h2_demand_ac_batch,
+    compute_h2_demand_gse, compute_h2_demand_gse_bulk,
     compute_storage_area, compute_emissions
 )
 from app.utils.response import APIResponse
 from app.utils.validation import (
     validate_required_params, validate_numeric_range,
-    validate_year, validate_gse_list, ValidationError
+    validate_year, validate_gse_list, validate_optional_code, ValidationError
 )
+from app.constants import DEFAULT_CARRIER, DEFAULT_AIRPORT
 from typing import Dict, Any
 
 hydrogen_bp = Blueprint('hydrogen', __name__)
@@ -21,8 +23,9 @@ def get_gse_options():
     """API to fetch available GSE types from the database."""
     try:
         # Load unique GSE names from the database
-        gse_data = load_data_from_db("gse_data")
-        gse_types = gse_data["Ground support Equipment"].unique().tolist()
+        gse_types = load_data_from_db(
+            "gse_data", columns=["Ground support Equipment"], distinct=True
+        )["Ground support Equipment"].tolist()
 
         return APIResponse.success(
             data=gse_types,
@@ -48,6 +51,10 @@ def validate_h2_demand_ac_params(data: Dict[str, Any]) -> None:
         end_year = data.get("end_year")
         validate_year(end_year)
 
+        # Validate optional carrier/airport selection
+        validate_optional_code(data.get("carrier"), "carrier")
+        validate_optional_code(data.get("airport"), "airport")
+
     except ValidationError as e:
         raise ValidationError(f"Invalid parameters: {str(e)}")
 
@@ -65,7 +72,9 @@ def h2_demand_ac():
         # Compute hydrogen demand
         h2_demand_vol_day, fuel_weight_projected = compute_h2_demand_ac(
             slider_perc=data["slider_perc"],
-            end_year=data["end_year"]
+            end_year=data["end_year"],
+            carrier=data.get("carrier") or DEFAULT_CARRIER,
+            airport=data.get("airport") or DEFAULT_AIRPORT
         )
         
         return APIResponse.success(
@@ -85,6 +94,70 @@ def h2_demand_ac():
             500
         )
 
+def validate_h2_demand_ac_batch_params(data: Dict[str, Any]) -> None:
+    """Validate parameters for batched aircraft hydrogen demand calculation."""
+    try:
+        # Check required parameters
+        validate_required_params(data, ["slider_percs", "end_years"])
+
+        # Validate every slider percentage
+        slider_percs = data.get("slider_percs")
+        if not isinstance(slider_percs, list):
+            raise ValidationError("slider_percs must be an array")
+        for slider_perc in slider_percs:
+            validate_numeric_range(slider_perc, 0, 1, "slider_perc")
+
+        # Validate every end year
+        end_years = data.get("end_years")
+        if not isinstance(end_years, list):
+            raise ValidationError("end_years must be an array")
+        for end_year in end_years:
+            validate_year(end_year)
+
+        # Validate optional carrier/airport selection
+        validate_optional_code(data.get("carrier"), "carrier")
+        validate_optional_code(data.get("airport"), "airport")
+
+    except ValidationError as e:
+        raise ValidationError(f"Invalid parameters: {str(e)}")
+
+@hydrogen_bp.route('/h2_demand/ac/batch', methods=['POST'])
+def h2_demand_ac_batch():
+    """API to compute aircraft Hydrogen demand for a grid of slider/year values."""
+    try:
+        data = request.json
+        if not data:
+            return APIResponse.error("No data provided", 400)
+
+        # Validate input parameters
+        validate_h2_demand_ac_batch_params(data)
+
+        # Compute the full slider x year matrix in one pass
+        h2_demand_vol_day, fuel_weight_projected = compute_h2_demand_ac_batch(
+            slider_percs=data["slider_percs"],
+            end_years=data["end_years"],
+            carrier=data.get("carrier") or DEFAULT_CARRIER,
+            airport=data.get("airport") or DEFAULT_AIRPORT
+        )
+
+        return APIResponse.success(
+            data={
+                "slider_percs": data["slider_percs"],
+                "end_years": data["end_years"],
+                "daily_h2_demand_ft3": h2_demand_vol_day.tolist(),
+                "projected_fuel_weight_lb": fuel_weight_projected.tolist()
+            },
+            message="Successfully calculated aircraft hydrogen demand batch"
+        )
+
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error(
+            "An error occurred while calculating hydrogen demand",
+            500
+        )
+
 def validate_h2_demand_gse_params(data: Dict[str, Any]) -> None:
     """Validate parameters for GSE hydrogen demand calculation."""
     try:
@@ -149,6 +222,49 @@ def h2_demand_gse():
         )
 
 
+@hydrogen_bp.route('/h2_demand/gse/bulk', methods=['POST'])
+def h2_demand_gse_bulk():
+    """
+    API to compute GSE Hydrogen demand for every subset of the selected GSE.
+
+    The response has 2**n rows for n GSE types (at most MAX_BULK_GSE). Omitting
+    gse_list combines every GSE in the database: with the current 14 types that is
+    16,384 subsets, a response of about 6.5 MB.
+    """
+    try:
+        data = request.json
+        if not data:
+            return APIResponse.error("No data provided", 400)
+
+        # gse_list is optional here: omit it to combine every available GSE
+        gse_list = data.get("gse_list")
+        try:
+            validate_required_params(data, ["end_year"])
+            if gse_list is not None:
+                validate_gse_list(gse_list)
+            validate_year(data["end_year"])
+        except ValidationError as e:
+            raise ValidationError(f"Invalid parameters: {str(e)}")
+
+        subsets = compute_h2_demand_gse_bulk(
+            gse_list=gse_list,
+            end_year=data["end_year"]
+        )
+
+        return APIResponse.success(
+            data=subsets,
+            message="Successfully calculated GSE hydrogen demand for all subsets"
+        )
+
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        return APIResponse.error(
+            "An error occurred while calculating GSE hydrogen demand",
+            500
+        )
+
+
 def validate_storage_area_params(data: Dict[str, Any]) -> None:
     """Validate parameters for storage area calculation."""
     try:
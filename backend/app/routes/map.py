@@ -1,22 +1,42 @@
 # File: backend/app/routes/map.py
-import os
-import json
-from flask import Blueprint, jsonify
+from flask import Blueprint, jsonify, request
 from flask import current_app as app
+from app.services.map_layer_service import MAP_LAYERS, layer_payload_from_args
+from app.services.tile_service import get_tile, TileRequestError, UnknownTileLayerError
+from app.utils.http_cache import file_response, conditional_response
+from app.utils.response import APIResponse
+from app.utils.validation import ValidationError
 
 map_bp = Blueprint('map', __name__)
 
+def layer_response(layer):
+    """
+    Serve a map layer, simplified with `tolerance` (feet) or `zoom` and filtered with
+    `bbox` (minx,miny,maxx,maxy) and `amenity` when given.
+    """
+    payload = layer_payload_from_args(layer, request.args)
+    if payload is None:
+        return file_response(MAP_LAYERS[layer]())
+    return conditional_response(payload["body"], payload["etag"], variants=payload["variants"])
+
 @map_bp.route("/available-areas", methods=["GET"])
 def get_available_areas():
     """
     Serve the GeoJSON file containing hydrogen storage area compliance data.
+
+    The file bytes are served as-is (gzip/brotli when accepted) with ETag and
+    Last-Modified headers, and only re-read when the file changes.
+
+    Query parameters:
+        tolerance: Optional simplification in feet, or
+        zoom: Optional web map zoom level used to pick the simplification
+        bbox: Optional minx,miny,maxx,maxy (WGS84) the features must intersect
+        amenity: Optional amenity type to keep
     """
     try:
-        # Build the file path relative to this file’s directory
-        file_path = os.path.join(os.path.dirname(__file__), "../../data/geojson/atl_areas.geojson")
-        with open(file_path, "r", encoding="utf-8") as f:
-            geojson_data = json.load(f)
-        return jsonify(geojson_data)
+        return layer_response("available_areas")
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -26,24 +46,42 @@ def get_facilities():
     Serve the GeoJSON file containing facilities data.
     """
     try:
-        file_path = os.path.join(os.path.dirname(__file__), "../../data/geojson/facilities.geojson")
-        with open(file_path, "r", encoding="utf-8") as f:
-            geojson_data = json.load(f)
-        return jsonify(geojson_data)
+        return layer_response("facilities")
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
     except Exception as e:
         app.logger.error(f"Error loading facilities.geojson: {str(e)}")
         return jsonify({"error": str(e)}), 500
-    
+
 @map_bp.route("/safety_buffers", methods=["GET"])
 def get_safety_buffer():
     """
     Serve the GeoJSON file containing facilities data.
     """
     try:
-        file_path = os.path.join(os.path.dirname(__file__), "../../data/geojson/safety_buffers.geojson")
-        with open(file_path, "r", encoding="utf-8") as f:
-            geojson_data = json.load(f)
-        return jsonify(geojson_data)
+        return layer_response("safety_buffers")
+    except ValidationError as e:
+        return APIResponse.error(str(e), 400)
     except Exception as e:
         app.logger.error(f"Error loading facilities.geojson: {str(e)}")
-        return jsonify({"error": str(e)}), 500
\ No newline at end of file
+        return jsonify({"error": str(e)}), 500
+
+@map_bp.route("/tiles/<layer>/<int:z>/<int:x>/<int:y>.pbf", methods=["GET"])
+def get_vector_tile(layer, z, x, y):
+    """
+    Serve a Mapbox Vector Tile of a map layer (facilities, buffers or available_areas).
+
+    Tiles are clipped and simplified for their zoom level and cached in memory.
+    """
+    try:
+        tile = get_tile(layer, z, x, y)
+        return conditional_response(
+            tile["body"], tile["etag"], mimetype="application/vnd.mapbox-vector-tile", variants=tile["variants"]
+        )
+    except UnknownTileLayerError as e:
+        return APIResponse.error(str(e), 404)
+    except TileRequestError as e:
+        return APIResponse.error(str(e), 400)
+    except Exception as e:
+        app.logger.error(f"Error rendering tile {layer}/{z}/{x}/{y}: {str(e)}")
+        return APIResponse.error(f"Error rendering tile: {str(e)}", 500)
@@ -1,6 +1,9 @@
 # File: backend/app/services/buffer_zone_service.py
 import os
 import json
+import hashlib
+import threading
+import numpy as np
 import pandas as pd
 import geopandas as gpd
 from flask import current_app
@@ -10,39 +13,138 @@ from shapely.ops import transform
 from pyproj import Transformer
 import shapely
 import pyproj
+from shapely import STRtree
 
-from app.services.zoning_violations_service import load_facilities_data, load_distances_requirements_data
+from app.services.zoning_violations_service import (
+    load_distances_requirements_data, FACILITIES_GEOJSON_PATH, LOCAL_CRS, STORAGE_AMENITIES
+)
+from app.utils.geo_cache import load_compiled_geojson, load_geodataframe, write_atomic
 
-def save_buffer_zones(geojson_data, filename="buffer_zones.geojson"):
+BUFFER_ZONES_PATH = os.path.join(os.path.dirname(__file__), "../../data/geojson/buffer_zones.geojson")
+
+# Inputs that fully determine the generated buffer zones
+BUFFER_SOURCE_FILES = [
+    FACILITIES_GEOJSON_PATH,
+    os.path.join(os.path.dirname(__file__), "../../data/distances_requirements.csv"),
+]
+
+# Transformers between WGS84 and the local CRS (feet), built once
+TO_LOCAL_CRS = Transformer.from_crs("EPSG:4326", LOCAL_CRS, always_xy=True)
+FROM_LOCAL_CRS = Transformer.from_crs(LOCAL_CRS, "EPSG:4326", always_xy=True)
+
+# {"signature": stat signature, "source_hash": str, "body": bytes, "etag": str}
+_buffer_cache = {}
+_buffer_cache_lock = threading.Lock()
+
+# {"etag": str, "features": list, "geometries": ndarray in LOCAL_CRS, "tree": STRtree}
+_buffer_index = {}
+
+def _sources_signature():
+    """Cheap (mtime, size) signature of the buffer source files."""
+    signature = []
+    for path in BUFFER_SOURCE_FILES:
+        stat = os.stat(path)
+        signature.append((path, stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+def buffer_source_hash():
     """
-    Save the buffer zones GeoJSON to a file in the geojson data directory.
-    
+    Hash the files buffer zones are generated from.
+
+    Returns:
+        str: sha256 hex digest over facilities.geojson and distances_requirements.csv
+    """
+    digest = hashlib.sha256()
+    for path in BUFFER_SOURCE_FILES:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.sha256(f.read()).digest())
+    return digest.hexdigest()
+
+def save_buffer_zones(body, source_hash, filepath=None):
+    """
+    Save serialized buffer zones and the hash of the sources they were generated from.
+
     Args:
-        geojson_data (dict): The GeoJSON data to save
-        filename (str): The name of the file to save
+        body (bytes): Serialized GeoJSON FeatureCollection
+        source_hash (str): buffer_source_hash() of the inputs
+        filepath (str, optional): Output path. Defaults to BUFFER_ZONES_PATH.
     """
-    output_dir = os.path.join(current_app.root_path, '..', 'data', 'geojson')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    filepath = os.path.join(output_dir, filename)
-    with open(filepath, 'w') as f:
-        json.dump(geojson_data, f, indent=2)
-    
+    filepath = filepath or BUFFER_ZONES_PATH
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+    write_atomic(filepath, body)
+    write_atomic(filepath + ".sha256", source_hash.encode("ascii"))
+
     current_app.logger.info(f"Buffer zones saved to: {filepath}")
     return filepath
 
+def _load_saved_buffer_zones(source_hash, filepath=None):
+    """Return the saved buffer zone bytes if they were generated from source_hash, else None."""
+    filepath = filepath or BUFFER_ZONES_PATH
+    try:
+        with open(filepath + ".sha256", 'r', encoding='ascii') as f:
+            if f.read().strip() != source_hash:
+                return None
+        with open(filepath, 'rb') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def get_buffer_zones_payload():
+    """
+    Return the serialized buffer zones, generating them only when their sources change.
+
+    The result is memoized on a hash of facilities.geojson and distances_requirements.csv,
+    in memory and in buffer_zones.geojson (with a .sha256 sidecar holding the source hash).
+
+    Returns:
+        tuple: (GeoJSON bytes, ETag for the bytes)
+    """
+    signature = _sources_signature()
+    with _buffer_cache_lock:
+        if _buffer_cache.get("signature") != signature:
+            source_hash = buffer_source_hash()
+            if _buffer_cache.get("source_hash") != source_hash:
+                body = _load_saved_buffer_zones(source_hash)
+                if body is None:
+                    body = json.dumps(generate_buffer_zones(), separators=(",", ":")).encode("utf-8")
+                    save_buffer_zones(body, source_hash)
+                _buffer_cache.update(
+                    source_hash=source_hash,
+                    body=body,
+                    etag=hashlib.sha256(body).hexdigest()
+                )
+            _buffer_cache["signature"] = signature
+        return _buffer_cache["body"], _buffer_cache["etag"]
+
+def clear_buffer_zones_cache():
+    """Drop the in-memory buffer zones so the next request re-checks the disk copy."""
+    with _buffer_cache_lock:
+        _buffer_cache.clear()
+        _buffer_index.clear()
+
+def _parse_distance_requirements(raw_dr):
+    """Return a facility's distance_requirements as a dict."""
+    if isinstance(raw_dr, str):
+        try:
+            return json.loads(raw_dr)
+        except Exception:
+            return {}
+    if isinstance(raw_dr, dict):
+        return raw_dr
+    return {}
+
 def generate_buffer_zones():
     """
     Generate buffer zones around hazardous facilities with a separate buffer for each hazard category
     (people, flammable liquids, open fire).
     The calculation is performed in EPSG:2240 (feet) and the result is transformed to EPSG:4326 (degrees).
+    Nothing is written to disk; get_buffer_zones_payload caches and persists the result.
     
     Returns:
         dict: A GeoJSON FeatureCollection with buffer zones in EPSG:4326.
     """
     try:
-        facilities_geojson = load_facilities_data()
-        gdf = gpd.GeoDataFrame.from_features(facilities_geojson['features'], crs="EPSG:4326")
+        gdf = load_geodataframe(FACILITIES_GEOJSON_PATH)
         gdf = gdf.to_crs("EPSG:2240")
 
         if gdf.empty:
@@ -60,62 +162,189 @@ def generate_buffer_zones():
             if "open fire" in info:
                 max_required["contains_open_fire"] = max(max_required["contains_open_fire"], rd_ft)
 
-        buffer_features = []
+        hazard_keys = [key for key, distance_ft in max_required.items() if distance_ft > 0]
+        missing = pd.Series([None] * len(gdf), index=gdf.index)
+        requirements_by_facility = [_parse_distance_requirements(raw_dr) for raw_dr in gdf.get("distance_requirements", missing)]
+        facility_names = [name or facility_id for name, facility_id in zip(gdf.get("name", missing), gdf.get("id", missing))]
+
+        # (facility position, hazard key) for every buffer, facility by facility
+        positions, buffer_hazards = [], []
         seen = set()  # To prevent duplicates
+        for pos, (facility_name, dr) in enumerate(zip(facility_names, requirements_by_facility)):
+            for hazard_key in hazard_keys:
+                if dr.get(hazard_key) is True:
+                    buffer_id = f"{facility_name}_{hazard_key}"
+                    if buffer_id not in seen:
+                        positions.append(pos)
+                        buffer_hazards.append(hazard_key)
+                        seen.add(buffer_id)
 
-        def create_buffer_feature(row, hazard_key, buffer_distance_ft):
-            buffer_geom = row.geometry.buffer(buffer_distance_ft)
-            buffer_geom = buffer_geom.simplify(0.1)
-            buffer_geom_4326 = gpd.GeoSeries([buffer_geom], crs="EPSG:2240").to_crs("EPSG:4326").iloc[0]
-            return {
+        if not positions:
+            raise ValueError("No buffer zones could be generated.")
+
+        # Buffer, simplify and reproject every buffer in one pass
+        buffer_distances_ft = [max_required[hazard_key] for hazard_key in buffer_hazards]
+        buffers = gpd.GeoSeries(gdf.geometry.values[positions], crs="EPSG:2240")
+        buffers = buffers.buffer(buffer_distances_ft).simplify(0.1).to_crs("EPSG:4326")
+
+        buffer_features = [
+            {
                 "type": "Feature",
                 "properties": {
-                    "facility_name": row.get("name") or row.get("id"),
+                    "facility_name": facility_names[pos],
                     "hazard_categories": [hazard_key],
                     "buffer_distance_ft": buffer_distance_ft
                 },
-                "geometry": buffer_geom_4326.__geo_interface__
+                "geometry": buffer_geom.__geo_interface__
             }
+            for pos, hazard_key, buffer_distance_ft, buffer_geom in zip(
+                positions, buffer_hazards, buffer_distances_ft, buffers.values
+            )
+        ]
 
-        for idx, row in gdf.iterrows():
-            raw_dr = row.get("distance_requirements")
-            if isinstance(raw_dr, str):
-                try:
-                    dr = json.loads(raw_dr)
-                except Exception:
-                    dr = {}
-            elif isinstance(raw_dr, dict):
-                dr = raw_dr
-            else:
-                dr = {}
+        return {"type": "FeatureCollection", "features": buffer_features}
 
-            facility_name = row.get("name") or row.get("id")
-            print(f"\n📍 Processing facility: {facility_name}")
-            print(f"↪ Distance requirements: {dr}")
+    except Exception as e:
+        current_app.logger.error(f"Error generating buffer zones: {str(e)}")
+        raise
 
-            for hazard_key, buffer_distance_ft in max_required.items():
-                if dr.get(hazard_key) is True and buffer_distance_ft > 0:
-                    buffer_id = f"{facility_name}_{hazard_key}"
-                    if buffer_id not in seen:
-                        print(f"  ➕ Adding buffer for: {hazard_key} at {buffer_distance_ft} ft")
-                        feature = create_buffer_feature(row, hazard_key, buffer_distance_ft)
-                        buffer_features.append(feature)
-                        seen.add(buffer_id)
-                    else:
-                        print(f"  ⚠️ Duplicate detected for: {hazard_key} — skipping")
 
-        if not buffer_features:
-            raise ValueError("No buffer zones could be generated.")
+def get_buffer_index():
+    """
+    Return the current buffers projected to LOCAL_CRS with an STRtree over them.
 
-        result = {"type": "FeatureCollection", "features": buffer_features}
-        filepath = save_buffer_zones(result)
-        current_app.logger.info(f"Buffer zones saved to file: {filepath}")
-        return result
+    Rebuilt only when the buffer zone payload changes (tracked through its ETag).
 
-    except Exception as e:
-        current_app.logger.error(f"Error generating buffer zones: {str(e)}")
-        raise
+    Returns:
+        tuple: (buffer properties, projected geometries, shapely.STRtree)
+    """
+    _, etag = get_buffer_zones_payload()
+    with _buffer_cache_lock:
+        if _buffer_index.get("etag") != etag:
+            buffer_geoms, buffer_properties = load_compiled_geojson(BUFFER_ZONES_PATH)
+            buffer_geoms = project_geometries(buffer_geoms)
+            _buffer_index.update(
+                etag=etag,
+                properties=buffer_properties,
+                geometries=buffer_geoms,
+                tree=STRtree(buffer_geoms)
+            )
+        return _buffer_index["properties"], _buffer_index["geometries"], _buffer_index["tree"]
+
+def compute_available_areas():
+    """
+    Compute the area left for hydrogen storage on every potential site.
+
+    Areas are projected to LOCAL_CRS (feet) once and matched against an STRtree of
+    the projected buffers; each area subtracts the union of its overlapping buffers once.
+    The result does not depend on the storage volume.
+
+    Returns:
+        dict: Potential storage area properties and WGS84 geometries, their original and
+            available areas (sq ft), available geometries in LOCAL_CRS and the overlapping
+            buffers of each area
+    """
+    buffer_properties, buffer_geoms, buffer_tree = get_buffer_index()
+    area_properties, area_geoms_4326 = load_potential_storage_sites()
+    area_geoms = project_geometries(area_geoms_4326)
+    buffer_owners = np.array([props["facility_name"] for props in buffer_properties], dtype=object)
+
+    # Intersecting (area, buffer) pairs, in area then buffer order
+    area_idx, buffer_idx = buffer_tree.query(area_geoms, predicate="intersects")
+    order = np.lexsort((buffer_idx, area_idx))
+    area_idx, buffer_idx = area_idx[order], buffer_idx[order]
+
+    # Skip buffers that belong to the area itself
+    area_names = np.array([
+        props.get("name", props.get("id")) for props in area_properties
+    ], dtype=object)
+    foreign = buffer_owners[buffer_idx] != area_names[area_idx]
+    area_idx, buffer_idx = area_idx[foreign], buffer_idx[foreign]
+    overlap_areas_sqft = shapely.area(shapely.intersection(buffer_geoms[buffer_idx], area_geoms[area_idx]))
+    pair_bounds = np.searchsorted(area_idx, np.arange(len(area_properties) + 1))
+
+    # Subtract the union of the overlapping buffers from each area
+    available_geoms = area_geoms.copy()
+    overlapping_buffers = []
+    for i in range(len(area_properties)):
+        hits = buffer_idx[pair_bounds[i]:pair_bounds[i + 1]]
+        if len(hits):
+            available_geoms[i] = area_geoms[i].difference(shapely.union_all(buffer_geoms[hits]))
+        overlapping_buffers.append([
+            {
+                "buffer_id": buffer_properties[j]["facility_name"],
+                "hazard_type": buffer_properties[j]["hazard_categories"][0],
+                "overlap_area_sqft": float(overlap_areas_sqft[k])
+            }
+            for k, j in enumerate(hits, start=pair_bounds[i])
+        ])
+
+    return {
+        "properties": area_properties,
+        "geometries": area_geoms_4326,
+        "original_areas_sqft": shapely.area(area_geoms),
+        "available_areas_sqft": shapely.area(available_geoms),
+        "available_geometries": available_geoms,
+        "overlapping_buffers": overlapping_buffers,
+    }
+
+def storage_compliance_matrix(available_areas_sqft, has_overlaps, storage_volumes_gal):
+    """
+    Vectorized compliance of every site against every storage volume.
+
+    A site is compliant when no buffer overlaps it, or when its remaining area is
+    non-zero and at least the area required for the volume.
+
+    Args:
+        available_areas_sqft (array-like): Available area per site
+        has_overlaps (array-like): Whether any safety buffer overlaps each site
+        storage_volumes_gal (array-like): Storage volumes to check
+
+    Returns:
+        tuple: (sites x volumes boolean matrix, required area per volume)
+    """
+    available = np.asarray(available_areas_sqft, dtype=float)[:, None]
+    required_areas_sqft = calculate_required_area(np.asarray(storage_volumes_gal, dtype=float))
+    fits = (available != 0) & (available >= required_areas_sqft[None, :])
+    return ~np.asarray(has_overlaps, dtype=bool)[:, None] | fits, required_areas_sqft
+
+def calculate_storage_compliance_sweep(storage_volumes_gal):
+    """
+    Check every potential storage area against a list of storage volumes.
+
+    Available areas are computed once; only the required-area comparison is repeated
+    per volume, as one broadcast.
+
+    Args:
+        storage_volumes_gal (list): Hydrogen storage volumes in gallons
+
+    Returns:
+        dict: Volumes, required areas, per-site summaries and the sites x volumes compliance matrix
+    """
+    available = compute_available_areas()
+    has_overlaps = [bool(buffers) for buffers in available["overlapping_buffers"]]
+    compliance, required_areas_sqft = storage_compliance_matrix(
+        available["available_areas_sqft"], has_overlaps, storage_volumes_gal
+    )
+
+    sites = []
+    for i, area_props in enumerate(available["properties"]):
+        sites.append({
+            "area_id": area_props.get("id"),
+            "area_name": area_props.get("name", f"Area {area_props.get('id')}"),
+            "area_type": area_props.get("amenity", "Unknown"),
+            "original_area_sqft": float(available["original_areas_sqft"][i]),
+            "available_area_sqft": float(available["available_areas_sqft"][i]),
+            "overlapping_buffers": len(available["overlapping_buffers"][i]),
+        })
 
+    return {
+        "storage_volumes_gal": [float(volume) for volume in storage_volumes_gal],
+        "required_area_sqft": required_areas_sqft.tolist(),
+        "sites": sites,
+        "compliance": compliance.tolist(),
+        "compliant_areas": compliance.sum(axis=0).tolist(),
+    }
 
 def calculate_available_storage_areas(storage_volume_gal=None):
     """
@@ -127,52 +356,20 @@ def calculate_available_storage_areas(storage_volume_gal=None):
     Returns:
         List of dictionaries containing available storage areas and compliance status
     """
-    # Step 1: Load necessary data
-    buffer_zones = load_buffer_zones()
-    potential_storage_areas = load_potential_storage_areas()
-    
+    available = compute_available_areas()
+    available_geoms_4326 = project_geometries(available["available_geometries"], FROM_LOCAL_CRS)
+    required_area_sqft = calculate_required_area(storage_volume_gal) if storage_volume_gal else None
+
     results = []
     
-    # Step 2: Process each potential storage area
-    for area in potential_storage_areas:
-        area_geom = area["geometry"]
-        area_props = area["properties"]
-        area_id = area_props["id"]
-        area_name = area_props.get("name", area_props.get("id"))
-        original_area_sqft = calculate_area_sqft(area_geom)
-        
-        # Initialize with full area
-        available_area_geom = area_geom
-        available_area_sqft = original_area_sqft
-        overlapping_buffers = []
-        
-        # Step 3: Check for overlaps with each buffer zone
-        for buffer in buffer_zones:
-            buffer_props = buffer["properties"]
-            buffer_geom = buffer["geometry"]
-            
-            # Skip if this buffer belongs to the current area
-            if buffer_props["facility_name"] == area_name:
-                continue
-            
-            # Check if buffer intersects with the area
-            if geometries_intersect(buffer_geom, area_geom):
-                # Calculate intersection (overlap)
-                overlap_geom = geometry_intersection(buffer_geom, area_geom)
-                overlap_area_sqft = calculate_area_sqft(overlap_geom)
-                
-                # Subtract overlap from available area
-                available_area_geom = geometry_difference(available_area_geom, buffer_geom)
-                available_area_sqft = calculate_area_sqft(available_area_geom)
-                
-                # Record the overlapping buffer
-                overlapping_buffers.append({
-                    "buffer_id": buffer_props["facility_name"],
-                    "hazard_type": buffer_props["hazard_categories"][0],
-                    "overlap_area_sqft": overlap_area_sqft
-                })
+    # Process each potential storage area
+    for i, area_props in enumerate(available["properties"]):
+        area_id = area_props.get("id")
+        original_area_sqft = float(available["original_areas_sqft"][i])
+        available_area_sqft = float(available["available_areas_sqft"][i])
+        overlapping_buffers = available["overlapping_buffers"][i]
         
-        # Step 4: Determine compliance status
+        # Determine compliance status
         compliance_status = "compliant"
         compliance_details = "No safety buffer overlaps"
         
@@ -183,15 +380,14 @@ def calculate_available_storage_areas(storage_volume_gal=None):
                 compliance_details = "Area completely covered by safety buffers"
             else:
                 # Check if remaining area meets minimum requirements
-                if storage_volume_gal:
-                    required_area_sqft = calculate_required_area(storage_volume_gal)
+                if required_area_sqft is not None:
                     if available_area_sqft < required_area_sqft:
                         compliance_status = "non-compliant"
                         compliance_details = f"Available area ({available_area_sqft} sq ft) is less than required ({required_area_sqft} sq ft)"
                     else:
                         compliance_details = f"Available area ({available_area_sqft} sq ft) is sufficient for storage"
         
-        # Step 5: Prepare result for this area
+        # Prepare result for this area
         area_result = {
             "area_id": area_id,
             "area_name": area_props.get("name", f"Area {area_id}"),
@@ -202,25 +398,32 @@ def calculate_available_storage_areas(storage_volume_gal=None):
             "overlapping_buffers": overlapping_buffers,
             "compliance_status": compliance_status,
             "compliance_details": compliance_details,
-            "original_geometry": area_geom,
-            "available_geometry": available_area_geom
+            "original_geometry": mapping(available["geometries"][i]),
+            "available_geometry": mapping(available_geoms_4326[i])
         }
         
         results.append(area_result)
     
     return results
 
+def load_potential_storage_sites():
+    """
+    Load potential hydrogen storage areas (free space and deicing areas) from the compiled facilities.
+
+    Returns:
+        tuple: (list of property dicts, ndarray of WGS84 geometries)
+    """
+    geometries, properties = load_compiled_geojson(FACILITIES_GEOJSON_PATH)
+    is_storage = np.array([props.get("amenity") in STORAGE_AMENITIES for props in properties], dtype=bool)
+    return [props for props, keep in zip(properties, is_storage) if keep], geometries[is_storage]
+
 def load_potential_storage_areas():
     """Load potential hydrogen storage areas (free space and deicing areas)"""
-    facilities_geojson = load_facilities_data()
-    
-    # Filter for free space and deicing areas
-    storage_areas = [
-        feature for feature in facilities_geojson["features"]
-        if feature["properties"].get("amenity") in ["Free Space", "Deicing"]
+    properties, geometries = load_potential_storage_sites()
+    return [
+        {"type": "Feature", "properties": props, "geometry": mapping(geom)}
+        for props, geom in zip(properties, geometries)
     ]
-    
-    return storage_areas
 
 def calculate_area_sqft(geometry):
     """Calculate area in square feet from a GeoJSON geometry"""
@@ -259,21 +462,28 @@ def geometry_difference(geom1, geom2):
     difference = shape(geom1).difference(shape(geom2))
     return mapping(difference)
 
+def project_geometries(geometries, transformer=TO_LOCAL_CRS):
+    """
+    Reproject shapely geometries in one vectorized pass.
+
+    Args:
+        geometries: Sequence of shapely geometries
+        transformer (Transformer): Defaults to WGS84 -> LOCAL_CRS
+
+    Returns:
+        np.ndarray: Reprojected geometries
+    """
+    def _transform_coords(coords):
+        x, y = transformer.transform(coords[:, 0], coords[:, 1])
+        return np.column_stack([x, y])
+
+    return shapely.transform(np.asarray(geometries, dtype=object), _transform_coords)
+
 def transform_to_local_crs(geom):
     """Transform geometry from WGS84 to a local projected CRS"""
-    # Create transformer from WGS84 to local CRS (e.g., Georgia State Plane)
-    transformer = Transformer.from_crs("EPSG:4326", "EPSG:2240", always_xy=True)
-    
-    # Apply transformation
-    return transform(lambda x, y: transformer.transform(x, y), geom)
+    return project_geometries([geom])[0]
 
 def load_buffer_zones():
-    """Load buffer zones data from the GeoJSON file."""
-    file_path = os.path.join(os.path.dirname(__file__), "../../data/geojson/buffer_zones.geojson")
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except FileNotFoundError:
-        raise FileNotFoundError("Buffer zones GeoJSON file not found.")
-    except json.JSONDecodeError:
-        raise ValueError("Invalid GeoJSON format in buffer zones file.")
\ No newline at end of file
+    """Load the current buffer zones, regenerating them if their sources changed."""
+    body, _ = get_buffer_zones_payload()
+    return json.loads(body)
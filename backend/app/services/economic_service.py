@@ -1,12 +1,20 @@
 # File: backend/app/services/economic_service.py
 
 
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
+import os
+import threading
+import numpy as np
 import pandas as pd
 from app.utils.validation import ValidationError
-from app.utils.data_loader import load_operational_hours, load_carrier_operations, load_income_data
+from app.utils.data_loader import (
+    load_operational_hours, load_carrier_operations, load_income_data, get_data_file_path
+)
 from datetime import datetime
-from app.constants import HYDROGEN_FLIGHT_FRACTION, EXTRA_TURNAROUND_TIME, TAX_CREDIT_PER_GALLON
+from app.constants import (
+    HYDROGEN_FLIGHT_FRACTION, EXTRA_TURNAROUND_TIME, TAX_CREDIT_PER_GALLON,
+    DEFAULT_CARRIER, DEFAULT_AIRPORT
+)
 
 
 class EconomicCalculationError(ValidationError):
@@ -14,6 +22,14 @@ class EconomicCalculationError(ValidationError):
     pass
 
 
+# BTS files the baselines are derived from
+BASELINE_SOURCE_FILES = ("utilization_data.csv", "operations_data.csv", "income_data.csv")
+
+# {"signature": tuple, "index": pd.DataFrame} for the last computed baseline index
+_baseline_cache = {}
+_baseline_cache_lock = threading.Lock()
+
+
 def validate_data(data: Dict[str, pd.DataFrame]) -> None:
     """Validate loaded data for economic calculations."""
     required_keys = ["uti_data", "operations_data", "income_data"]
@@ -52,17 +68,21 @@ def load_data() -> Dict[str, pd.DataFrame]:
 
 
 def hydrogen_uti_rev(
-    fraction_flights_year: float,
+    fraction_flights_year,
     tot_delta_flights_atl: float,
     flights_atl_to_dome: float,
-    h2_demand_annual_gal: float,
-    extra_turn_time: float,
-    total_rev: float,
-    baseline_jetA_util: float
+    h2_demand_annual_gal,
+    extra_turn_time,
+    total_rev,
+    baseline_jetA_util
 ):
     """
     Calculates the hydrogen utilization impact and required tax credit per gallon.
 
+    Every argument may be a scalar or a NumPy array; arrays are broadcast
+    against each other, so a whole (scenario x year) grid can be evaluated
+    in one call.
+
 
     Parameters
     ----------
@@ -84,8 +104,12 @@ def hydrogen_uti_rev(
     new_h2_revenue_m        : Revised revenue after H2 adoption (in millions USD).
     pct_drop                : Percentage drop in revenue.
     """
-    print(f"--------------------------------------------------------------------------------Input parameters: fraction_flights_year={fraction_flights_year}, extra_turn_time={extra_turn_time}, flights_atl_to_dome={flights_atl_to_dome}, total_rev={total_rev}")
-   
+    fraction_flights_year = np.asarray(fraction_flights_year, dtype=float)
+    h2_demand_annual_gal = np.asarray(h2_demand_annual_gal, dtype=float)
+    extra_turn_time = np.asarray(extra_turn_time, dtype=float)
+    total_rev = np.asarray(total_rev, dtype=float)
+    baseline_jetA_util = np.asarray(baseline_jetA_util, dtype=float)
+
     # Calculate utilization for hydrogen flights, accounting for extra turnaround time
     utilization_h2 = baseline_jetA_util - 2 * (
         fraction_flights_year *
@@ -97,36 +121,23 @@ def hydrogen_uti_rev(
 
     # Baseline revenue (if all flights at fraction_flights_year had no extra turnaround delay)
     baseline_revenue_m = fraction_flights_year * flights_atl_to_dome * total_rev
-    print(f" fraction_flights_year * flights_atl_to_dome * total_rev:  {fraction_flights_year} * {flights_atl_to_dome} * {total_rev}")
-    print(f"baseline_revenue_m {baseline_revenue_m}")
 
 
-    # New H2 revenue after losing some utilization
-    if baseline_jetA_util != 0.0:
-        new_h2_revenue_m = baseline_revenue_m * (utilization_h2 / baseline_jetA_util)
-    else:
-        new_h2_revenue_m = 0.0
-   
-    print(f"new_h2_revenue_m = baseline_revenue_m * (utilization_h2 / baseline_jetA_util): {new_h2_revenue_m} = {baseline_revenue_m} * ({utilization_h2} / {baseline_jetA_util})")
+    # New H2 revenue after losing some utilization (zero when there is no baseline utilization)
+    new_h2_revenue_m = baseline_revenue_m * _safe_divide(utilization_h2, baseline_jetA_util)
 
 
     # Revenue drop and percentage drop
     revenue_drop_m = baseline_revenue_m - new_h2_revenue_m
-    print(f"revenue_drop_m = baseline_revenue_m - new_h2_revenue_m: {revenue_drop_m} = {baseline_revenue_m} - {new_h2_revenue_m}")
-    pct_drop = 0.0 if baseline_revenue_m == 0.0 else -100.0 * (revenue_drop_m / baseline_revenue_m)
-    print(f"pct_drop = 0.0 if baseline_revenue_m == 0.0 else 100.0 * (revenue_drop_m / baseline_revenue_m): {pct_drop} = 0.0 if {baseline_revenue_m} == 0.0 else 100.0 * ({revenue_drop_m} / {baseline_revenue_m})")
+    pct_drop = -100.0 * _safe_divide(revenue_drop_m, baseline_revenue_m)
 
 
     # Required tax credit per gallon (convert revenue drop from million dollars to dollars)
-    if h2_demand_annual_gal > 0:
-        required_tax_crd_per_gal = (revenue_drop_m * 1_000_000) / h2_demand_annual_gal
-    else:
-        required_tax_crd_per_gal = 0.0
-
-
-    print(f"utilization_h2={utilization_h2}, baseline_jetA_util={baseline_jetA_util}")
-    print(f"baseline_revenue_m={baseline_revenue_m}, new_h2_revenue_m={new_h2_revenue_m}")
-    print(f"revenue_drop_m={revenue_drop_m}, pct_drop={pct_drop}")
+    required_tax_crd_per_gal = np.where(
+        h2_demand_annual_gal > 0,
+        _safe_divide(revenue_drop_m * 1_000_000, h2_demand_annual_gal),
+        0.0
+    )
 
 
     return (
@@ -139,6 +150,157 @@ def hydrogen_uti_rev(
     )
 
 
+def _safe_divide(numerator, denominator):
+    """Element-wise numerator / denominator, with 0.0 wherever the denominator is zero."""
+    numerator, denominator = np.broadcast_arrays(
+        np.asarray(numerator, dtype=float), np.asarray(denominator, dtype=float)
+    )
+    return np.divide(
+        numerator, denominator,
+        out=np.zeros(numerator.shape), where=denominator != 0.0
+    )
+
+
+def _scenario_records(columns: Dict[str, np.ndarray], grid_shape: tuple, row: int) -> list:
+    """Turn row `row` of each (scenario x year) column into a list of per-year dicts."""
+    names = list(columns)
+    values = [np.broadcast_to(column, grid_shape)[row].tolist() for column in columns.values()]
+    return [dict(zip(names, year_values)) for year_values in zip(*values)]
+
+
+def _carrier_codes(data: Dict[str, pd.DataFrame]) -> Dict[str, str]:
+    """Map UNIQUE_CARRIER_NAME to UNIQUE_CARRIER using every dataset that has both columns."""
+    pairs = [
+        df[["UNIQUE_CARRIER_NAME", "UNIQUE_CARRIER"]]
+        for df in data.values()
+        if {"UNIQUE_CARRIER_NAME", "UNIQUE_CARRIER"}.issubset(df.columns)
+    ]
+    if not pairs:
+        return {}
+    codes = pd.concat(pairs).drop_duplicates("UNIQUE_CARRIER_NAME")
+    return dict(zip(codes["UNIQUE_CARRIER_NAME"], codes["UNIQUE_CARRIER"]))
+
+
+def _carrier_column(df: pd.DataFrame, codes: Dict[str, str]) -> pd.Series:
+    """UNIQUE_CARRIER codes for a dataset, mapped from carrier names when the code column is absent."""
+    if "UNIQUE_CARRIER" in df.columns:
+        return df["UNIQUE_CARRIER"]
+    return df["UNIQUE_CARRIER_NAME"].map(codes)
+
+
+def compute_baseline_index(data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Derive the economic baselines for every (carrier, origin) pair in the BTS files.
+
+    Departures are aggregated in a single groupby over operations_data; carrier
+    totals and airport totals are then taken from that aggregate.
+
+    Returns
+    -------
+    pd.DataFrame indexed by (UNIQUE_CARRIER, ORIGIN) with columns:
+    origin_departures   : Departures of the carrier from the origin.
+    carrier_departures  : Departures of the carrier from all origins.
+    origin_share        : origin_departures / carrier_departures.
+    airport_share       : Carrier's share of all departures from the origin.
+    total_rev           : Carrier domestic operating revenue (millions USD).
+    airborne_hours      : Carrier domestic revenue airborne hours.
+    """
+    codes = _carrier_codes(data)
+    operations = data["operations_data"]
+    departures = operations.groupby(
+        [_carrier_column(operations, codes).rename("UNIQUE_CARRIER"), operations["ORIGIN"]]
+    )["DEPARTURES_PERFORMED"].sum()
+
+    index = departures.to_frame("origin_departures").astype(float)
+    index["carrier_departures"] = departures.groupby(level="UNIQUE_CARRIER").transform("sum")
+    index["origin_share"] = index["origin_departures"] / index["carrier_departures"]
+    index["airport_share"] = departures / departures.groupby(level="ORIGIN").transform("sum")
+
+    # Domestic (REGION == 'D') revenue and airborne hours per carrier
+    income = data["income_data"][data["income_data"]["REGION"] == "D"]
+    revenue = income.groupby(_carrier_column(income, codes))["OP_REVENUES"].sum() / 1_000_000
+    uti = data["uti_data"][data["uti_data"]["REGION"] == "D"]
+    hours = uti.groupby(_carrier_column(uti, codes))["REV_ACRFT_HRS_AIRBORNE_610"].sum()
+
+    carriers = index.index.get_level_values("UNIQUE_CARRIER")
+    index["total_rev"] = revenue.reindex(carriers).to_numpy()
+    index["airborne_hours"] = hours.reindex(carriers).to_numpy()
+    return index
+
+
+def lookup_baselines(index: pd.DataFrame, carrier: str, airport: str) -> Dict[str, float]:
+    """
+    Look up the baselines for one carrier at one airport.
+
+    Returns
+    -------
+    dict with carrier_departures, origin_share, airport_share, total_rev
+    (millions USD) and airborne_hours.
+    """
+    if (carrier, airport) not in index.index:
+        raise EconomicCalculationError(f"No {carrier} flights departing from {airport} found")
+    row = index.loc[(carrier, airport)]
+
+    if pd.isna(row["airborne_hours"]):
+        raise EconomicCalculationError(f"No {carrier} domestic flights found in utilization data")
+    if pd.isna(row["total_rev"]):
+        raise EconomicCalculationError(f"No {carrier} domestic revenue found in income data")
+    if row["carrier_departures"] == 0:
+        raise EconomicCalculationError(f"Total {carrier} departures cannot be zero")
+
+    return {
+        "carrier_departures": float(row["carrier_departures"]),
+        "origin_share": float(row["origin_share"]),
+        "airport_share": float(row["airport_share"]),
+        "total_rev": float(row["total_rev"]),
+        "airborne_hours": float(row["airborne_hours"])
+    }
+
+
+def _baseline_source_signature() -> Tuple:
+    """(path, mtime, size) of every baseline source file; None entries for missing files."""
+    signature = []
+    for file_name in BASELINE_SOURCE_FILES:
+        path = get_data_file_path(file_name)
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+
+def clear_baseline_cache() -> None:
+    """Forget the cached baselines so the next request re-reads the BTS files."""
+    with _baseline_cache_lock:
+        _baseline_cache.clear()
+
+
+def get_baseline_index() -> pd.DataFrame:
+    """
+    Return the (carrier, origin) baseline index, rebuilding it only when a source file changes.
+
+    The cache is keyed by the path, modification time and size of each file
+    in BASELINE_SOURCE_FILES.
+    """
+    signature = _baseline_source_signature()
+    with _baseline_cache_lock:
+        if _baseline_cache.get("signature") == signature:
+            return _baseline_cache["index"]
+
+        index = compute_baseline_index(load_data())
+        # Only cache when every source file could be fingerprinted
+        if all(mtime is not None for _, mtime, _ in signature):
+            _baseline_cache["signature"] = signature
+            _baseline_cache["index"] = index
+        return index
+
+
+def get_baselines(carrier: str = DEFAULT_CARRIER, airport: str = DEFAULT_AIRPORT) -> Dict[str, float]:
+    """Baselines for one carrier at one airport, served from the cached index."""
+    return lookup_baselines(get_baseline_index(), carrier, airport)
+
+
 def calculate_economic_impact(
     total_h2_demand: float,
     fleet_percentage: float,
@@ -147,162 +309,122 @@ def calculate_economic_impact(
     growth_rate: float,
     extra_turn_time: int,
     turn_time_decrease_rates: list,
-    final_h2_year: int  
+    final_h2_year: int,
+    carrier: str = DEFAULT_CARRIER,
+    airport: str = DEFAULT_AIRPORT
 ) -> Dict[str, Any]:
     """
     Compute revenue changes for hydrogen fleet transition across multiple years and scenarios.
     Uses a simple compound growth rate model consistent with the original implementation.
+
+    All scenarios are evaluated together on a (turn_time_decrease_rates x years)
+    grid with NumPy broadcasting. `carrier` (BTS UNIQUE_CARRIER code) and
+    `airport` (ORIGIN) select the baselines from the cached baseline index.
     """
     try:
-        print(f"Economic calculation parameters: total_h2_demand={total_h2_demand}, fleet_percentage={fleet_percentage}, start_year={start_year}, end_year={end_year}, growth_rate={growth_rate}, extra_turn_time={extra_turn_time}, turn_time_decrease_rates={turn_time_decrease_rates}, final_h2_year={final_h2_year}")
-       
-        # -------- Load and validate data --------
-        data = load_data()
-
-
-        # -------- Apply EXACT filtering logic from turn_time_impact.py --------
-        # 1. Filter uti_data for Delta domestic flights ('DL' and REGION == 'D')
-        total_delta_uti = data["uti_data"][
-            (data["uti_data"]['UNIQUE_CARRIER'] == 'DL') &
-            (data["uti_data"]['REGION'] == 'D')
-        ]
-        if total_delta_uti.empty:
-            raise EconomicCalculationError("No Delta domestic flights found in utilization data")
-
-
-        # 2. Filter operations_data for Delta flights departing from ATL
-        atl_delta_oper = data["operations_data"][
-            (data["operations_data"]['UNIQUE_CARRIER_NAME'] == 'Delta Air Lines Inc.') &
-            (data["operations_data"]['ORIGIN'] == 'ATL')
-        ]
-        if atl_delta_oper.empty:
-            raise EconomicCalculationError("No Delta flights departing from ATL found")
-
-
-        # 3. Filter operations_data for ALL Delta flights
-        total_delta_oper = data["operations_data"][
-            (data["operations_data"]['UNIQUE_CARRIER_NAME'] == 'Delta Air Lines Inc.')
-        ]
-        if total_delta_oper.empty:
-            raise EconomicCalculationError("No Delta flights found in operations data")
-
-
-        # 4. Filter income_data for Delta domestic revenue
-        total_revenue = data["income_data"][
-            (data["income_data"]['UNIQUE_CARRIER_NAME'] == 'Delta Air Lines Inc.') &
-            (data["income_data"]['REGION'] == 'D')
-        ]
-        if total_revenue.empty:
-            raise EconomicCalculationError("No Delta domestic revenue found in income data")
-
-
-        # -------- Compute baseline inputs --------
-        tot_delta_flights_atl = float(total_delta_oper['DEPARTURES_PERFORMED'].sum())
-        if tot_delta_flights_atl == 0:
-            raise EconomicCalculationError("Total Delta flights at ATL cannot be zero")
-       
-        flights_atl_to_dome = float(
-            atl_delta_oper['DEPARTURES_PERFORMED'].sum() / tot_delta_flights_atl
-        )
-
-
-        total_rev = float(total_revenue['OP_REVENUES'].sum() / 1_000_000)
+        # -------- Cached BTS baselines --------
+        baselines = get_baselines(carrier, airport)
+        carrier_departures = baselines["carrier_departures"]
+        origin_share = baselines["origin_share"]
+        total_rev = baselines["total_rev"]
         baseline_jetA_util = float(
-            fleet_percentage * flights_atl_to_dome * total_delta_uti['REV_ACRFT_HRS_AIRBORNE_610'].sum()
+            fleet_percentage * origin_share * baselines["airborne_hours"]
         )
 
 
-        # -------- Rest of the function remains the same --------
+        # -------- Build the (rate x year) grid --------
+        if end_year < start_year:
+            raise EconomicCalculationError("End year cannot be before start year")
+
         # Option 1: Use the user-supplied fleet_percentage as the initial fraction.
         fraction_flights_2023 = fleet_percentage
         target_fraction = fleet_percentage  
         slope = (target_fraction - fraction_flights_2023) / (final_h2_year - start_year)
 
 
-        years = range(start_year, end_year + 1)
-        scenario_results = {}
-
-
-        for rate in turn_time_decrease_rates:
-            all_results = []
-            for year in years:
-                years_elapsed = year - start_year
-
-
-                # 1) H2 fraction grows linearly until final_h2_year.
-                if year <= final_h2_year:
-                    fraction_flights_year = fraction_flights_2023 + slope * years_elapsed
-                else:
-                    fraction_flights_year = target_fraction
-
-
-                # 2) Calculate turnaround time for the current year.
-                this_year_turn_time = max(0, extra_turn_time - (rate * years_elapsed))
-
+        years = np.arange(start_year, end_year + 1)
+        years_elapsed = years - start_year
+        rates = np.asarray(turn_time_decrease_rates)[:, np.newaxis]
 
-                # 3) Compute a compound growth factor.
-                factor = (1 + growth_rate) ** years_elapsed
-                print(f"Year {year}: Using growth factor {factor:.4f} (growth_rate={growth_rate})")
 
-
-                # Scale up key variables using the growth factor.
-                h2_demand_annual_scaled_gal = total_h2_demand * factor
-                total_rev_scaled_m = total_rev * factor
-                baseline_jetA_util_scaled = baseline_jetA_util * factor
-
-
-                # 4) Compute the economic metrics for the current year.
-                (
-                    utilization_h2,
-                    revenue_drop_m,
-                    required_tax_crd_per_gal,
-                    baseline_revenue_m,
-                    new_h2_revenue_m,
-                    pct_drop
-                ) = hydrogen_uti_rev(
-                    fraction_flights_year,
-                    tot_delta_flights_atl,
-                    flights_atl_to_dome,
-                    h2_demand_annual_scaled_gal,
-                    this_year_turn_time,
-                    total_rev_scaled_m,
-                    baseline_jetA_util_scaled
-                )
+        # 1) H2 fraction grows linearly until final_h2_year.                    (years,)
+        fraction_flights_year = np.where(
+            years <= final_h2_year,
+            fraction_flights_2023 + slope * years_elapsed,
+            target_fraction
+        )
 
 
-                all_results.append({
-                    "Year": year,
-                    "Growth_Factor": factor,
-                    "Turn_Time_min": this_year_turn_time,
-                    "Fraction_Flights_H2": fraction_flights_year,
-                    "H2_Demand_annual_gal": h2_demand_annual_scaled_gal,
-                    "Hydrogen_Utilization": utilization_h2,
-                    "Baseline_Revenue_M": baseline_revenue_m,
-                    "Hydrogen_Revenue_M": new_h2_revenue_m,
-                    "Revenue_Drop_M": revenue_drop_m,
-                    "Pct_Drop": pct_drop,
-                    "Req_Tax_Credit_per_gal": required_tax_crd_per_gal
-                })
+        # 2) Turnaround time for every scenario and year.                      (rates, years)
+        turn_time = np.maximum(0, extra_turn_time - rates * years_elapsed)
+
+
+        # 3) Compound growth factor, used to scale key variables.              (years,)
+        factor = (1 + growth_rate) ** years_elapsed
+        h2_demand_annual_scaled_gal = total_h2_demand * factor
+        total_rev_scaled_m = total_rev * factor
+        baseline_jetA_util_scaled = baseline_jetA_util * factor
+
+
+        # 4) Economic metrics for all scenarios and years at once.             (rates, years)
+        (
+            utilization_h2,
+            revenue_drop_m,
+            required_tax_crd_per_gal,
+            baseline_revenue_m,
+            new_h2_revenue_m,
+            pct_drop
+        ) = hydrogen_uti_rev(
+            fraction_flights_year,
+            carrier_departures,
+            origin_share,
+            h2_demand_annual_scaled_gal,
+            turn_time,
+            total_rev_scaled_m,
+            baseline_jetA_util_scaled
+        )
 
 
-            scenario_results[rate] = pd.DataFrame(all_results)
+        columns = {
+            "Year": years,
+            "Growth_Factor": factor,
+            "Turn_Time_min": turn_time,
+            "Fraction_Flights_H2": fraction_flights_year,
+            "H2_Demand_annual_gal": h2_demand_annual_scaled_gal,
+            "Hydrogen_Utilization": utilization_h2,
+            "Baseline_Revenue_M": baseline_revenue_m,
+            "Hydrogen_Revenue_M": new_h2_revenue_m,
+            "Revenue_Drop_M": revenue_drop_m,
+            "Pct_Drop": pct_drop,
+            "Req_Tax_Credit_per_gal": required_tax_crd_per_gal
+        }
+        grid_shape = turn_time.shape
+        required_tax_crd_per_gal = np.broadcast_to(required_tax_crd_per_gal, grid_shape)
+        pct_drop = np.broadcast_to(pct_drop, grid_shape)
 
 
-        # -------- Compute Summary Metrics --------
+        # -------- Assemble scenario tables and summary metrics --------
+        scenarios = {}
         summary_metrics = {}
-        for rate, df in scenario_results.items():
+        for i, rate in enumerate(turn_time_decrease_rates):
+            records = _scenario_records(columns, grid_shape, i)
+            if isinstance(rate, int) and isinstance(extra_turn_time, int):
+                # Keep whole-minute turn times as ints even when other rates are fractional
+                for record in records:
+                    record["Turn_Time_min"] = int(record["Turn_Time_min"])
+            scenarios[rate] = records
             summary_metrics[rate] = {
-                "max_tax_credit": float(df["Req_Tax_Credit_per_gal"].max()),
-                "max_revenue_drop_pct": float(df["Pct_Drop"].max()),
-                "avg_revenue_drop_pct": float(df["Pct_Drop"].mean()),
-                "final_year_tax_credit": float(df.iloc[-1]["Req_Tax_Credit_per_gal"]),
-                "final_year_revenue_drop": float(df.iloc[-1]["Pct_Drop"])
+                "max_tax_credit": float(required_tax_crd_per_gal[i].max()),
+                "max_revenue_drop_pct": float(pct_drop[i].max()),
+                "avg_revenue_drop_pct": float(pct_drop[i].mean()),
+                "final_year_tax_credit": float(required_tax_crd_per_gal[i, -1]),
+                "final_year_revenue_drop": float(pct_drop[i, -1])
             }
 
 
         # Return results
         return {
-            "scenarios": {k: v.to_dict(orient="records") for k, v in scenario_results.items()},
+            "scenarios": scenarios,
             "summary": summary_metrics
         }
 
@@ -311,4 +433,3 @@ def calculate_economic_impact(
         raise
     except Exception as e:
         raise EconomicCalculationError(f"Error calculating economic impact: {str(e)}")
-
@@ -2,16 +2,29 @@
 import pandas as pd
 import numpy as np
 from app.utils.validation import ValidationError
-from app.utils.data_loader import load_data_from_db
+from app.utils.data_loader import load_data_from_db, AC_FUEL_INDEX_TABLE
 from app.constants import (
-    DELTA_PART_FLIGHTS, DELTA_PART_DOMESTIC, CONVERSION_FACTOR_JET_TO_H2,
+    DEFAULT_CARRIER, DEFAULT_AIRPORT, DELTA_PART_FLIGHTS, DELTA_PART_DOMESTIC, CONVERSION_FACTOR_JET_TO_H2,
     H2_DENSITY_LB_PER_FT3, BUFFER_DAYS, AVG_DAYS_IN_MONTH,
     TANK_WIDTH_FT, TANK_LENGTH_FT, WATER_CAPACITY_GAL, GALLON_TO_FT3,
     TANK_ULLAGE, EVAPORATION_LOSS, JET_A_EMISSION_FACTOR,
-    DIESEL_EMISSION_FACTOR, GASOLINE_EMISSION_FACTOR, growth_rate_data
+    DIESEL_EMISSION_FACTOR, GASOLINE_EMISSION_FACTOR, GSE_FUEL_PROPERTIES,
+    growth_rate_data
 )
 from typing import Tuple, List, Union
 
+MAX_BATCH_SIZE = 1000  # Max slider/year values per batch request
+MAX_BULK_GSE = 16  # Max GSE types in bulk mode (2**n subsets)
+
+# gse_data columns read by gse_fuel_totals
+GSE_FUEL_COLUMNS = [
+    "Ground support Equipment",
+    "Fuel used",
+    "Usable Fuel Consumption (ft3/min)",
+    "Operating time - Departure",
+    "Operating Time - Arrival",
+]
+
 def validate_year(end_year: Union[int, None]) -> None:
     """Validate the year parameter."""
     if end_year is None:
@@ -30,6 +43,17 @@ def validate_slider_perc(slider_perc: Union[float, None]) -> None:
     if slider_perc < 0 or slider_perc > 1:
         raise ValidationError("slider_perc must be between 0 and 1")  # Changed error message
     
+def validate_batch_values(values: Union[List, None], name: str, max_size: int) -> None:
+    """Validate a non-empty list of sweep values."""
+    if values is None:
+        raise ValidationError(f"{name} cannot be None")
+    if not isinstance(values, list):
+        raise ValidationError(f"{name} must be an array")
+    if not values:
+        raise ValidationError(f"{name} cannot be empty")
+    if len(values) > max_size:
+        raise ValidationError(f"{name} cannot have more than {max_size} values")
+
 def validate_gse_list(gse_list: Union[List[str], None]) -> None:
     """Validate the GSE list parameter."""
     if gse_list is None:
@@ -59,45 +83,195 @@ def validate_fuel_amount(amount: Union[float, None], fuel_type: str) -> None:
     if amount < 0:
         raise ValidationError(f"{fuel_type} amount cannot be negative")
     
-def get_growth_rate(end_year: int) -> float:
-    """Compute growth rate for Delta flights at ATL."""
-    try:
-        validate_year(end_year)
-        
-        growth_rate_df = pd.DataFrame(growth_rate_data)
-        
-        if end_year not in growth_rate_df["Year"].values:
-            raise ValidationError(f"No projection data available for year {end_year}")
-            
-        ops_start = growth_rate_df.loc[growth_rate_df["Year"] == 2023, "Projected Operations"].values[0]
-        ops_projected = growth_rate_df.loc[growth_rate_df["Year"] == end_year, "Projected Operations"].values[0]
-        
-        growth = (ops_projected - ops_start) / ops_start
-        return float(growth * DELTA_PART_DOMESTIC * DELTA_PART_FLIGHTS)
-    except IndexError:
-        raise ValidationError(f"Failed to calculate growth rate for year {end_year}")
-
-
-def compute_h2_demand_ac(slider_perc: float, end_year: int) -> Tuple[float, float]:
-    """Calculate Hydrogen demand for aircraft operations."""
-    validate_slider_perc(slider_perc)
+def _build_growth_table() -> Tuple[int, np.ndarray]:
+    """Precompute airport operations growth (relative to the first TAF year) indexed by year offset."""
+    years = growth_rate_data["Year"].to_numpy()
+    operations = growth_rate_data["Projected Operations"].to_numpy(dtype=float)
+    if not np.array_equal(years, np.arange(years[0], years[0] + len(years))):
+        raise ValueError("growth_rate_data must cover consecutive years")
+
+    return int(years[0]), (operations - operations[0]) / operations[0]
+
+
+GROWTH_BASE_YEAR, _GROWTH_TABLE = _build_growth_table()
+# Yearly increase used to extrapolate linearly beyond the last TAF year
+_GROWTH_SLOPE = float(_GROWTH_TABLE[-1] - _GROWTH_TABLE[-2])
+
+
+def growth_rates(
+    years: Union[List[int], np.ndarray],
+    part_flights: float = DELTA_PART_FLIGHTS,
+    part_domestic: float = DELTA_PART_DOMESTIC
+) -> np.ndarray:
+    """
+    Vectorized growth rates for a carrier's domestic flights at an airport.
+
+    Years past the end of the TAF projections are extrapolated linearly from
+    the final projected year-over-year increase.
+
+    Parameters:
+    - years (list or np.ndarray): Projection years (2023 or later).
+    - part_flights (float): Carrier's share of the airport's departures (Delta at ATL by default).
+    - part_domestic (float): Domestic share of the carrier's departures from the airport.
+
+    Returns:
+    - np.ndarray: Growth rate for each year, same shape as `years`.
+    """
+    years = np.asarray(years)
+    if years.dtype.kind not in "iu":
+        # Report the first offending value with the scalar validation message
+        for year in years.ravel().tolist():
+            validate_year(year)
+        raise ValidationError("Year must be an integer")
+    if years.size and years.min() < GROWTH_BASE_YEAR:
+        raise ValidationError(f"Year must be {GROWTH_BASE_YEAR} or later")
+
+    offsets = years - GROWTH_BASE_YEAR
+    last = len(_GROWTH_TABLE) - 1
+    growth = np.where(
+        offsets <= last,
+        _GROWTH_TABLE[np.minimum(offsets, last)],
+        _GROWTH_TABLE[last] + _GROWTH_SLOPE * (offsets - last)
+    )
+    return growth * part_domestic * part_flights
+
+
+def get_growth_rate(
+    end_year: int,
+    part_flights: float = DELTA_PART_FLIGHTS,
+    part_domestic: float = DELTA_PART_DOMESTIC
+) -> float:
+    """Compute growth rate for a carrier's domestic flights at an airport (Delta at ATL by default)."""
     validate_year(end_year)
-    
-    # Load aircraft data from the database
-    filtered_db = load_data_from_db("ac_data", filters={"MONTH": 7, "DATA_SOURCE": "DU"})
+    return float(growth_rates(np.array([end_year]), part_flights, part_domestic)[0])
+
+
+def get_carrier_shares(carrier: str, airport: str) -> Tuple[float, float]:
+    """
+    Shares used to scale airport growth to one carrier's domestic flights.
+
+    Delta at ATL keeps the calibrated DELTA_PART_* constants. Other pairs use
+    the carrier's share of all departures from the airport and the domestic (DU)
+    share of its own departures, both from the fuel-burn index.
+
+    Returns:
+    - tuple: (part_flights, part_domestic)
+    """
+    if (carrier, airport) == (DEFAULT_CARRIER, DEFAULT_AIRPORT):
+        return DELTA_PART_FLIGHTS, DELTA_PART_DOMESTIC
+
+    departures = load_data_from_db(
+        AC_FUEL_INDEX_TABLE,
+        filters={"ORIGIN": airport},
+        group_by=["UNIQUE_CARRIER", "DATA_SOURCE"],
+        aggregates={"DEPARTURES": ("sum", "DEPARTURES")}
+    )
+    carrier_departures = departures[departures["UNIQUE_CARRIER"] == carrier]
+    total_departures = carrier_departures["DEPARTURES"].sum()
+    if total_departures == 0:
+        raise ValidationError(f"No aircraft data found for {carrier} at {airport}")
+    domestic_departures = carrier_departures.loc[carrier_departures["DATA_SOURCE"] == "DU", "DEPARTURES"].sum()
+    part_flights = total_departures / departures["DEPARTURES"].sum()
+
+    return float(part_flights), float(domestic_departures / total_departures)
+
+
+def get_base_fuel_weight(
+    month: int = 7,
+    data_source: str = "DU",
+    carrier: Union[str, None] = None,
+    origin: Union[str, None] = None
+) -> float:
+    """
+    Look up the summed Jet A fuel weight (lb) from the precomputed fuel-burn index.
+
+    Parameters:
+    - month (int): BTS month to use (July by default).
+    - data_source (str): BTS data source ("DU" domestic, "IU" international).
+    - carrier (str, optional): UNIQUE_CARRIER code to restrict to.
+    - origin (str, optional): ORIGIN airport code to restrict to.
 
-    # Convert data types
-    filtered_db["AIR_TIME"] = pd.to_numeric(filtered_db["AIR_TIME"], errors='coerce')
-    filtered_db["FUEL_CONSUMPTION"] = pd.to_numeric(filtered_db["FUEL_CONSUMPTION"], errors='coerce')
+    Returns:
+    - float: Total fuel weight in lbs.
+    """
+    filters = {"MONTH": month, "DATA_SOURCE": data_source}
+    if carrier is not None:
+        filters["UNIQUE_CARRIER"] = carrier
+    if origin is not None:
+        filters["ORIGIN"] = origin
+
+    fuel_index = load_data_from_db(
+        AC_FUEL_INDEX_TABLE, filters=filters, aggregates={"FUEL_WEIGHT": ("sum", "FUEL_WEIGHT")}
+    )
+    # The sum is null when nothing matches; Series.sum treats that as 0
+    return float(fuel_index["FUEL_WEIGHT"].sum())
 
-    # Compute fuel weight
-    fuel_weight = sum(filtered_db["FUEL_CONSUMPTION"] * filtered_db["AIR_TIME"] / 60)
+
+def compute_h2_demand_ac(
+    slider_perc: float,
+    end_year: int,
+    carrier: str = DEFAULT_CARRIER,
+    airport: str = DEFAULT_AIRPORT
+) -> Tuple[float, float]:
+    """Calculate Hydrogen demand for aircraft operations of `carrier` departing `airport`."""
+    validate_slider_perc(slider_perc)
+    validate_year(end_year)
+    
+    # Fuel weight for July domestic operations, from the precomputed index
+    fuel_weight = get_base_fuel_weight(carrier=carrier, origin=airport)
+    if fuel_weight == 0:
+        raise ValidationError(f"No aircraft data found for {carrier} at {airport}")
 
     # Apply user slider and projected growth
     fuel_weight_user = slider_perc * fuel_weight
-    growth = get_growth_rate(end_year)
+    growth = get_growth_rate(end_year, *get_carrier_shares(carrier, airport))
     fuel_weight_projected = fuel_weight_user * (1 + growth)
 
+    return float(jet_fuel_to_daily_h2_demand(fuel_weight_projected)), float(fuel_weight_projected)
+
+
+def compute_h2_demand_ac_batch(
+    slider_percs: List[float],
+    end_years: List[int],
+    carrier: str = DEFAULT_CARRIER,
+    airport: str = DEFAULT_AIRPORT
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate aircraft Hydrogen demand for every (slider_perc, end_year) combination.
+
+    The base fuel weight is looked up once and the growth and LH2 conversion
+    are evaluated as array operations.
+
+    Parameters:
+    - slider_percs (list): Fractions of the fleet converted to H2 (0-1).
+    - end_years (list): Projection years.
+    - carrier (str): BTS UNIQUE_CARRIER code.
+    - airport (str): BTS ORIGIN airport code.
+
+    Returns:
+    - tuple: (daily H2 demand in ft³, projected fuel weight in lbs), each an
+      array of shape (len(slider_percs), len(end_years)).
+    """
+    validate_batch_values(slider_percs, "slider_percs", MAX_BATCH_SIZE)
+    validate_batch_values(end_years, "end_years", MAX_BATCH_SIZE)
+    for slider_perc in slider_percs:
+        validate_slider_perc(slider_perc)
+
+    fuel_weight = get_base_fuel_weight(carrier=carrier, origin=airport)
+    if fuel_weight == 0:
+        raise ValidationError(f"No aircraft data found for {carrier} at {airport}")
+    growth = growth_rates(end_years, *get_carrier_shares(carrier, airport))
+
+    fuel_weight_projected = np.outer(np.asarray(slider_percs, dtype=float) * fuel_weight, 1 + growth)
+    return jet_fuel_to_daily_h2_demand(fuel_weight_projected), fuel_weight_projected
+
+
+def jet_fuel_to_daily_h2_demand(fuel_weight_projected):
+    """
+    Convert projected monthly Jet A weight (lb) to daily LH2 demand (ft³), including buffer storage.
+
+    Accepts scalars or NumPy arrays.
+    """
     # Convert Jet A fuel mass to Hydrogen mass
     h2_weight = fuel_weight_projected / CONVERSION_FACTOR_JET_TO_H2
     h2_vol = h2_weight / H2_DENSITY_LB_PER_FT3
@@ -106,7 +280,56 @@ def compute_h2_demand_ac(slider_perc: float, end_year: int) -> Tuple[float, floa
     buffer = h2_vol / AVG_DAYS_IN_MONTH
     h2_demand_vol = h2_vol + buffer * BUFFER_DAYS
 
-    return float(h2_demand_vol / AVG_DAYS_IN_MONTH), float(fuel_weight_projected)
+    return h2_demand_vol / AVG_DAYS_IN_MONTH
+
+
+def gse_fuel_totals(file: pd.DataFrame, by: Union[str, None] = None) -> pd.DataFrame:
+    """
+    Per-cycle H2 volume and diesel/gasoline weight for GSE rows.
+
+    Parameters:
+    - file (pd.DataFrame): GSE rows from the gse_data table.
+    - by (str, optional): Column to group the totals by.
+
+    Returns:
+    - pd.DataFrame: Columns h2_per_cycle_ft3, diesel_lb and gasoline_lb, one
+      row per group (or a single "total" row if `by` is None).
+    """
+    fuel_used = file["Fuel used"].to_numpy()
+    properties = GSE_FUEL_PROPERTIES.reindex(fuel_used)
+
+    unknown = properties["H2 Volume Ratio"].isna().to_numpy()
+    if unknown.any():
+        raise ValidationError(
+            f"Unknown fuel type(s) for GSE: {', '.join(sorted(set(map(str, fuel_used[unknown]))))}"
+        )
+
+    fuel_vol = (
+        file["Usable Fuel Consumption (ft3/min)"].to_numpy(dtype=float)
+        * (file["Operating time - Departure"].to_numpy(dtype=float)
+           + file["Operating Time - Arrival"].to_numpy(dtype=float))
+    )
+    fuel_weight = fuel_vol * properties["Density (lb/ft3)"].to_numpy()
+
+    totals = pd.DataFrame({
+        "h2_per_cycle_ft3": fuel_vol / properties["H2 Volume Ratio"].to_numpy(),
+        "diesel_lb": np.where(fuel_used == "Diesel", fuel_weight, 0.0),
+        "gasoline_lb": np.where(fuel_used == "Gasoline", fuel_weight, 0.0)
+    })
+    keys = file[by].to_numpy() if by is not None else np.full(len(totals), "total")
+    return totals.groupby(keys, sort=False).sum()
+
+
+def gse_h2_to_daily_demand(hydrogen_tot_per_cycle, growth: float):
+    """
+    Convert per-cycle GSE H2 volume (ft³) to daily demand, including buffer storage.
+
+    Accepts scalars or NumPy arrays.
+    """
+    hydrogen_tot_gse = 33440 * hydrogen_tot_per_cycle * growth
+    buffer = hydrogen_tot_gse / AVG_DAYS_IN_MONTH
+    h2_demand_vol_gse = hydrogen_tot_gse + buffer * BUFFER_DAYS
+    return h2_demand_vol_gse / AVG_DAYS_IN_MONTH
 
 
 def compute_h2_demand_gse(gse_list: List[str], end_year: int) -> Tuple[float, float, float]:
@@ -115,35 +338,80 @@ def compute_h2_demand_gse(gse_list: List[str], end_year: int) -> Tuple[float, fl
     validate_year(end_year)
     
     # Load GSE data from the database
-    file = load_data_from_db("gse_data", filters={"Ground support Equipment": gse_list})
+    file = load_data_from_db("gse_data", filters={"Ground support Equipment": gse_list}, columns=GSE_FUEL_COLUMNS)
     
     if file.empty:
         raise ValidationError(f"No data found for GSE equipment: {', '.join(gse_list)}")
 
-    hydrogen_tot_per_cycle, tot_diesel_used, tot_gasoline_used = 0, 0, 0
-    for _, row in file.iterrows():
-        fuel_vol = row["Usable Fuel Consumption (ft3/min)"] * (
-            row["Operating time - Departure"] + row["Operating Time - Arrival"]
-        )
-        if row["Fuel used"] == "Diesel":
-            hydrogen_vol = fuel_vol / 2.81
-            tot_diesel_used += fuel_vol * 52.28  # Convert ft³ to lb
-        elif row["Fuel used"] == "Gasoline":
-            hydrogen_vol = fuel_vol / 2.76
-            tot_gasoline_used += fuel_vol * 46.38  # Convert ft³ to lb
-        hydrogen_tot_per_cycle += hydrogen_vol
+    totals = gse_fuel_totals(file).iloc[0]
 
     growth = get_growth_rate(end_year)
-    hydrogen_tot_gse = 33440 * hydrogen_tot_per_cycle * growth
-    buffer = hydrogen_tot_gse / AVG_DAYS_IN_MONTH
-    h2_demand_vol_gse = hydrogen_tot_gse + buffer * BUFFER_DAYS
+    h2_demand_day = gse_h2_to_daily_demand(totals["h2_per_cycle_ft3"], growth)
 
     return (
-        float(h2_demand_vol_gse / AVG_DAYS_IN_MONTH), 
-        float(tot_diesel_used), 
-        float(tot_gasoline_used)
+        float(h2_demand_day), 
+        float(totals["diesel_lb"]), 
+        float(totals["gasoline_lb"])
+    )
+
+
+def compute_h2_demand_gse_bulk(gse_list: Union[List[str], None], end_year: int) -> List[dict]:
+    """
+    Calculate GSE Hydrogen demand for every subset of `gse_list` in one pass.
+
+    Per-equipment totals are computed once and combined for all 2**n subsets
+    with a single matrix product.
+
+    Parameters:
+    - gse_list (list, optional): GSE types to combine. Defaults to every GSE in the database.
+    - end_year (int): Projection year.
+
+    Returns:
+    - list: One dict per subset with gse_list, daily_h2_demand_ft3,
+      total_diesel_used_lb and total_gasoline_used_lb. The empty subset is included.
+    """
+    validate_year(end_year)
+
+    if gse_list is None:
+        gse_list = load_data_from_db(
+            "gse_data", columns=["Ground support Equipment"], distinct=True
+        )["Ground support Equipment"].tolist()
+    else:
+        validate_gse_list(gse_list)
+        gse_list = list(dict.fromkeys(item.strip() for item in gse_list))
+
+    if len(gse_list) > MAX_BULK_GSE:
+        raise ValidationError(f"Bulk mode supports at most {MAX_BULK_GSE} GSE types")
+
+    file = load_data_from_db("gse_data", filters={"Ground support Equipment": gse_list}, columns=GSE_FUEL_COLUMNS)
+    found = set(file["Ground support Equipment"])
+    missing = [gse for gse in gse_list if gse not in found]
+    if missing:
+        raise ValidationError(f"No data found for GSE equipment: {', '.join(missing)}")
+
+    per_equipment = (
+        gse_fuel_totals(file, by="Ground support Equipment")
+        .reindex(gse_list, fill_value=0.0)
+        .to_numpy()
     )
 
+    # Row i selects the equipment whose bit is set in i
+    membership = (np.arange(2 ** len(gse_list))[:, None] >> np.arange(len(gse_list))) & 1
+    subset_totals = membership @ per_equipment
+
+    growth = get_growth_rate(end_year)
+    daily_h2_demand = gse_h2_to_daily_demand(subset_totals[:, 0], growth)
+
+    return [
+        {
+            "gse_list": [gse for gse, selected in zip(gse_list, row) if selected],
+            "daily_h2_demand_ft3": float(daily_h2_demand[i]),
+            "total_diesel_used_lb": float(subset_totals[i, 1]),
+            "total_gasoline_used_lb": float(subset_totals[i, 2])
+        }
+        for i, row in enumerate(membership)
+    ]
+
 
 def compute_storage_area(h2_demand_vol: float) -> float:
     """
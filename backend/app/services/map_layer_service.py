@@ -0,0 +1,255 @@
+# File: backend/app/services/map_layer_service.py
+import os
+import json
+import math
+import hashlib
+import threading
+import numpy as np
+import shapely
+from shapely.geometry import mapping
+
+from app.services.zoning_violations_service import FACILITIES_GEOJSON_PATH
+from app.services import buffer_zone_service
+from app.services.buffer_zone_service import (
+    get_buffer_zones_payload, project_geometries, FROM_LOCAL_CRS
+)
+from app.utils.geo_cache import load_compiled_geojson, load_feature_index, query_features
+from app.utils.http_cache import compress_variants
+from app.utils.validation import ValidationError
+
+GEOJSON_DIR = os.path.join(os.path.dirname(__file__), "../../data/geojson")
+
+# Simplification levels in EPSG:2240 feet; 0 keeps full resolution
+SIMPLIFY_TOLERANCES_FT = (0.0, 2.0, 8.0, 32.0, 128.0)
+
+MAX_MAP_ZOOM = 22
+
+# Latitude used to convert web map zoom levels to ground resolution
+AIRPORT_LATITUDE = 33.64
+
+# Ground resolution of a 256 px Web Mercator tile at zoom 0, at the equator (m/px)
+METERS_PER_PIXEL_Z0 = 156543.03392804097
+FEET_PER_METER = 3.28084
+
+def _buffers_path():
+    # Make sure the buffer file reflects the current facilities before reading it
+    get_buffer_zones_payload()
+    return buffer_zone_service.BUFFER_ZONES_PATH
+
+# Layer name -> function returning the GeoJSON file of the layer
+MAP_LAYERS = {
+    "facilities": lambda: FACILITIES_GEOJSON_PATH,
+    "available_areas": lambda: os.path.join(GEOJSON_DIR, "atl_areas.geojson"),
+    "safety_buffers": lambda: os.path.join(GEOJSON_DIR, "safety_buffers.geojson"),
+    "buffers": _buffers_path,
+}
+
+# Layers whose features are buffers around facilities (matched to amenities by facility_name)
+BUFFER_LAYERS = ("buffers", "safety_buffers")
+
+# {layer: {"version": (path, mtime, size), "source_path": str, "levels": {tolerance: {"features", "body", "etag", "variants"}}}}
+_pyramids = {}
+_pyramids_lock = threading.Lock()
+
+def tolerance_for_zoom(zoom, latitude=AIRPORT_LATITUDE):
+    """
+    Pick the coarsest simplification level that stays below one screen pixel at a zoom level.
+
+    Args:
+        zoom (float): Web map zoom level
+        latitude (float): Latitude of the map view
+
+    Returns:
+        float: One of SIMPLIFY_TOLERANCES_FT
+    """
+    feet_per_pixel = METERS_PER_PIXEL_Z0 * math.cos(math.radians(latitude)) / 2 ** zoom * FEET_PER_METER
+    return pick_tolerance(feet_per_pixel)
+
+def pick_tolerance(tolerance):
+    """Return the largest simplification level not exceeding tolerance (feet)."""
+    return max(level for level in SIMPLIFY_TOLERANCES_FT if level <= tolerance)
+
+def simplification_from_args(args):
+    """
+    Read the simplification level requested through `tolerance` (feet) or `zoom` query parameters.
+
+    Returns:
+        float or None: One of SIMPLIFY_TOLERANCES_FT, or None for the unmodified layer
+    """
+    tolerance, zoom = args.get("tolerance"), args.get("zoom")
+    if tolerance is not None:
+        try:
+            tolerance = float(tolerance)
+        except ValueError:
+            raise ValidationError("tolerance must be a number")
+        if not math.isfinite(tolerance) or tolerance < 0:
+            raise ValidationError("tolerance must be a non-negative number of feet")
+        return pick_tolerance(tolerance)
+    if zoom is not None:
+        try:
+            zoom = float(zoom)
+        except ValueError:
+            raise ValidationError("zoom must be a number")
+        if not 0 <= zoom <= MAX_MAP_ZOOM:
+            raise ValidationError(f"zoom must be between 0 and {MAX_MAP_ZOOM}")
+        return tolerance_for_zoom(zoom)
+    return None
+
+def _feature_collection_bytes(features):
+    """Join pre-serialized features into a GeoJSON FeatureCollection."""
+    return b'{"type":"FeatureCollection","features":[' + b",".join(features) + b"]}"
+
+def build_pyramid(source_path):
+    """
+    Serialize a layer at every simplification level.
+
+    Geometries are simplified in EPSG:2240 feet with topology preserved, then written
+    back as WGS84 GeoJSON. Features are serialized one by one so filtered subsets can
+    be assembled without touching geometry.
+
+    Args:
+        source_path (str): GeoJSON file of the layer
+
+    Returns:
+        dict: tolerance -> {"features": list of bytes, "body": bytes, "etag": str, "variants": dict}
+    """
+    geometries, properties = load_compiled_geojson(source_path)
+    projected = project_geometries(geometries)
+
+    levels = {}
+    for tolerance in SIMPLIFY_TOLERANCES_FT:
+        if tolerance > 0:
+            level_geoms = project_geometries(
+                shapely.simplify(projected, tolerance, preserve_topology=True), FROM_LOCAL_CRS
+            )
+        else:
+            level_geoms = geometries
+        features = [
+            json.dumps({"type": "Feature", "properties": props, "geometry": mapping(geom)}, separators=(",", ":")).encode("utf-8")
+            for props, geom in zip(properties, level_geoms)
+        ]
+        body = _feature_collection_bytes(features)
+        levels[tolerance] = {
+            "features": features,
+            "body": body,
+            "etag": hashlib.sha256(body).hexdigest(),
+            "variants": compress_variants(body),
+        }
+    return levels
+
+def _get_pyramid(layer):
+    source_path = os.path.abspath(MAP_LAYERS[layer]())
+    stat = os.stat(source_path)
+    version = (source_path, stat.st_mtime_ns, stat.st_size)
+    with _pyramids_lock:
+        pyramid = _pyramids.get(layer)
+        if pyramid is None or pyramid["version"] != version:
+            pyramid = {"version": version, "source_path": source_path, "levels": build_pyramid(source_path)}
+            _pyramids[layer] = pyramid
+        return pyramid
+
+def get_simplified_layer(layer, tolerance):
+    """
+    Return a map layer serialized at a simplification level.
+
+    The pyramid of a layer is built once and rebuilt only when its file changes.
+
+    Args:
+        layer (str): One of MAP_LAYERS
+        tolerance (float): Requested simplification in feet (rounded down to a level)
+
+    Returns:
+        dict: body, etag and compressed variants of the layer
+    """
+    return _get_pyramid(layer)["levels"][pick_tolerance(tolerance)]
+
+def _facility_names_with_amenity(amenity):
+    """Names of the facilities of an amenity type, as used by buffer features."""
+    index = load_feature_index(FACILITIES_GEOJSON_PATH)
+    names = index["names"][query_features(index, amenities=[amenity])]
+    return names[names != ""]
+
+def filter_layer_positions(layer, source_path, bbox=None, amenity=None):
+    """
+    Positions of the features of a layer intersecting bbox and matching amenity.
+
+    Buffers have no amenity of their own; they match through the facility they surround.
+
+    Args:
+        layer (str): One of MAP_LAYERS
+        source_path (str): GeoJSON file of the layer
+        bbox (tuple, optional): (minx, miny, maxx, maxy) in WGS84
+        amenity (str, optional): Amenity type to keep
+
+    Returns:
+        np.ndarray: Sorted feature positions
+    """
+    index = load_feature_index(source_path)
+    if amenity is None or layer not in BUFFER_LAYERS:
+        return query_features(index, bbox=bbox, amenities=None if amenity is None else [amenity])
+
+    positions = query_features(index, bbox=bbox)
+    return positions[np.isin(index["facility_names"][positions], _facility_names_with_amenity(amenity))]
+
+def get_filtered_layer(layer, tolerance=None, bbox=None, amenity=None):
+    """
+    Return the features of a map layer inside a bounding box and/or of one amenity type.
+
+    Args:
+        layer (str): One of MAP_LAYERS
+        tolerance (float, optional): Simplification in feet; full resolution by default
+        bbox (tuple, optional): (minx, miny, maxx, maxy) in WGS84
+        amenity (str, optional): Amenity type to keep
+
+    Returns:
+        dict: body, etag and compressed variants of the filtered FeatureCollection
+    """
+    pyramid = _get_pyramid(layer)
+    level = pyramid["levels"][pick_tolerance(tolerance or 0.0)]
+    positions = filter_layer_positions(layer, pyramid["source_path"], bbox=bbox, amenity=amenity)
+    body = _feature_collection_bytes([level["features"][i] for i in positions])
+    return {"body": body, "etag": hashlib.sha256(body).hexdigest(), "variants": compress_variants(body)}
+
+def parse_bbox(value):
+    """Parse a `minx,miny,maxx,maxy` WGS84 bounding box."""
+    try:
+        bbox = tuple(float(part) for part in value.split(","))
+    except ValueError:
+        raise ValidationError("bbox must be minx,miny,maxx,maxy")
+    if len(bbox) != 4 or not all(math.isfinite(v) for v in bbox):
+        raise ValidationError("bbox must be minx,miny,maxx,maxy")
+    minx, miny, maxx, maxy = bbox
+    if minx > maxx or miny > maxy:
+        raise ValidationError("bbox minimum cannot exceed its maximum")
+    return bbox
+
+def filters_from_args(args):
+    """
+    Read the `bbox` and `amenity` query parameters of a map layer request.
+
+    Returns:
+        tuple: (bbox tuple or None, amenity or None)
+    """
+    bbox = parse_bbox(args["bbox"]) if args.get("bbox") else None
+    return bbox, args.get("amenity") or None
+
+def layer_payload_from_args(layer, args):
+    """
+    Resolve the payload for a map layer request with simplification and filter parameters.
+
+    Returns:
+        dict or None: body, etag and variants; None when the request has no
+            parameters and the unmodified layer should be served
+    """
+    tolerance = simplification_from_args(args)
+    bbox, amenity = filters_from_args(args)
+    if bbox is not None or amenity is not None:
+        return get_filtered_layer(layer, tolerance=tolerance, bbox=bbox, amenity=amenity)
+    if tolerance is not None:
+        return get_simplified_layer(layer, tolerance)
+    return None
+
+def clear_pyramids():
+    """Drop every cached simplification pyramid."""
+    with _pyramids_lock:
+        _pyramids.clear()
@@ -0,0 +1,196 @@
+# File: backend/app/services/tile_service.py
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+import numpy as np
+import shapely
+from shapely import STRtree
+from pyproj import Transformer
+
+from app.services.zoning_violations_service import FACILITIES_GEOJSON_PATH
+from app.services import buffer_zone_service
+from app.services.buffer_zone_service import (
+    get_buffer_zones_payload, compute_available_areas, project_geometries, FROM_LOCAL_CRS
+)
+from app.utils.geo_cache import load_compiled_geojson
+from app.utils.http_cache import compress_variants
+from app.utils.mvt import encode_tile, DEFAULT_EXTENT
+from app.utils.validation import ValidationError
+
+# Web Mercator (EPSG:3857) half extent in meters
+WEB_MERCATOR_HALF_WORLD = 20037508.342789244
+MAX_TILE_ZOOM = 22
+
+# Geometry kept around each tile (in tile units) so clipped edges don't show at tile seams
+TILE_BUFFER = 64
+
+# Rendered tiles kept in memory
+TILE_CACHE_SIZE = 2048
+
+TO_WEB_MERCATOR = Transformer.from_crs("EPSG:4326", "EPSG:3857", always_xy=True)
+
+class TileRequestError(ValidationError):
+    """Custom exception for invalid tile requests."""
+    pass
+
+class UnknownTileLayerError(TileRequestError):
+    """Custom exception for tile requests naming a layer that does not exist."""
+    pass
+
+def _facilities_version():
+    stat = os.stat(FACILITIES_GEOJSON_PATH)
+    return stat.st_mtime_ns, stat.st_size
+
+def _load_facilities():
+    return load_compiled_geojson(FACILITIES_GEOJSON_PATH)
+
+def _buffers_version():
+    return get_buffer_zones_payload()[1]
+
+def _load_buffers():
+    return load_compiled_geojson(buffer_zone_service.BUFFER_ZONES_PATH)
+
+def _available_areas_version():
+    return _facilities_version(), _buffers_version()
+
+def _load_available_areas():
+    available = compute_available_areas()
+    properties = [
+        {
+            "area_id": props.get("id"),
+            "area_name": props.get("name"),
+            "area_type": props.get("amenity", "Unknown"),
+            "original_area_sqft": float(available["original_areas_sqft"][i]),
+            "available_area_sqft": float(available["available_areas_sqft"][i]),
+        }
+        for i, props in enumerate(available["properties"])
+    ]
+    return project_geometries(available["available_geometries"], FROM_LOCAL_CRS), properties
+
+# Layer name -> (version function, loader returning (WGS84 geometries, properties))
+TILE_LAYERS = {
+    "facilities": (_facilities_version, _load_facilities),
+    "buffers": (_buffers_version, _load_buffers),
+    "available_areas": (_available_areas_version, _load_available_areas),
+}
+
+# {layer: {"version": ..., "geometries": ndarray in EPSG:3857, "properties": list, "tree": STRtree}}
+_tile_layers = {}
+_tile_layers_lock = threading.Lock()
+
+# (layer, version, z, x, y) -> {"body": bytes, "etag": str, "variants": dict}, least recently used first
+_tile_cache = OrderedDict()
+_tile_cache_lock = threading.Lock()
+
+def get_tile_layer(layer):
+    """
+    Return a layer projected to Web Mercator with an STRtree over its geometries.
+
+    Args:
+        layer (str): One of TILE_LAYERS
+
+    Returns:
+        dict: version, geometries (EPSG:3857), properties and tree of the layer
+    """
+    if layer not in TILE_LAYERS:
+        raise UnknownTileLayerError(f"Unknown tile layer: {layer}")
+
+    version_fn, load_fn = TILE_LAYERS[layer]
+    version = version_fn()
+    with _tile_layers_lock:
+        cached = _tile_layers.get(layer)
+        if cached is None or cached["version"] != version:
+            geometries, properties = load_fn()
+            geometries = project_geometries(geometries, TO_WEB_MERCATOR)
+            cached = {"version": version, "geometries": geometries, "properties": properties, "tree": STRtree(geometries)}
+            _tile_layers[layer] = cached
+        return cached
+
+def validate_tile(z, x, y):
+    """Validate XYZ tile coordinates."""
+    if not 0 <= z <= MAX_TILE_ZOOM:
+        raise TileRequestError(f"Zoom must be between 0 and {MAX_TILE_ZOOM}")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise TileRequestError(f"Tile {x}/{y} is outside zoom level {z}")
+
+def tile_bounds(z, x, y):
+    """Return the (minx, miny, maxx, maxy) Web Mercator bounds of an XYZ tile."""
+    size = 2 * WEB_MERCATOR_HALF_WORLD / 2 ** z
+    minx = -WEB_MERCATOR_HALF_WORLD + x * size
+    maxy = WEB_MERCATOR_HALF_WORLD - y * size
+    return minx, maxy - size, minx + size, maxy
+
+def render_tile(layer_data, layer, z, x, y, extent=DEFAULT_EXTENT):
+    """
+    Clip, simplify and encode the features of one layer that fall in a tile.
+
+    Args:
+        layer_data (dict): Result of get_tile_layer
+        layer (str): Layer name written into the tile
+        z, x, y (int): Tile coordinates
+        extent (int): Tile extent
+
+    Returns:
+        bytes: Encoded Mapbox Vector Tile
+    """
+    minx, miny, maxx, maxy = tile_bounds(z, x, y)
+    size = maxx - minx
+    margin = size * TILE_BUFFER / extent
+    clip_box = (minx - margin, miny - margin, maxx + margin, maxy + margin)
+
+    idx = np.sort(layer_data["tree"].query(shapely.box(*clip_box), predicate="intersects"))
+    geometries = shapely.clip_by_rect(layer_data["geometries"][idx], *clip_box)
+
+    # Drop detail below one tile unit, then move to tile coordinates (y down)
+    geometries = shapely.simplify(geometries, size / extent, preserve_topology=True)
+    scale = extent / size
+    geometries = shapely.transform(
+        geometries, lambda coords: np.column_stack([(coords[:, 0] - minx) * scale, (maxy - coords[:, 1]) * scale])
+    )
+    # Snap to the integer tile grid, keeping geometries valid and dropping collapsed ones
+    geometries = shapely.set_precision(shapely.make_valid(geometries), 1.0)
+
+    features = [
+        (geometry, layer_data["properties"][i])
+        for i, geometry in zip(idx, geometries)
+        if not geometry.is_empty
+    ]
+    return encode_tile({layer: features}, extent)
+
+def get_tile(layer, z, x, y):
+    """
+    Return a vector tile of a layer, rendering it only on a cache miss.
+
+    Args:
+        layer (str): One of TILE_LAYERS
+        z, x, y (int): Tile coordinates
+
+    Returns:
+        dict: body, etag and compressed variants of the tile
+    """
+    validate_tile(z, x, y)
+    layer_data = get_tile_layer(layer)
+    key = (layer, layer_data["version"], z, x, y)
+
+    with _tile_cache_lock:
+        tile = _tile_cache.get(key)
+        if tile is not None:
+            _tile_cache.move_to_end(key)
+            return tile
+
+    body = render_tile(layer_data, layer, z, x, y)
+    tile = {"body": body, "etag": hashlib.sha256(body).hexdigest(), "variants": compress_variants(body)}
+    with _tile_cache_lock:
+        _tile_cache[key] = tile
+        _tile_cache.move_to_end(key)
+        while len(_tile_cache) > TILE_CACHE_SIZE:
+            _tile_cache.popitem(last=False)
+    return tile
+
+def clear_tile_cache():
+    """Drop rendered tiles and projected layers."""
+    with _tile_cache_lock:
+        _tile_cache.clear()
+    with _tile_layers_lock:
+        _tile_layers.clear()
@@ -1,67 +1,143 @@
 # File: backend/app/services/zoning_violations_service.py
+import numpy as np
 import pandas as pd
-import geopandas as gpd
-from shapely.geometry import shape
-from shapely.ops import transform
-from pyproj import CRS, Transformer
+import shapely
+from shapely import STRtree
 from flask import current_app
+from app.utils.geo_cache import load_geodataframe, load_feature_index, query_features
 import os
 import json
+import threading
+
+# Amenities that can host hydrogen storage
+STORAGE_AMENITIES = ["Free Space", "Deicing"]
+
+# Local projected CRS used for distance checks (Georgia State Plane West)
+LOCAL_CRS = "EPSG:2240"
+
+# Facility hazard flags, combined into a per-facility bitmask
+HAZARD_PEOPLE = 1
+HAZARD_FLAMMABLE_LIQUIDS = 2
+HAZARD_OPEN_FIRE = 4
+
+# (bit, facility distance_requirements key, keyword in regulation_info), in matching order
+HAZARD_FLAGS = [
+    (HAZARD_PEOPLE, "contains_people", "people"),
+    (HAZARD_FLAMMABLE_LIQUIDS, "contains_flammable_liquids", "flammable liquids"),
+    (HAZARD_OPEN_FIRE, "contains_open_fire", "open fire"),
+]
+
+FACILITIES_GEOJSON_PATH = os.path.join(os.path.dirname(__file__), "../../data/geojson/facilities.geojson")
+
+# {"signature": (mtime, size), "facilities": GeoDataFrame, "tree": STRtree, "hazards": ndarray}
+_facilities_index = {}
+_facilities_index_lock = threading.Lock()
+
+def get_facilities_index():
+    """
+    Return the facilities projected to LOCAL_CRS and an STRtree over their geometries.
+
+    Both are built once, together with the facility hazard bitmasks (see
+    get_facility_hazards), and reused until facilities.geojson changes on disk.
+
+    Returns:
+        tuple: (GeoDataFrame in LOCAL_CRS, shapely.STRtree over its geometries)
+    """
+    return _load_facilities_index()[:2]
+
+def get_facility_hazards():
+    """
+    Return the hazard bitmask of every facility, aligned with get_facilities_index().
+
+    Returns:
+        np.ndarray: One HAZARD_* bitmask per facility
+    """
+    return _load_facilities_index()[2]
+
+def _load_facilities_index():
+    stat = os.stat(FACILITIES_GEOJSON_PATH)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _facilities_index_lock:
+        if _facilities_index.get("signature") != signature:
+            facilities = load_geodataframe(FACILITIES_GEOJSON_PATH).to_crs(LOCAL_CRS)
+            _facilities_index.update(
+                signature=signature,
+                facilities=facilities,
+                tree=STRtree(facilities.geometry.values),
+                hazards=facility_hazard_flags(facilities)
+            )
+        return _facilities_index["facilities"], _facilities_index["tree"], _facilities_index["hazards"]
 
 def check_safety_violations(amenity_filter=None):
     """
     Detect safety zoning violations between hydrogen storage areas and other facilities.
 
+    Candidate (storage area, facility) pairs come from an STRtree query limited
+    to the largest required safety distance, so only nearby facilities are checked.
+
     Args:
-        amenity_filter (str, optional): Filter facilities by amenity type (e.g., "Free Space", "Deicing"). Defaults to None.
+        amenity_filter (str, optional): Only check storage areas of this amenity type (e.g., "Free Space", "Deicing"). Defaults to None.
 
     Returns:
         list: A list of violation details.
     """
     try:
         # Load data
-        facilities_geojson = load_facilities_data()
+        facilities, tree, hazards = _load_facilities_index()
         requirements_df = load_distances_requirements_data()
-
-        # Create GeoDataFrames
-        facilities = gpd.GeoDataFrame.from_features(facilities_geojson['features'], crs="EPSG:4326")
-
-        # Filter hydrogen storage areas
-        storage_areas = facilities[facilities['amenity'].isin(["Free Space", "Deicing"])]
-
-        # Reproject to a local metric CRS (e.g., EPSG:2240 for Georgia)
-        local_crs = "EPSG:2240"
-        facilities = facilities.to_crs(local_crs)
-        storage_areas = storage_areas.to_crs(local_crs)
+        regulation_masks, regulation_distances_m = compile_regulations(requirements_df)
+
+        # Required distance (m) per facility, from its hazard bitmask
+        required_m = required_distance_by_mask(regulation_masks, regulation_distances_m)[hazards]
+
+        # Hydrogen storage areas (positions within the facilities frame), optionally one amenity only
+        storage_amenities = STORAGE_AMENITIES if amenity_filter is None else [a for a in STORAGE_AMENITIES if a == amenity_filter]
+        storage_positions = query_features(load_feature_index(FACILITIES_GEOJSON_PATH), amenities=storage_amenities)
+        if len(storage_positions) == 0 or not requirements_df:
+            return []
+
+        # Only pairs within the largest safety distance can violate anything
+        max_distance = required_m.max()
+        if max_distance <= 0:
+            return []
+        query_idx, facility_positions = tree.query(
+            facilities.geometry.values[storage_positions], predicate="dwithin", distance=max_distance
+        )
+        storage_positions = storage_positions[query_idx]
+
+        # Skip comparison with itself and keep the storage-area-major order
+        not_self = storage_positions != facility_positions
+        storage_positions, facility_positions = storage_positions[not_self], facility_positions[not_self]
+        order = np.lexsort((facility_positions, storage_positions))
+
+        storage_positions, facility_positions = storage_positions[order], facility_positions[order]
+
+        # Edge-to-edge distances, compared against each target's required distance
+        geometries = facilities.geometry.values
+        distances_m = shapely.distance(geometries[storage_positions], geometries[facility_positions])
+        violating = distances_m < required_m[facility_positions]
 
         violations = []
-
-        # Iterate over hydrogen storage areas
-        for _, storage_area in storage_areas.iterrows():
-            # Iterate over other facilities
-            for _, facility in facilities.iterrows():
-                if storage_area.name == facility.name:  # Skip comparison with itself
-                    continue
-
-                # Match safety regulations based on the target facility's properties
-                matched_regulations = match_regulations(facility, requirements_df)
-
-                # Calculate edge-to-edge distance
-                distance_m = storage_area.geometry.distance(facility.geometry)
-
-                # Check for violations
-                for regulation in matched_regulations:
-                    if distance_m < regulation['safety_distance_ft'] * 0.3048:  # Convert ft to meters
-                        violation = {
-                            "source_name": storage_area.name,
-                            "target_name": facility.name,
-                            "regulation_name": regulation['regulation_name'],
-                            "required_distance_ft": regulation['safety_distance_ft'],
-                            "actual_distance_m": distance_m,
-                            "source_geometry": storage_area.geometry.__geo_interface__,
-                            "target_geometry": facility.geometry.__geo_interface__
-                        }
-                        violations.append(violation)
+        for storage_pos, facility_pos, distance_m in zip(
+            storage_positions[violating], facility_positions[violating], distances_m[violating]
+        ):
+            storage_area = facilities.iloc[storage_pos]
+            facility = facilities.iloc[facility_pos]
+
+            # Report every matched regulation the pair falls short of
+            for reg_idx in _matched_regulation_indices(hazards[facility_pos], regulation_masks):
+                if distance_m < regulation_distances_m[reg_idx]:
+                    regulation = requirements_df[reg_idx]
+                    violation = {
+                        "source_name": storage_area.name,
+                        "target_name": facility.name,
+                        "regulation_name": regulation['regulation_name'],
+                        "required_distance_ft": regulation['safety_distance_ft'],
+                        "actual_distance_m": distance_m,
+                        "source_geometry": storage_area.geometry.__geo_interface__,
+                        "target_geometry": facility.geometry.__geo_interface__
+                    }
+                    violations.append(violation)
 
         return violations
 
@@ -71,9 +147,8 @@ def check_safety_violations(amenity_filter=None):
 
 def load_facilities_data():
     """Load facilities data from the GeoJSON file."""
-    file_path = os.path.join(os.path.dirname(__file__), "../../data/geojson/facilities.geojson")
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
+        with open(FACILITIES_GEOJSON_PATH, 'r', encoding='utf-8') as f:
             return json.load(f)
     except FileNotFoundError:
         raise FileNotFoundError("Facilities GeoJSON file not found.")
@@ -91,28 +166,87 @@ def load_distances_requirements_data():
     except pd.errors.EmptyDataError:
         raise ValueError("Distances requirements CSV file is empty.")
 
-def match_regulations(facility, regulations):
-    """Match safety regulations based on facility properties."""
-    matched_regulations = []
-    # In a GeoDataFrame loaded via from_features, the attributes from GeoJSON
-    # become top-level columns. 
-    # Retrieve the 'distance_requirements' column from the facility object.
-    dr = facility.get("distance_requirements")
+def _parse_distance_requirements(dr):
+    """Return a facility's distance_requirements as a dict."""
     if not isinstance(dr, dict):
         # Sometimes the 'distance_requirements' column may be stored as a string.
         try:
-            import json
             dr = json.loads(dr)
         except Exception:
             dr = {}
+    return dr
 
-    for regulation in regulations:
+def facility_hazard_flags(facilities):
+    """
+    Compute the hazard bitmask of each facility from its distance_requirements.
+
+    Args:
+        facilities (GeoDataFrame): Facilities loaded via from_features
+
+    Returns:
+        np.ndarray: One HAZARD_* bitmask per facility
+    """
+    if "distance_requirements" not in facilities:
+        return np.zeros(len(facilities), dtype=np.int64)
+
+    requirements = [_parse_distance_requirements(dr) for dr in facilities["distance_requirements"]]
+    hazards = np.zeros(len(facilities), dtype=np.int64)
+    for bit, key, _ in HAZARD_FLAGS:
+        hazards |= np.array([bool(dr.get(key, False)) for dr in requirements], dtype=np.int64) * bit
+    return hazards
+
+def compile_regulations(regulations):
+    """
+    Compile regulations into hazard bitmasks and required distances.
+
+    Args:
+        regulations (list): Regulation records from load_distances_requirements_data
+
+    Returns:
+        tuple: (bitmask of hazards each regulation applies to, required distances in meters)
+    """
+    masks = np.zeros(len(regulations), dtype=np.int64)
+    for i, regulation in enumerate(regulations):
         regulation_info = regulation['regulation_info'].lower()
-        if "people" in regulation_info and dr.get('contains_people', False):
-            matched_regulations.append(regulation)
-        if "flammable liquids" in regulation_info and dr.get('contains_flammable_liquids', False):
-            matched_regulations.append(regulation)
-        if "open fire" in regulation_info and dr.get('contains_open_fire', False):
-            matched_regulations.append(regulation)
-
-    return matched_regulations
\ No newline at end of file
+        for bit, _, keyword in HAZARD_FLAGS:
+            if keyword in regulation_info:
+                masks[i] |= bit
+    distances_m = np.array([regulation['safety_distance_ft'] for regulation in regulations], dtype=float) * 0.3048  # Convert ft to meters
+    return masks, distances_m
+
+def required_distance_by_mask(regulation_masks, regulation_distances_m):
+    """
+    Map every possible facility hazard bitmask to the largest distance (m) it requires.
+
+    Args:
+        regulation_masks (np.ndarray): Hazard bitmask per regulation
+        regulation_distances_m (np.ndarray): Required distance per regulation, in meters
+
+    Returns:
+        np.ndarray: Required distance indexed by facility bitmask (0 when nothing applies)
+    """
+    all_masks = np.arange(1 << len(HAZARD_FLAGS))
+    applies = (all_masks[:, None] & regulation_masks[None, :]) != 0
+    return np.where(applies, regulation_distances_m[None, :], 0.0).max(axis=1, initial=0.0)
+
+def _matched_regulation_indices(facility_mask, regulation_masks):
+    """Regulation indices matching a facility bitmask, once per shared hazard, in regulation order."""
+    return [
+        reg_idx
+        for reg_idx, reg_mask in enumerate(regulation_masks)
+        for bit, _, _ in HAZARD_FLAGS
+        if reg_mask & facility_mask & bit
+    ]
+
+def match_regulations(facility, regulations):
+    """Match safety regulations based on facility properties."""
+    # In a GeoDataFrame loaded via from_features, the attributes from GeoJSON
+    # become top-level columns.
+    dr = _parse_distance_requirements(facility.get("distance_requirements"))
+    facility_mask = 0
+    for bit, key, _ in HAZARD_FLAGS:
+        if dr.get(key, False):
+            facility_mask |= bit
+
+    regulation_masks, _ = compile_regulations(regulations)
+    return [regulations[i] for i in _matched_regulation_indices(facility_mask, regulation_masks)]
@@ -1,11 +1,23 @@
 # File: backend/app/utils/data_loader.py
 
 import os
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import numpy as np
 import pandas as pd
-from sqlalchemy import create_engine, text
+from sqlalchemy import create_engine, event, text, inspect
+from sqlalchemy.pool import StaticPool
 import logging
 import json
 
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,12 +33,171 @@ DATA_PATH = os.path.join(BASE_DIR, "data")
 AC_DB_CONNECTION_STRING = os.getenv("AC_DB_CONNECTION_STRING", f"sqlite:///{DATA_PATH}/ac_data.db")
 GSE_DB_CONNECTION_STRING = os.getenv("GSE_DB_CONNECTION_STRING", f"sqlite:///{DATA_PATH}/gse_data.db")
 
-# Initialize database engines
-ac_engine = create_engine(AC_DB_CONNECTION_STRING)
-gse_engine = create_engine(GSE_DB_CONNECTION_STRING)
+# Connection pool settings (overridable with the DB_POOL_* app config keys)
+DEFAULT_POOL_SIZE = 5
+DEFAULT_MAX_OVERFLOW = 10
+DEFAULT_POOL_TIMEOUT = 30
+DEFAULT_POOL_RECYCLE = 3600
+
+# Pragmas applied to every new SQLite connection (overridable with SQLITE_PRAGMAS)
+DEFAULT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "mmap_size": 268435456,  # 256 MB
+    "cache_size": -65536,  # 64 MB (negative values are KiB)
+    "busy_timeout": 5000,
+}
+
+def create_db_engine(
+    uri,
+    pool_size=DEFAULT_POOL_SIZE,
+    max_overflow=DEFAULT_MAX_OVERFLOW,
+    pool_timeout=DEFAULT_POOL_TIMEOUT,
+    pool_recycle=DEFAULT_POOL_RECYCLE,
+    sqlite_pragmas=None
+):
+    """
+    Create a pooled engine that can be shared by request threads.
+    
+    SQLite connections are opened with check_same_thread=False and configured with
+    sqlite_pragmas on connect. In-memory SQLite databases use a single shared
+    connection, since every new connection would see an empty database.
+    
+    Args:
+        uri (str): SQLAlchemy database URI.
+        pool_size (int): Connections kept open in the pool.
+        max_overflow (int): Extra connections allowed under load.
+        pool_timeout (int): Seconds to wait for a free connection.
+        pool_recycle (int): Seconds after which a connection is replaced.
+        sqlite_pragmas (dict): PRAGMA name -> value for SQLite; DEFAULT_SQLITE_PRAGMAS if None.
+        
+    Returns:
+        Engine: The configured SQLAlchemy engine.
+    """
+    if not uri.startswith("sqlite"):
+        return create_engine(
+            uri, pool_size=pool_size, max_overflow=max_overflow, pool_timeout=pool_timeout,
+            pool_recycle=pool_recycle, pool_pre_ping=True
+        )
+
+    in_memory = uri in ("sqlite://", "sqlite:///:memory:")
+    if in_memory:
+        engine = create_engine(uri, connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    else:
+        engine = create_engine(
+            uri, connect_args={"check_same_thread": False}, pool_size=pool_size, max_overflow=max_overflow,
+            pool_timeout=pool_timeout, pool_recycle=pool_recycle, pool_pre_ping=True
+        )
+
+    pragmas = dict(DEFAULT_SQLITE_PRAGMAS if sqlite_pragmas is None else sqlite_pragmas)
+    if in_memory:
+        # Memory databases have no WAL or file to map
+        pragmas.pop("journal_mode", None)
+        pragmas.pop("mmap_size", None)
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+    return engine
+
+# Module-level engines, kept for scripts and existing imports; init_db_engines rebinds them
+ac_engine = create_db_engine(AC_DB_CONNECTION_STRING)
+gse_engine = create_db_engine(GSE_DB_CONNECTION_STRING)
+
+# Database name ("ac"/"gse") -> engine used outside of a Flask app context
+_engines = {"ac": ac_engine, "gse": gse_engine}
+_engines_lock = threading.Lock()
+
+# Precomputed fuel-burn aggregate used for aircraft H2 demand
+AC_FUEL_INDEX_TABLE = "ac_fuel_index"
+AC_FUEL_INDEX_KEYS = ["MONTH", "DATA_SOURCE", "UNIQUE_CARRIER", "ORIGIN", "AIRCRAFT_TYPE"]
+
+# Tables load_data_from_db may query: name -> (default database, source CSV or None if derived)
+QUERYABLE_TABLES = {
+    "ac_data": ("ac", "ac_data.csv"),
+    "gse_data": ("gse", "gse_data.csv"),
+    AC_FUEL_INDEX_TABLE: ("ac", None),
+}
+
+# Tables served from the in-process columnar cache instead of SQL
+CACHED_TABLES = ("ac_data", "gse_data", AC_FUEL_INDEX_TABLE)
+
+# Declared column types of the tables loaded from CSV (columns not listed are inferred)
+TABLE_SCHEMAS = {
+    "ac_data": {
+        "DEPARTURES_PERFORMED": "INTEGER",
+        "DISTANCE": "INTEGER",
+        "AIR_TIME": "INTEGER",
+        "UNIQUE_CARRIER": "TEXT",
+        "UNIQUE_CARRIER_NAME": "TEXT",
+        "ORIGIN_AIRPORT_ID": "INTEGER",
+        "ORIGIN": "TEXT",
+        "ORIGIN_CITY_NAME": "TEXT",
+        "DEST_AIRPORT_ID": "INTEGER",
+        "DEST": "TEXT",
+        "DEST_CITY_NAME": "TEXT",
+        "AIRCRAFT_TYPE": "INTEGER",
+        "MONTH": "INTEGER",
+        "DATA_SOURCE": "TEXT",
+        "FUEL_CONSUMPTION": "REAL",
+    },
+    "gse_data": {
+        "Ground support Equipment": "TEXT",
+        "Fuel used": "TEXT",
+        "Fuel Consumption Online": "TEXT",
+        "Average speed (mi/hr)": "REAL",
+        "Usable Fuel Consumption (ft3/min)": "REAL",
+        "Operating time - Departure": "INTEGER",
+        "Operating Time - Arrival": "INTEGER",
+        "Notes": "TEXT",
+        "link": "TEXT",
+    },
+}
+
+# Columns indexed after a load: the filters used by load_data_from_db callers
+TABLE_INDEXES = {
+    "ac_data": ["MONTH", "DATA_SOURCE", "UNIQUE_CARRIER", "ORIGIN"],
+    AC_FUEL_INDEX_TABLE: [AC_FUEL_INDEX_KEYS],
+}
+
+# Rows per executemany call during a bulk load
+BULK_INSERT_BATCH_SIZE = 50000
+
+# Records the CSV each table was populated from, so unchanged sources are not reloaded
+SOURCE_METADATA_TABLE = "source_metadata"
+
+# Aggregate functions accepted by load_data_from_db: name -> (SQL function, pandas method)
+AGGREGATE_FUNCTIONS = {
+    "sum": ("SUM", "sum"),
+    "avg": ("AVG", "mean"),
+    "min": ("MIN", "min"),
+    "max": ("MAX", "max"),
+    "count": ("COUNT", "count"),
+}
+
+# (table_name, engine) pairs known to exist with data, so queries skip the existence check
+_ready_tables = set()
+_ready_tables_lock = threading.Lock()
+
+# (table_name, engine) -> column names, read once per ready table
+_table_columns = {}
+
+# (table_name, engine) -> {"columns": {column: np.ndarray}, "rows": int}
+_table_cache = {}
+_table_cache_lock = threading.RLock()
 
 def init_db_engines(app):
-    """Initialize database engines with application config.
+    """Initialize database engines with application config and register them on the app.
+    
+    Engines are stored in app.extensions["db_engines"] and looked up through get_engine,
+    so requests always use the engines of the app serving them. The module-level
+    ac_engine/gse_engine names are rebound for backward compatibility.
     
     Args:
         app: Flask application instance with configuration
@@ -39,24 +210,59 @@ def init_db_engines(app):
     # Update engine connections based on app config
     ac_db_uri = app.config.get('AC_DB_URI', AC_DB_CONNECTION_STRING)
     gse_db_uri = app.config.get('GSE_DB_URI', GSE_DB_CONNECTION_STRING)
+    engine_options = {
+        "pool_size": app.config.get("DB_POOL_SIZE", DEFAULT_POOL_SIZE),
+        "max_overflow": app.config.get("DB_MAX_OVERFLOW", DEFAULT_MAX_OVERFLOW),
+        "pool_timeout": app.config.get("DB_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT),
+        "pool_recycle": app.config.get("DB_POOL_RECYCLE", DEFAULT_POOL_RECYCLE),
+        "sqlite_pragmas": app.config.get("SQLITE_PRAGMAS"),
+    }
     
-    ac_engine = create_engine(ac_db_uri)
-    gse_engine = create_engine(gse_db_uri)
+    engines = {
+        "ac": create_db_engine(ac_db_uri, **engine_options),
+        "gse": create_db_engine(gse_db_uri, **engine_options),
+    }
+    app.extensions["db_engines"] = engines
+    with _engines_lock:
+        _engines.update(engines)
+        ac_engine, gse_engine = engines["ac"], engines["gse"]
+    invalidate_table_cache()
+    clear_table_readiness()
     
     logger.info(f"Initialized AC database engine with: {ac_db_uri}")
     logger.info(f"Initialized GSE database engine with: {gse_db_uri}")
     
     return ac_engine, gse_engine
 
-def load_csv(file_name):
+def get_engine(db="ac"):
     """
-    Load a CSV file from the data directory.
+    Return the engine of a database for the current app (or the module default outside one).
     
     Args:
-        file_name (str): Name of the CSV file.
+        db (str): The database name ("ac" or "gse").
         
     Returns:
-        pd.DataFrame: Loaded data as a Pandas DataFrame.
+        Engine: The SQLAlchemy engine.
+    """
+    if db not in _engines:
+        raise ValueError(f"Unknown database: {db}")
+    try:
+        from flask import current_app
+        engines = current_app.extensions.get("db_engines")
+    except RuntimeError:
+        # Not in Flask app context
+        engines = None
+    return (engines or _engines)[db]
+
+def get_data_file_path(file_name):
+    """
+    Resolve a file name to its path in the data directory.
+    
+    Args:
+        file_name (str): Name of the file in the data directory.
+        
+    Returns:
+        str: Absolute path of the file (which may not exist).
     """
     # Try to get data path from Flask app config if in app context
     try:
@@ -66,13 +272,323 @@ def load_csv(file_name):
         # Not in Flask app context, use the default
         data_path = DATA_PATH
     
-    file_path = os.path.join(data_path, file_name)
+    return os.path.join(data_path, file_name)
+
+def load_csv(file_name):
+    """
+    Load a CSV file from the data directory.
+    
+    Args:
+        file_name (str): Name of the CSV file.
+        
+    Returns:
+        pd.DataFrame: Loaded data as a Pandas DataFrame.
+    """
+    file_path = get_data_file_path(file_name)
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"File not found: {file_path}")
     
     logger.info(f"Loading CSV file: {file_path}")
     return pd.read_csv(file_path)
 
+def _sqlite_type(series):
+    """SQLite column type for a pandas column without a declared type."""
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(series):
+        return "REAL"
+    return "TEXT"
+
+def table_schema(df, table_name):
+    """
+    Column types used to create a table, from TABLE_SCHEMAS or inferred from the DataFrame.
+    
+    Args:
+        df (pd.DataFrame): Rows to be loaded.
+        table_name (str): Name of the table.
+        
+    Returns:
+        dict: {column: "INTEGER" | "REAL" | "TEXT"} in DataFrame column order.
+    """
+    declared = TABLE_SCHEMAS.get(table_name, {})
+    return {column: declared.get(column) or _sqlite_type(df[column]) for column in df.columns}
+
+def coerce_to_schema(df, schema):
+    """
+    Cast DataFrame columns to their declared types (unparseable numbers become NULL).
+    
+    Args:
+        df (pd.DataFrame): Rows to be loaded.
+        schema (dict): Result of table_schema.
+        
+    Returns:
+        pd.DataFrame: A typed copy of df.
+    """
+    df = df.copy()
+    for column, column_type in schema.items():
+        if column_type == "INTEGER":
+            values = pd.to_numeric(df[column], errors="coerce")
+            df[column] = values.astype("Int64") if values.isna().any() else values.astype("int64")
+        elif column_type == "REAL":
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(float)
+    return df
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+def _index_name(table_name, columns):
+    suffix = "_".join("".join(c if c.isalnum() else "_" for c in column.lower()) for column in columns)
+    return f"ix_{table_name}_{suffix}"
+
+def bulk_load_table(df, engine, table_name):
+    """
+    Replace a table with the rows of a DataFrame in a single transaction.
+    
+    The table is created with declared column types (see TABLE_SCHEMAS), rows are
+    inserted with executemany in batches of BULK_INSERT_BATCH_SIZE, and the indexes in
+    TABLE_INDEXES are built once the data is in. On SQLite the load runs with
+    synchronous=OFF and the connection's previous synchronous setting is restored
+    afterwards; the journal mode is left as the engine configured it.
+    
+    Args:
+        df (pd.DataFrame): Rows to load.
+        engine (Engine): SQLAlchemy engine for the database.
+        table_name (str): Name of the table to create/replace.
+        
+    Returns:
+        pd.DataFrame: The typed rows that were written.
+    """
+    schema = table_schema(df, table_name)
+    df = coerce_to_schema(df, schema)
+    columns = list(schema)
+
+    create_sql = f"CREATE TABLE {_quote(table_name)} ({', '.join(f'{_quote(c)} {t}' for c, t in schema.items())})"
+    placeholder = "?" if engine.dialect.paramstyle == "qmark" else "%s"
+    insert_sql = (
+        f"INSERT INTO {_quote(table_name)} ({', '.join(_quote(c) for c in columns)}) "
+        f"VALUES ({', '.join(placeholder for _ in columns)})"
+    )
+    # Plain Python values with NULL for missing entries
+    rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+    is_sqlite = engine.dialect.name == "sqlite"
+
+    with engine.connect() as conn:
+        if is_sqlite:
+            # Pooled connection: remember its configured level to put it back afterwards
+            synchronous = conn.exec_driver_sql("PRAGMA synchronous").scalar()
+            conn.exec_driver_sql("PRAGMA synchronous=OFF")
+            conn.commit()
+        try:
+            with conn.begin():
+                if is_sqlite:
+                    # pysqlite only opens a transaction before DML; start it here so the
+                    # DROP/CREATE commit or roll back together with the inserts
+                    conn.exec_driver_sql("BEGIN")
+                conn.exec_driver_sql(f"DROP TABLE IF EXISTS {_quote(table_name)}")
+                conn.exec_driver_sql(create_sql)
+                for start in range(0, len(rows), BULK_INSERT_BATCH_SIZE):
+                    conn.exec_driver_sql(insert_sql, rows[start:start + BULK_INSERT_BATCH_SIZE])
+                for index_columns in TABLE_INDEXES.get(table_name, []):
+                    index_columns = [index_columns] if isinstance(index_columns, str) else index_columns
+                    conn.exec_driver_sql(
+                        f"CREATE INDEX {_quote(_index_name(table_name, index_columns))} "
+                        f"ON {_quote(table_name)} ({', '.join(_quote(c) for c in index_columns)})"
+                    )
+        finally:
+            if is_sqlite:
+                conn.exec_driver_sql(f"PRAGMA synchronous={int(synchronous)}")
+                conn.commit()
+
+    logger.info(f"Bulk loaded {len(rows)} rows into '{table_name}'")
+    return df
+
+def read_table_csv(csv_path):
+    """
+    Read a source CSV and apply the cleaning done before it is loaded.
+    
+    Args:
+        csv_path (str): Path to the CSV file.
+        
+    Returns:
+        pd.DataFrame: The cleaned rows.
+    """
+    df = pd.read_csv(csv_path)
+    if "Ground support Equipment" in df.columns:
+        df["Ground support Equipment"] = df["Ground support Equipment"].str.strip()
+    return df
+
+def has_table_indexes(engine, table_name):
+    """Whether every index declared in TABLE_INDEXES exists on a table."""
+    expected = {
+        _index_name(table_name, [columns] if isinstance(columns, str) else columns)
+        for columns in TABLE_INDEXES.get(table_name, [])
+    }
+    if not expected:
+        return True
+    return expected <= {index["name"] for index in inspect(engine).get_indexes(table_name)}
+
+def build_fuel_burn_index(df):
+    """
+    Aggregate aircraft fuel weight (FUEL_CONSUMPTION * AIR_TIME / 60) and departures by AC_FUEL_INDEX_KEYS.
+    
+    Args:
+        df (pd.DataFrame): Typed ac_data rows (see coerce_to_schema).
+        
+    Returns:
+        pd.DataFrame: One row per key combination with its summed FUEL_WEIGHT and DEPARTURES.
+    """
+    return (
+        df[AC_FUEL_INDEX_KEYS]
+        .assign(
+            FUEL_WEIGHT=df["FUEL_CONSUMPTION"] * df["AIR_TIME"] / 60,
+            DEPARTURES=df["DEPARTURES_PERFORMED"]
+        )
+        .groupby(AC_FUEL_INDEX_KEYS, as_index=False, dropna=False)[["FUEL_WEIGHT", "DEPARTURES"]]
+        .sum()
+    )
+
+# Tables derived from another table when it is (re)populated: name -> (source table, builder)
+DERIVED_TABLES = {
+    AC_FUEL_INDEX_TABLE: ("ac_data", build_fuel_burn_index),
+}
+
+def populate_derived_tables(df, engine, source_table):
+    """
+    Rebuild every derived table whose source is `source_table`.
+    
+    Args:
+        df (pd.DataFrame): The typed rows just written to the source table.
+        engine (Engine): SQLAlchemy engine for the database.
+        source_table (str): Name of the source table.
+    """
+    for table_name, (source, builder) in DERIVED_TABLES.items():
+        if source != source_table:
+            continue
+        derived = builder(df)
+        bulk_load_table(derived, engine, table_name)
+        invalidate_table_cache(table_name)
+        mark_table_ready(table_name, engine)
+        logger.info(f"Derived table '{table_name}' rebuilt from '{source_table}' ({len(derived)} rows)")
+
+def csv_fingerprint(file_path):
+    """
+    Describe a source file by its size, modification time and content hash.
+    
+    Args:
+        file_path (str): Path to the file.
+        
+    Returns:
+        dict: {"size": int, "mtime_ns": int, "sha256": str}
+    """
+    stat = os.stat(file_path)
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": digest.hexdigest()}
+
+def read_source_metadata(engine, table_name):
+    """
+    Return the fingerprint recorded when a table was last populated.
+    
+    Args:
+        engine (Engine): SQLAlchemy engine for the database.
+        table_name (str): Name of the populated table.
+        
+    Returns:
+        dict or None: {"source_file", "size", "mtime_ns", "sha256"}, or None if never recorded.
+    """
+    if not inspect(engine).has_table(SOURCE_METADATA_TABLE):
+        return None
+    with engine.connect() as conn:
+        row = conn.execute(
+            text(f"SELECT source_file, size, mtime_ns, sha256 FROM {SOURCE_METADATA_TABLE} WHERE table_name = :table_name"),
+            {"table_name": table_name}
+        ).mappings().fetchone()
+    return dict(row) if row is not None else None
+
+def write_source_metadata(engine, table_name, source_file, fingerprint):
+    """
+    Record the source file a table was populated from.
+    
+    Args:
+        engine (Engine): SQLAlchemy engine for the database.
+        table_name (str): Name of the populated table.
+        source_file (str): Path of the CSV the table was loaded from.
+        fingerprint (dict): Result of csv_fingerprint for that file.
+    """
+    with engine.begin() as conn:
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {SOURCE_METADATA_TABLE} ("
+            "table_name TEXT PRIMARY KEY, source_file TEXT, size INTEGER, "
+            "mtime_ns INTEGER, sha256 TEXT, loaded_at TEXT)"
+        ))
+        conn.execute(text(f"DELETE FROM {SOURCE_METADATA_TABLE} WHERE table_name = :table_name"), {"table_name": table_name})
+        conn.execute(
+            text(
+                f"INSERT INTO {SOURCE_METADATA_TABLE} (table_name, source_file, size, mtime_ns, sha256, loaded_at) "
+                "VALUES (:table_name, :source_file, :size, :mtime_ns, :sha256, :loaded_at)"
+            ),
+            {
+                "table_name": table_name,
+                "source_file": os.path.basename(source_file),
+                "loaded_at": datetime.now(timezone.utc).isoformat(),
+                **fingerprint
+            }
+        )
+
+def _populate_lock_path(engine, table_name):
+    """Lock file next to the SQLite database, or in the data directory for other backends."""
+    database = engine.url.database
+    if engine.url.get_backend_name() == "sqlite" and database and database != ":memory:":
+        return f"{database}.{table_name}.lock"
+    return os.path.join(DATA_PATH, f".{table_name}.populate.lock")
+
+@contextmanager
+def populate_lock(lock_path):
+    """
+    Hold an exclusive inter-process lock on a file for the duration of the block.
+    
+    Used so only one of several workers booting together rebuilds a table.
+    
+    Args:
+        lock_path (str): Path of the lock file (created if missing).
+    """
+    with open(lock_path, "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            lock_file.seek(0)
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+            else:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+def _source_unchanged(engine, table_name, csv_path):
+    """Whether table_name was populated from csv_path as it is on disk now."""
+    stored = read_source_metadata(engine, table_name)
+    if stored is None or stored["source_file"] != os.path.basename(csv_path):
+        return False
+    if not inspect(engine).has_table(table_name) or not has_table_indexes(engine, table_name):
+        return False
+    stat = os.stat(csv_path)
+    if stored["size"] != stat.st_size:
+        return False
+    if stored["mtime_ns"] == stat.st_mtime_ns:
+        return True
+
+    # Touched but possibly identical: compare contents and refresh the recorded mtime
+    fingerprint = csv_fingerprint(csv_path)
+    if fingerprint["sha256"] != stored["sha256"]:
+        return False
+    write_source_metadata(engine, table_name, csv_path, fingerprint)
+    return True
+
 def populate_database(csv_file, engine, table_name):
     """
     Populate an SQLite database table from a CSV file, overwriting existing data.
@@ -86,24 +602,55 @@ def populate_database(csv_file, engine, table_name):
         logger.info(f"Using database engine for table: {table_name}")
         
         # Read the CSV file
+        csv_path = os.path.join(DATA_PATH, csv_file)
         logger.info(f"Reading data from {csv_file}...")
-        df = pd.read_csv(os.path.join(DATA_PATH, csv_file))
-        logger.info(f"First few rows of data from {csv_file}:\n{df.head()}")
+        fingerprint = csv_fingerprint(csv_path)
+        df = read_table_csv(csv_path)
+        logger.info(f"Read {len(df)} rows from {csv_file}")
 
-        # Clean data if needed
-        if "Ground support Equipment" in df.columns:
-            df["Ground support Equipment"] = df["Ground support Equipment"].str.strip()
-
-        # Write data to the database, overwriting if it exists
+        # Write typed, indexed data to the database, overwriting if it exists
         logger.info(f"Populating table '{table_name}'...")
-        with engine.connect() as conn:
-            df.to_sql(table_name, conn, if_exists="replace", index=False)
+        df = bulk_load_table(df, engine, table_name)
+        invalidate_table_cache(table_name)
+        mark_table_ready(table_name, engine)
+        populate_derived_tables(df, engine, table_name)
+        write_source_metadata(engine, table_name, csv_path, fingerprint)
         logger.info(f"Table '{table_name}' populated successfully.")
 
     except Exception as e:
         logger.error(f"Error populating database: {str(e)}")
         raise
 
+def populate_database_if_changed(csv_file, engine, table_name):
+    """
+    Populate a table from a CSV file unless it was already loaded from the same file contents.
+    
+    The size, mtime and SHA-256 of the CSV are recorded in SOURCE_METADATA_TABLE on every
+    load. Concurrent callers (e.g. several workers starting at once) are serialized with a
+    file lock, so only the first one rebuilds and the others see the fresh metadata.
+    
+    Args:
+        csv_file (str): Name of the CSV file in the data directory.
+        engine (Engine): SQLAlchemy engine for the database.
+        table_name (str): Name of the table to create/populate.
+        
+    Returns:
+        bool: True if the table was (re)populated, False if it was already up to date.
+    """
+    csv_path = os.path.join(DATA_PATH, csv_file)
+    with populate_lock(_populate_lock_path(engine, table_name)):
+        if _source_unchanged(engine, table_name, csv_path):
+            logger.info(f"Table '{table_name}' is up to date with {csv_file}; skipping population.")
+            mark_table_ready(table_name, engine)
+            return False
+        populate_database(csv_file, engine, table_name)
+        return True
+
+def _has_rows(engine, table_name):
+    """Whether a table exists and holds at least one row (without scanning it)."""
+    with engine.connect() as conn:
+        return conn.execute(text(f"SELECT 1 FROM {_quote(table_name)} LIMIT 1")).first() is not None
+
 def ensure_database_exists(engine, table_name, csv_file):
     """
     Ensure database table exists and is populated.
@@ -113,77 +660,413 @@ def ensure_database_exists(engine, table_name, csv_file):
         table_name (str): Name of the table to check/create.
         csv_file (str): Path to the CSV file to use if table needs to be created.
     """
+    if table_name in DERIVED_TABLES:
+        ensure_derived_table_exists(engine, table_name)
+        return
+
     try:
-        with engine.connect() as conn:
-            # Check if table exists and has data
-            result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}")).scalar()
-            if result == 0:
-                # Table exists but is empty
-                df = pd.read_csv(csv_file)
-                if "Ground support Equipment" in df.columns:
-                    df["Ground support Equipment"] = df["Ground support Equipment"].str.strip()
-                df.to_sql(table_name, engine, if_exists="replace", index=False)
-                logger.info(f"Table '{table_name}' was empty and has been populated.")
+        exists = _has_rows(engine, table_name)
     except Exception:
-        # Table doesn't exist, create it
-        if os.path.exists(csv_file):
-            df = pd.read_csv(csv_file)
-            if "Ground support Equipment" in df.columns:
-                df["Ground support Equipment"] = df["Ground support Equipment"].str.strip()
-            df.to_sql(table_name, engine, if_exists="replace", index=False)
-            logger.info(f"Table '{table_name}' didn't exist and has been created.")
-        else:
+        exists = False
+
+    if not exists:
+        # Table is missing or empty, create it
+        if csv_file is None or not os.path.exists(csv_file):
             raise FileNotFoundError(f"No data found for table {table_name}")
+        df = bulk_load_table(read_table_csv(csv_file), engine, table_name)
+        invalidate_table_cache(table_name)
+        populate_derived_tables(df, engine, table_name)
+        logger.info(f"Table '{table_name}' was missing or empty and has been populated.")
+    mark_table_ready(table_name, engine)
+
+def ensure_derived_table_exists(engine, table_name):
+    """
+    Ensure a derived table exists, building it from its source table if needed.
+    
+    Args:
+        engine (Engine): SQLAlchemy engine for the database.
+        table_name (str): Name of a table registered in DERIVED_TABLES.
+    """
+    try:
+        if _has_rows(engine, table_name):
+            mark_table_ready(table_name, engine)
+            return
+    except Exception:
+        pass
+
+    source_table, _ = DERIVED_TABLES[table_name]
+    ensure_database_exists(engine, source_table, os.path.join(DATA_PATH, f"{source_table}.csv"))
+    df = pd.read_sql(text(f"SELECT * FROM {_quote(source_table)}"), engine)
+    populate_derived_tables(df, engine, source_table)
+
+def resolve_table(table_name, db=None):
+    """
+    Check a table name against QUERYABLE_TABLES and find its database and source CSV.
+    
+    Args:
+        table_name (str): The name of the database table.
+        db (str): Database override ("ac" or "gse"); the table's own database if None.
+        
+    Returns:
+        tuple: (db name, CSV path or None for derived tables)
+    """
+    if table_name not in QUERYABLE_TABLES:
+        raise ValueError(f"Unknown table: {table_name}")
+    default_db, csv_name = QUERYABLE_TABLES[table_name]
+    csv_file = os.path.join(DATA_PATH, csv_name) if csv_name else None
+    return db or default_db, csv_file
+
+def mark_table_ready(table_name, engine):
+    """Record that a table exists with data on an engine."""
+    with _ready_tables_lock:
+        _ready_tables.add((table_name, engine))
+        # The table may have just been rebuilt with different columns
+        _table_columns.pop((table_name, engine), None)
+
+def is_table_ready(table_name, engine):
+    """Whether a table has been confirmed to exist with data on an engine."""
+    return (table_name, engine) in _ready_tables
+
+def clear_table_readiness():
+    """Forget every table confirmed ready (e.g. after engines are replaced)."""
+    with _ready_tables_lock:
+        _ready_tables.clear()
+        _table_columns.clear()
+
+def ensure_table_ready(table_name, engine, csv_file):
+    """
+    Make sure a table can be queried, checking (and building) it only the first time.
+    
+    Args:
+        table_name (str): The name of the database table.
+        engine (Engine): SQLAlchemy engine for the database.
+        csv_file (str): CSV file used to create the table if it is missing.
+    """
+    if is_table_ready(table_name, engine):
+        return
+    # Serialize first-time checks so concurrent requests don't each build the table
+    with _table_cache_lock:
+        if not is_table_ready(table_name, engine):
+            ensure_database_exists(engine, table_name, csv_file)
+
+def get_table_columns(table_name, engine):
+    """
+    Column names of a ready table, read from the database schema once.
+    
+    Args:
+        table_name (str): The name of the database table.
+        engine (Engine): SQLAlchemy engine for the database.
+        
+    Returns:
+        list: Column names in table order.
+    """
+    key = (table_name, engine)
+    columns = _table_columns.get(key)
+    if columns is None:
+        columns = [column["name"] for column in inspect(engine).get_columns(table_name)]
+        with _ready_tables_lock:
+            _table_columns[key] = columns
+    return columns
+
+def check_tables_ready():
+    """
+    Confirm (building them if needed) that every queryable table is ready on its engine.
+    
+    Returns:
+        dict: table name -> True if ready, False if it could not be prepared
+    """
+    status = {}
+    for table_name in QUERYABLE_TABLES:
+        db, csv_file = resolve_table(table_name)
+        try:
+            ensure_table_ready(table_name, get_engine(db), csv_file)
+            status[table_name] = True
+        except Exception as e:
+            logger.error(f"Table '{table_name}' is not ready: {str(e)}")
+            status[table_name] = False
+    logger.info(f"Database readiness check: {status}")
+    return status
+
+def start_readiness_check(app):
+    """
+    Run check_tables_ready for an app in a background thread.
+    
+    Requests that arrive before it finishes still work: they check their table once
+    through ensure_table_ready.
+    
+    Args:
+        app: Flask application whose engines should be checked
+        
+    Returns:
+        threading.Thread: The started daemon thread.
+    """
+    def run():
+        with app.app_context():
+            app.extensions["db_readiness"] = check_tables_ready()
+
+    thread = threading.Thread(target=run, name="db-readiness-check", daemon=True)
+    thread.start()
+    return thread
+
+def invalidate_table_cache(table_name=None):
+    """
+    Drop the cached column arrays for a table, or for every table.
+    
+    Args:
+        table_name (str): Table to invalidate. Invalidates all tables if None.
+    """
+    with _table_cache_lock:
+        if table_name is None:
+            _table_cache.clear()
+        else:
+            for key in [key for key in _table_cache if key[0] == table_name]:
+                del _table_cache[key]
+
+def get_cached_table(table_name, engine, csv_file):
+    """
+    Return a table as typed column arrays, reading it from the database on first use.
+    
+    Entries are keyed by engine as well as table name, so re-initialized
+    engines never see arrays read from a different database.
+    
+    Args:
+        table_name (str): The name of the database table.
+        engine (Engine): SQLAlchemy engine for the database.
+        csv_file (str): CSV file used to create the table if it is missing.
+        
+    Returns:
+        dict: {"columns": {column: np.ndarray}, "rows": int}
+    """
+    key = (table_name, engine)
+    entry = _table_cache.get(key)
+    if entry is not None:
+        return entry
+
+    with _table_cache_lock:
+        entry = _table_cache.get(key)
+        if entry is not None:
+            return entry
+
+        ensure_table_ready(table_name, engine, csv_file)
+        df = pd.read_sql(text(f"SELECT * FROM {_quote(table_name)}"), engine)
+        entry = {
+            "columns": {column: df[column].to_numpy() for column in df.columns},
+            "rows": len(df)
+        }
+        _table_cache[key] = entry
+        logger.info(f"Cached table '{table_name}' in memory ({entry['rows']} rows)")
+        return entry
+
+def _filter_mask(columns, filters, n_rows):
+    """Build a boolean row mask equivalent to the SQL WHERE clause of load_data_from_db."""
+    mask = np.ones(n_rows, dtype=bool)
+    for key, value in (filters or {}).items():
+        column = columns[key]
+        if isinstance(value, list):
+            values = [val.strip() if isinstance(val, str) else val for val in value]
+            mask &= np.isin(column, values)
+        else:
+            value = value.strip() if isinstance(value, str) else value
+            mask &= column == value
+    return mask
+
+def _normalize_aggregates(aggregates):
+    """Validate an aggregates mapping into (output name, function, column) triples."""
+    specs = []
+    for name, (func, column) in (aggregates or {}).items():
+        func = func.lower()
+        if func not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unsupported aggregate '{func}'; use one of: {', '.join(AGGREGATE_FUNCTIONS)}")
+        if column == "*" and func != "count":
+            raise ValueError("Only count can be applied to '*'")
+        specs.append((name, func, column))
+    return specs
+
+def _referenced_columns(filters, columns, group_by, aggregates):
+    """Check the shape of a load_data_from_db query and list the table columns it reads."""
+    if (group_by or aggregates) and columns:
+        raise ValueError("columns cannot be combined with group_by/aggregates; group_by columns are returned")
+    specs = _normalize_aggregates(aggregates)
+    referenced = list(filters or {}) + list(columns or []) + list(group_by or [])
+    referenced += [column for _, _, column in specs if column != "*"]
+    return list(dict.fromkeys(referenced))
+
+def _check_columns(table_name, referenced, available):
+    missing = [column for column in referenced if column not in available]
+    if missing:
+        raise KeyError(f"Unknown column(s) for table {table_name}: {', '.join(missing)}")
+
+def project_frame(df, columns=None, distinct=False, group_by=None, aggregates=None):
+    """
+    Apply load_data_from_db's projection, DISTINCT and GROUP BY semantics to a DataFrame.
+    
+    Aggregates follow SQL: sum/avg/min/max ignore nulls and are null when there is
+    nothing to aggregate, count(column) counts non-null values and count("*") counts rows.
+    Groups are sorted by their keys.
+    
+    Args:
+        df (pd.DataFrame): Filtered rows.
+        columns (list): Columns to return.
+        distinct (bool): Drop duplicate rows.
+        group_by (list): Columns to group by.
+        aggregates (dict): Output name -> (function, column).
+        
+    Returns:
+        pd.DataFrame: The projected rows.
+    """
+    specs = _normalize_aggregates(aggregates)
+    if group_by or specs:
+        keys = list(group_by or [])
+        if not keys:
+            return pd.DataFrame([{
+                name: len(df) if column == "*" else _aggregate(df[column], func)
+                for name, func, column in specs
+            }])
+        grouped = df.groupby(keys, sort=True, dropna=False)
+        result = grouped.size().to_frame("__rows__")
+        for name, func, column in specs:
+            result[name] = result["__rows__"] if column == "*" else _aggregate(grouped[column], func)
+        return result.drop(columns="__rows__").reset_index()
+
+    if columns:
+        df = df[list(columns)]
+    if distinct:
+        df = df.drop_duplicates(ignore_index=True)
+    return df
+
+def _aggregate(values, func):
+    """Aggregate a Series or SeriesGroupBy with SQL null semantics."""
+    method = AGGREGATE_FUNCTIONS[func][1]
+    if method == "sum":
+        return values.sum(min_count=1).astype(float) if hasattr(values, "groups") else float(values.sum(min_count=1))
+    return getattr(values, method)()
 
-def load_data_from_db(table_name, filters=None, db="ac"):
+def query_cached_table(table_name, engine, csv_file, filters=None, columns=None, distinct=False, group_by=None, aggregates=None):
     """
-    Load data from a database table with optional filters.
+    Answer a filtered query from the in-memory copy of a table.
     
     Args:
         table_name (str): The name of the database table.
+        engine (Engine): SQLAlchemy engine for the database.
+        csv_file (str): CSV file used to create the table if it is missing.
+        filters (dict): Same filter format as load_data_from_db.
+        columns, distinct, group_by, aggregates: Same as load_data_from_db.
+        
+    Returns:
+        pd.DataFrame: The matching rows (a copy, safe for callers to modify).
+    """
+    entry = get_cached_table(table_name, engine, csv_file)
+    table_columns = entry["columns"]
+
+    referenced = _referenced_columns(filters, columns, group_by, aggregates)
+    _check_columns(table_name, referenced, table_columns)
+
+    mask = _filter_mask(table_columns, filters, entry["rows"])
+    # Only copy the columns the query reads
+    if columns or group_by or aggregates:
+        needed = [column for column in table_columns if column in referenced]
+    else:
+        needed = list(table_columns)
+    df = pd.DataFrame({column: table_columns[column][mask] for column in needed})
+    return project_frame(df, columns=columns, distinct=distinct, group_by=group_by, aggregates=aggregates)
+
+def build_select_query(table_name, filters=None, columns=None, distinct=False, group_by=None, aggregates=None):
+    """
+    Build the parameterized SELECT statement for a load_data_from_db query.
+    
+    Identifiers are quoted and values bound as parameters; the caller is responsible
+    for checking table and column names.
+    
+    Returns:
+        tuple: (SQL string, params dict)
+    """
+    specs = _normalize_aggregates(aggregates)
+    if group_by or specs:
+        select_list = [_quote(column) for column in group_by or []]
+        for name, func, column in specs:
+            argument = "*" if column == "*" else _quote(column)
+            select_list.append(f"{AGGREGATE_FUNCTIONS[func][0]}({argument}) AS {_quote(name)}")
+    elif columns:
+        select_list = [_quote(column) for column in columns]
+    else:
+        select_list = ["*"]
+
+    query = f"SELECT {'DISTINCT ' if distinct and not (group_by or specs) else ''}{', '.join(select_list)} FROM {_quote(table_name)}"
+    params = {}
+
+    where_clauses = []
+    for key, value in (filters or {}).items():
+        values = value if isinstance(value, list) else [value]
+        placeholders = []
+        for val in values:
+            param_name = f"p{len(params)}"
+            placeholders.append(f":{param_name}")
+            params[param_name] = val.strip() if isinstance(val, str) else val
+        if isinstance(value, list):
+            where_clauses.append(f"{_quote(key)} IN ({', '.join(placeholders)})")
+        else:
+            where_clauses.append(f"{_quote(key)} = {placeholders[0]}")
+    if where_clauses:
+        query += " WHERE " + " AND ".join(where_clauses)
+
+    if group_by:
+        keys = ", ".join(_quote(column) for column in group_by)
+        query += f" GROUP BY {keys} ORDER BY {keys}"
+    return query, params
+
+def load_data_from_db(table_name, filters=None, db=None, columns=None, distinct=False, group_by=None, aggregates=None):
+    """
+    Load data from a database table with optional filters, projection and aggregation.
+    
+    Tables already resident in the in-memory cache are answered from it. Otherwise the
+    query runs in SQL so only the selected columns, distinct rows or aggregates are read.
+    
+    Args:
+        table_name (str): The name of the database table (one of QUERYABLE_TABLES).
         filters (dict): Optional filters to apply (e.g., {"COLUMN_NAME": value} or {"COLUMN_NAME": [value1, value2]}).
-        db (str): The database to connect to ("ac" or "gse").
+        db (str): The database to connect to ("ac" or "gse"); defaults to the table's own database.
+        columns (list): Optional columns to return instead of all of them.
+        distinct (bool): Return only distinct rows (of `columns`).
+        group_by (list): Optional columns to group by; the result has one row per group,
+            sorted by these columns.
+        aggregates (dict): Optional output column -> (function, column) with function one of
+            sum, avg, min, max or count (count also accepts "*"), e.g.
+            {"FUEL_WEIGHT": ("sum", "FUEL_WEIGHT")}.
         
     Returns:
         pd.DataFrame: The resulting dataset as a Pandas DataFrame.
     """
     try:
         # Select the appropriate engine and CSV file
-        engine = ac_engine if db == "ac" else gse_engine
-        csv_file = os.path.join(DATA_PATH, f"{table_name}.csv")
-        
-        # Ensure database exists and is populated
-        ensure_database_exists(engine, table_name, csv_file)
-        
-        # Build query
-        query = f"SELECT * FROM {table_name}"
-        params = {}
-
-        if filters:
-            where_clauses = []
-            for key, value in filters.items():
-                # Handle column names with spaces
-                column_name = f'"{key}"'
-                
-                if isinstance(value, list):
-                    placeholders = []
-                    for i, val in enumerate(value):
-                        param_name = f"{key.replace(' ', '_')}_{i}"
-                        placeholders.append(f":{param_name}")
-                        params[param_name] = val.strip() if isinstance(val, str) else val
-                    where_clauses.append(f'{column_name} IN ({", ".join(placeholders)})')
-                else:
-                    param_name = key.replace(" ", "_")
-                    where_clauses.append(f'{column_name} = :{param_name}')
-                    params[param_name] = value.strip() if isinstance(value, str) else value
-
-            if where_clauses:
-                query += " WHERE " + " AND ".join(where_clauses)
+        db, csv_file = resolve_table(table_name, db)
+        engine = get_engine(db)
+        projected = bool(columns or group_by or aggregates)
+        
+        # Serve the hot BTS/GSE tables from memory (projections only once they are resident)
+        if table_name in CACHED_TABLES and (not projected or (table_name, engine) in _table_cache):
+            return query_cached_table(
+                table_name, engine, csv_file, filters,
+                columns=columns, distinct=distinct, group_by=group_by, aggregates=aggregates
+            )
+        
+        # Checked once per table and engine (usually at startup)
+        ensure_table_ready(table_name, engine, csv_file)
+        referenced = _referenced_columns(filters, columns, group_by, aggregates)
+        _check_columns(table_name, referenced, get_table_columns(table_name, engine))
+        
+        query, params = build_select_query(
+            table_name, filters, columns=columns, distinct=distinct, group_by=group_by, aggregates=aggregates
+        )
 
         logger.debug(f"Query: {query}")
         logger.debug(f"Params: {params}")
 
-        return pd.read_sql(text(query), engine, params=params)
+        df = pd.read_sql(text(query), engine, params=params)
+        # Null sums/averages come back as None; use NaN like the cached path
+        for name, func, _ in _normalize_aggregates(aggregates):
+            if func in ("sum", "avg"):
+                df[name] = df[name].astype(float)
+        return df
 
     except Exception as e:
         logger.error(f"Error executing database query: {str(e)}")
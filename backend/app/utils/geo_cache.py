@@ -0,0 +1,251 @@
+# backend/app/utils/geo_cache.py
+import io
+import os
+import stat
+import json
+import hashlib
+import tempfile
+import threading
+import numpy as np
+import geopandas as gpd
+import shapely
+from shapely import STRtree
+from shapely.geometry import shape
+
+# Compiled copies live next to their source, in .compiled/<file name>/
+COMPILED_DIR_NAME = ".compiled"
+
+# Files making up a compiled GeoJSON; META_FILE is written last and marks a complete compile
+WKB_FILE = "wkb.npy"
+OFFSETS_FILE = "offsets.npy"
+PROPERTIES_FILE = "properties.json"
+META_FILE = "meta.json"
+
+# Bump when the compiled layout changes so old copies are rebuilt
+COMPILED_FORMAT_VERSION = 1
+
+# {source path: {"signature": (mtime, size), "geometries": ndarray, "properties": list, "index": dict}}
+_compiled_cache = {}
+_compiled_cache_lock = threading.RLock()
+
+def compiled_dir(source_path):
+    """Return the directory holding the compiled copy of a GeoJSON file."""
+    source_path = os.path.abspath(source_path)
+    return os.path.join(os.path.dirname(source_path), COMPILED_DIR_NAME, os.path.basename(source_path))
+
+def _file_signature(path):
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def _new_file_mode(filepath):
+    """Mode a plain open(filepath, 'w') would leave: the existing file's, or 0o666 minus the umask."""
+    try:
+        return stat.S_IMODE(os.stat(filepath).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+def write_atomic(filepath, data):
+    """
+    Write bytes to filepath through a temporary file so readers never see a partial file.
+
+    The file keeps its previous permissions (mkstemp creates temporary files as 0600).
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(filepath), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, _new_file_mode(filepath))
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def _npy_bytes(array):
+    stream = io.BytesIO()
+    np.save(stream, array)
+    return stream.getvalue()
+
+def _read_meta(target_dir):
+    try:
+        with open(os.path.join(target_dir, META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+    if meta.get("version") != COMPILED_FORMAT_VERSION:
+        return None
+    return meta
+
+def _write_meta(target_dir, signature, sha256):
+    meta = {"version": COMPILED_FORMAT_VERSION, "mtime_ns": signature[0], "size": signature[1], "sha256": sha256}
+    write_atomic(os.path.join(target_dir, META_FILE), json.dumps(meta).encode("utf-8"))
+
+def compile_geojson(source_path):
+    """
+    Compile a GeoJSON FeatureCollection into WKB arrays plus a properties file.
+
+    Geometries are stored as one concatenated uint8 WKB buffer with int64 offsets, both
+    as .npy files so they can be memory-mapped; properties are stored as a JSON list.
+
+    Args:
+        source_path (str): Path to the GeoJSON file
+
+    Returns:
+        str: Directory holding the compiled copy
+    """
+    signature = _file_signature(source_path)
+    with open(source_path, 'r', encoding='utf-8') as f:
+        geojson_data = json.load(f)
+    features = geojson_data.get("features", [])
+
+    geometries = np.array([shape(feature["geometry"]) for feature in features], dtype=object)
+    wkb = shapely.to_wkb(geometries) if len(geometries) else np.array([], dtype=object)
+    offsets = np.zeros(len(wkb) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(item) for item in wkb])
+    buffer = np.frombuffer(b"".join(wkb), dtype=np.uint8)
+    properties = [feature.get("properties") or {} for feature in features]
+
+    target_dir = compiled_dir(source_path)
+    os.makedirs(target_dir, exist_ok=True)
+    write_atomic(os.path.join(target_dir, WKB_FILE), _npy_bytes(buffer))
+    write_atomic(os.path.join(target_dir, OFFSETS_FILE), _npy_bytes(offsets))
+    write_atomic(os.path.join(target_dir, PROPERTIES_FILE), json.dumps(properties).encode("utf-8"))
+    _write_meta(target_dir, signature, _file_sha256(source_path))
+    return target_dir
+
+def _ensure_compiled(source_path):
+    """Compile source_path unless an up-to-date compiled copy exists. Returns its stat signature."""
+    signature = _file_signature(source_path)
+    target_dir = compiled_dir(source_path)
+    meta = _read_meta(target_dir)
+    if meta is not None and (meta["mtime_ns"], meta["size"]) == signature:
+        return signature
+
+    # The file was touched; only recompile if its content actually changed
+    if meta is not None and meta["size"] == signature[1] and meta["sha256"] == _file_sha256(source_path):
+        _write_meta(target_dir, signature, meta["sha256"])
+        return signature
+
+    compile_geojson(source_path)
+    return signature
+
+def _read_compiled(source_path):
+    target_dir = compiled_dir(source_path)
+    buffer = np.load(os.path.join(target_dir, WKB_FILE), mmap_mode="r")
+    offsets = np.load(os.path.join(target_dir, OFFSETS_FILE), mmap_mode="r")
+    wkb = [buffer[start:end].tobytes() for start, end in zip(offsets[:-1], offsets[1:])]
+    geometries = shapely.from_wkb(np.array(wkb, dtype=object)) if wkb else np.array([], dtype=object)
+    with open(os.path.join(target_dir, PROPERTIES_FILE), 'r', encoding='utf-8') as f:
+        properties = json.load(f)
+    return geometries, properties
+
+def load_compiled_geojson(source_path):
+    """
+    Load the geometries and properties of a GeoJSON file from its compiled copy.
+
+    The compiled copy is rebuilt whenever the source changes; results are kept in
+    memory until then. Callers must not mutate the returned objects.
+
+    Args:
+        source_path (str): Path to the GeoJSON file
+
+    Returns:
+        tuple: (ndarray of shapely geometries, list of property dicts)
+    """
+    source_path = os.path.abspath(source_path)
+    with _compiled_cache_lock:
+        cached = _compiled_cache.get(source_path)
+        if cached is not None and cached["signature"] == _file_signature(source_path):
+            return cached["geometries"], cached["properties"]
+
+        signature = _ensure_compiled(source_path)
+        geometries, properties = _read_compiled(source_path)
+        _compiled_cache[source_path] = {"signature": signature, "geometries": geometries, "properties": properties}
+        return geometries, properties
+
+def _string_array(values):
+    """Unicode array of property values, with "" for missing ones."""
+    return np.array(["" if value is None else str(value) for value in values], dtype=str)
+
+def load_feature_index(source_path):
+    """
+    Return the compiled features of a GeoJSON file with an STRtree and amenity lookup.
+
+    Built once per compiled version of the file and shared by every caller.
+
+    Args:
+        source_path (str): Path to the GeoJSON file
+
+    Returns:
+        dict: geometries, properties, tree (STRtree over the geometries),
+            amenities (array of each feature's amenity property), names (name, or id
+            when unnamed) and facility_names (facility a buffer surrounds); missing
+            names are ""
+    """
+    geometries, properties = load_compiled_geojson(source_path)
+    with _compiled_cache_lock:
+        entry = _compiled_cache.get(os.path.abspath(source_path))
+        index = entry.get("index") if entry is not None and entry["geometries"] is geometries else None
+        if index is None:
+            index = {
+                "geometries": geometries,
+                "properties": properties,
+                "tree": STRtree(geometries),
+                "amenities": np.array([props.get("amenity") for props in properties], dtype=object),
+                "names": _string_array(props.get("name") or props.get("id") for props in properties),
+                "facility_names": _string_array(props.get("facility_name") for props in properties),
+            }
+            if entry is not None and entry["geometries"] is geometries:
+                entry["index"] = index
+        return index
+
+def query_features(index, bbox=None, amenities=None):
+    """
+    Positions of the indexed features matching a bounding box and amenity filter.
+
+    Args:
+        index (dict): Result of load_feature_index
+        bbox (tuple, optional): (minx, miny, maxx, maxy) in the layer CRS
+        amenities (list, optional): Amenity values to keep
+
+    Returns:
+        np.ndarray: Sorted feature positions
+    """
+    if bbox is not None:
+        positions = np.sort(index["tree"].query(shapely.box(*bbox), predicate="intersects"))
+    else:
+        positions = np.arange(len(index["geometries"]))
+    if amenities is not None:
+        positions = positions[np.isin(index["amenities"][positions], list(amenities))]
+    return positions
+
+def load_geodataframe(source_path, crs="EPSG:4326"):
+    """
+    Load a GeoJSON file as a GeoDataFrame through its compiled copy.
+
+    Args:
+        source_path (str): Path to the GeoJSON file
+        crs (str): CRS of the source geometries
+
+    Returns:
+        GeoDataFrame: One row per feature, with the properties as columns
+    """
+    geometries, properties = load_compiled_geojson(source_path)
+    return gpd.GeoDataFrame(properties, geometry=list(geometries), crs=crs)
+
+def clear_compiled_cache(source_path=None):
+    """Drop in-memory compiled data for one source file, or for all of them."""
+    with _compiled_cache_lock:
+        if source_path is None:
+            _compiled_cache.clear()
+        else:
+            _compiled_cache.pop(os.path.abspath(source_path), None)
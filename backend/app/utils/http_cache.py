@@ -0,0 +1,116 @@
+# backend/app/utils/http_cache.py
+import os
+import gzip
+import hashlib
+import threading
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
+
+# {file path: {"signature": (mtime, size), "body": bytes, "etag": str, "last_modified": float, "variants": dict}}
+_file_payloads = {}
+_file_payloads_lock = threading.Lock()
+
+def compress_variants(body):
+    """
+    Precompute the compressed encodings of a payload.
+
+    Args:
+        body (bytes): Uncompressed payload
+
+    Returns:
+        dict: Content-Encoding name -> compressed bytes (gzip, plus br when brotli is installed)
+    """
+    variants = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(body)
+    return variants
+
+def load_file_payload(file_path):
+    """
+    Return the bytes of a file with their ETag and compressed variants.
+
+    The file is read and compressed once and kept in memory until its mtime or size changes.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        dict: body, etag, last_modified and variants of the file
+    """
+    file_path = os.path.abspath(file_path)
+    stat = os.stat(file_path)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with _file_payloads_lock:
+        payload = _file_payloads.get(file_path)
+        if payload is None or payload["signature"] != signature:
+            with open(file_path, "rb") as f:
+                body = f.read()
+            payload = {
+                "signature": signature,
+                "body": body,
+                "etag": hashlib.sha256(body).hexdigest(),
+                "last_modified": stat.st_mtime,
+                "variants": compress_variants(body),
+            }
+            _file_payloads[file_path] = payload
+        return payload
+
+def clear_file_payloads():
+    """Drop every cached file payload."""
+    with _file_payloads_lock:
+        _file_payloads.clear()
+
+def conditional_response(body, etag, mimetype="application/json", last_modified=None, max_age=0, variants=None):
+    """
+    Build a response for precomputed bytes that honours conditional GET headers.
+
+    Args:
+        body (bytes): Response payload
+        etag (str): Strong ETag identifying the payload
+        mimetype (str): Response mimetype
+        last_modified (float or datetime, optional): Modification time of the payload
+        max_age (int): Seconds clients may reuse the payload without revalidating
+        variants (dict, optional): Content-Encoding name -> precompressed payload; the best
+            one accepted by the client is sent
+
+    Returns:
+        Response: 200 with the payload, or 304 when If-None-Match/If-Modified-Since match
+    """
+    encoding = request.accept_encodings.best_match(list(variants)) if variants else None
+    if encoding is not None:
+        body, etag = variants[encoding], f"{etag}-{encoding}"
+
+    response = current_app.response_class(body, mimetype=mimetype)
+    if encoding is not None:
+        response.content_encoding = encoding
+    if variants:
+        response.vary.add("Accept-Encoding")
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    response.cache_control.public = True
+    response.cache_control.max_age = max_age
+    if max_age == 0:
+        response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+def file_response(file_path, mimetype="application/json"):
+    """
+    Serve a file from the in-memory payload cache with compression and conditional GET.
+
+    Args:
+        file_path (str): Path to the file
+        mimetype (str): Response mimetype
+
+    Returns:
+        Response: 200 with the (possibly compressed) file, or 304 Not Modified
+    """
+    payload = load_file_payload(file_path)
+    return conditional_response(
+        payload["body"], payload["etag"], mimetype=mimetype,
+        last_modified=payload["last_modified"], variants=payload["variants"]
+    )
@@ -0,0 +1,195 @@
+# backend/app/utils/mvt.py
+"""
+Minimal Mapbox Vector Tile (v2.1) encoder for polygon, line and point layers.
+
+Geometries passed to encode_tile must already be in tile coordinates
+(0..extent, y pointing down). Only the protobuf subset used by the spec is
+implemented, so no protobuf dependency is needed.
+"""
+import json
+import struct
+import numpy as np
+import shapely
+from shapely.geometry.polygon import orient
+
+DEFAULT_EXTENT = 4096
+
+# Feature geometry types
+GEOM_POINT = 1
+GEOM_LINESTRING = 2
+GEOM_POLYGON = 3
+
+# Geometry commands
+CMD_MOVE_TO = 1
+CMD_LINE_TO = 2
+CMD_CLOSE_PATH = 7
+
+# Protobuf wire types
+WIRE_VARINT = 0
+WIRE_64BIT = 1
+WIRE_LENGTH_DELIMITED = 2
+
+def _varint(value):
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+def _zigzag(value):
+    return (value << 1) ^ (value >> 63)
+
+def _key(field, wire_type):
+    return _varint((field << 3) | wire_type)
+
+def _length_delimited(field, payload):
+    return _key(field, WIRE_LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+def _packed_varints(field, values):
+    return _length_delimited(field, b"".join(_varint(v) for v in values))
+
+def _command(command_id, count):
+    return (command_id & 0x7) | (count << 3)
+
+def _encode_value(value):
+    """Encode a property value as a Tile.Value message."""
+    if isinstance(value, (bool, np.bool_)):
+        return _key(7, WIRE_VARINT) + _varint(int(value))
+    if isinstance(value, (int, np.integer)):
+        value = int(value)
+        if value < 0:
+            return _key(6, WIRE_VARINT) + _varint(_zigzag(value))
+        return _key(5, WIRE_VARINT) + _varint(value)
+    if isinstance(value, (float, np.floating)):
+        return _key(3, WIRE_64BIT) + struct.pack("<d", float(value))
+    if not isinstance(value, str):
+        value = json.dumps(value)
+    return _length_delimited(1, value.encode("utf-8"))
+
+def _ring_commands(coords, cursor, closed):
+    """Commands for one ring or line; coords is an (n, 2) int array. Returns (commands, cursor)."""
+    if closed:
+        coords = coords[:-1]
+    if len(coords) < (3 if closed else 2):
+        return [], cursor
+    deltas = np.diff(np.vstack([cursor, coords]), axis=0)
+    commands = [_command(CMD_MOVE_TO, 1), _zigzag(int(deltas[0, 0])), _zigzag(int(deltas[0, 1]))]
+    commands.append(_command(CMD_LINE_TO, len(coords) - 1))
+    for dx, dy in deltas[1:]:
+        commands.extend((_zigzag(int(dx)), _zigzag(int(dy))))
+    if closed:
+        commands.append(_command(CMD_CLOSE_PATH, 1))
+    return commands, coords[-1]
+
+def _int_coords(coords):
+    return np.rint(np.asarray(coords)[:, :2]).astype(np.int64)
+
+def encode_geometry(geom):
+    """
+    Encode a shapely geometry in tile coordinates as MVT geometry commands.
+
+    Returns:
+        tuple: (geometry type, list of command integers); commands are empty for
+            geometries that collapse at tile resolution
+    """
+    cursor = np.zeros(2, dtype=np.int64)
+    commands = []
+    if geom.geom_type in ("Polygon", "MultiPolygon"):
+        for polygon in getattr(geom, "geoms", [geom]):
+            # Exterior rings need positive area in tile space (clockwise on screen)
+            polygon = orient(polygon, sign=1.0)
+            exterior, cursor = _ring_commands(_int_coords(polygon.exterior.coords), cursor, closed=True)
+            if not exterior:
+                continue
+            commands.extend(exterior)
+            for interior in polygon.interiors:
+                ring, cursor = _ring_commands(_int_coords(interior.coords), cursor, closed=True)
+                commands.extend(ring)
+        return GEOM_POLYGON, commands
+    if geom.geom_type in ("LineString", "MultiLineString"):
+        for line in getattr(geom, "geoms", [geom]):
+            line_commands, cursor = _ring_commands(_int_coords(line.coords), cursor, closed=False)
+            commands.extend(line_commands)
+        return GEOM_LINESTRING, commands
+    if geom.geom_type in ("Point", "MultiPoint"):
+        points = _int_coords(shapely.get_coordinates(geom))
+        deltas = np.diff(np.vstack([cursor, points]), axis=0)
+        commands.append(_command(CMD_MOVE_TO, len(points)))
+        for dx, dy in deltas:
+            commands.extend((_zigzag(int(dx)), _zigzag(int(dy))))
+        return GEOM_POINT, commands
+    if geom.geom_type == "GeometryCollection":
+        # Clipping can yield collections; keep their polygonal part
+        polygons = [part for part in geom.geoms if part.geom_type in ("Polygon", "MultiPolygon")]
+        if polygons:
+            return encode_geometry(shapely.union_all(polygons))
+    return None, []
+
+def encode_layer(name, features, extent=DEFAULT_EXTENT):
+    """
+    Encode one Tile.Layer.
+
+    Args:
+        name (str): Layer name
+        features (list): (shapely geometry in tile coordinates, properties dict) pairs
+        extent (int): Tile extent
+
+    Returns:
+        bytes: Encoded layer message (without the enclosing Tile field)
+    """
+    keys, key_index = [], {}
+    values, value_index = [], {}
+    encoded_features = []
+
+    for feature_id, (geom, properties) in enumerate(features, start=1):
+        geom_type, commands = encode_geometry(geom)
+        if not commands:
+            continue
+
+        tags = []
+        for key, value in (properties or {}).items():
+            if value is None:
+                continue
+            if key not in key_index:
+                key_index[key] = len(keys)
+                keys.append(key)
+            encoded_value = _encode_value(value)
+            if encoded_value not in value_index:
+                value_index[encoded_value] = len(values)
+                values.append(encoded_value)
+            tags.extend((key_index[key], value_index[encoded_value]))
+
+        feature = _key(1, WIRE_VARINT) + _varint(feature_id)
+        if tags:
+            feature += _packed_varints(2, tags)
+        feature += _key(3, WIRE_VARINT) + _varint(geom_type)
+        feature += _packed_varints(4, commands)
+        encoded_features.append(feature)
+
+    layer = _key(15, WIRE_VARINT) + _varint(2)
+    layer += _length_delimited(1, name.encode("utf-8"))
+    for feature in encoded_features:
+        layer += _length_delimited(2, feature)
+    for key in keys:
+        layer += _length_delimited(3, key.encode("utf-8"))
+    for value in values:
+        layer += _length_delimited(4, value)
+    layer += _key(5, WIRE_VARINT) + _varint(extent)
+    return layer
+
+def encode_tile(layers, extent=DEFAULT_EXTENT):
+    """
+    Encode a vector tile.
+
+    Args:
+        layers (dict): Layer name -> list of (geometry in tile coordinates, properties) pairs
+        extent (int): Tile extent
+
+    Returns:
+        bytes: Encoded Tile message
+    """
+    return b"".join(_length_delimited(3, encode_layer(name, features, extent)) for name, features in layers.items())
@@ -38,4 +38,11 @@ def validate_gse_list(gse_list: List[str]) -> None:
     if not isinstance(gse_list, list):
         raise ValidationError("GSE list must be an array")
     if not all(isinstance(item, str) for item in gse_list):
-        raise ValidationError("All GSE items must be strings")
\ No newline at end of file
+        raise ValidationError("All GSE items must be strings")
+
+def validate_optional_code(code: Any, param_name: str) -> None:
+    """Validate an optional BTS code (carrier or airport) is a non-empty string."""
+    if code is None:
+        return
+    if not isinstance(code, str) or not code.strip():
+        raise ValidationError(f"{param_name} must be a non-empty string")
\ No newline at end of file
@@ -1,9 +1,11 @@
 # File: backend/populate_databases.py
 
 import pandas as pd
-from sqlalchemy import create_engine
 import os
 import logging
+from app.utils.data_loader import (
+    bulk_load_table, create_db_engine, populate_derived_tables, read_table_csv, write_source_metadata, csv_fingerprint
+)
 
 # Set up logging
 logging.basicConfig(
@@ -63,17 +65,22 @@ def populate_database(csv_file, db_file, table_name):
     try:
         # Read the CSV file
         logger.info(f"Reading data from {csv_file}...")
-        df = pd.read_csv(csv_file)
+        fingerprint = csv_fingerprint(csv_file)
+        df = read_table_csv(csv_file)
         logger.info(f"Successfully read {len(df)} rows from {csv_file}")
 
         # Create SQLite engine with absolute path
         db_uri = f"sqlite:///{os.path.abspath(db_file)}"
         logger.info(f"Creating database connection to {db_uri}...")
-        engine = create_engine(db_uri)
+        engine = create_db_engine(db_uri)
 
-        # Write data into the database
+        # Write typed rows in one transaction and index the filter columns
         logger.info(f"Populating table '{table_name}' in {db_file}...")
-        df.to_sql(table_name, engine, if_exists="replace", index=False)
+        df = bulk_load_table(df, engine, table_name)
+
+        # Rebuild aggregate tables derived from this one (e.g. the fuel-burn index)
+        populate_derived_tables(df, engine, table_name)
+        write_source_metadata(engine, table_name, csv_file, fingerprint)
         
         # Verify the data was written
         verification_df = pd.read_sql(f"SELECT COUNT(*) as count FROM {table_name}", engine)
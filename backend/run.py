@@ -4,4 +4,4 @@ from app import create_app
 app = create_app()
 
 if __name__ == "__main__":
-    app.run(debug=True, host="0.0.0.0", port=5000, threaded=False)
+    app.run(debug=True, host="0.0.0.0", port=5000, threaded=True)
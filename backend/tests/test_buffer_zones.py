@@ -0,0 +1,190 @@
+# File: backend/tests/test_buffer_zones.py
+import os
+import json
+import stat
+import pytest
+import geopandas as gpd
+from shapely.geometry import shape
+from app import create_app
+from app.services import buffer_zone_service
+from app.services.zoning_violations_service import load_facilities_data
+
+@pytest.fixture
+def app():
+    _app = create_app("testing")
+    _app.config["TESTING"] = True
+    yield _app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def buffer_output(tmp_path, monkeypatch):
+    """Write generated buffer zones to a temporary file and start from an empty cache."""
+    path = tmp_path / "buffer_zones.geojson"
+    monkeypatch.setattr(buffer_zone_service, "BUFFER_ZONES_PATH", str(path))
+    buffer_zone_service.clear_buffer_zones_cache()
+    yield path
+    buffer_zone_service.clear_buffer_zones_cache()
+
+def test_generate_buffer_zones_matches_per_facility_buffers(app):
+    with app.app_context():
+        result = buffer_zone_service.generate_buffer_zones()
+
+    facilities = gpd.GeoDataFrame.from_features(load_facilities_data()["features"], crs="EPSG:4326").to_crs("EPSG:2240")
+    by_name = {row["name"]: row.geometry for _, row in facilities.iterrows()}
+
+    assert result["type"] == "FeatureCollection"
+    for feature in result["features"][:5]:
+        props = feature["properties"]
+        expected = by_name[props["facility_name"]].buffer(props["buffer_distance_ft"]).simplify(0.1)
+        expected = gpd.GeoSeries([expected], crs="EPSG:2240").to_crs("EPSG:4326").iloc[0]
+        assert feature["geometry"] == expected.__geo_interface__
+
+def test_generate_buffer_zones_one_buffer_per_hazard(app):
+    with app.app_context():
+        result = buffer_zone_service.generate_buffer_zones()
+
+    buffer_ids = [(f["properties"]["facility_name"], f["properties"]["hazard_categories"][0]) for f in result["features"]]
+    assert len(buffer_ids) == len(set(buffer_ids))
+
+def test_buffer_zones_payload_is_memoized(app, buffer_output, monkeypatch):
+    with app.app_context():
+        body, etag = buffer_zone_service.get_buffer_zones_payload()
+
+        assert buffer_output.read_bytes() == body
+        assert (buffer_output.parent / "buffer_zones.geojson.sha256").read_text() == buffer_zone_service.buffer_source_hash()
+
+        def fail():
+            raise AssertionError("buffer zones regenerated")
+        monkeypatch.setattr(buffer_zone_service, "generate_buffer_zones", fail)
+
+        # In memory, then from the disk copy once the memory cache is dropped
+        assert buffer_zone_service.get_buffer_zones_payload() == (body, etag)
+        buffer_zone_service.clear_buffer_zones_cache()
+        assert buffer_zone_service.get_buffer_zones_payload() == (body, etag)
+
+def test_buffer_zones_stale_disk_copy_is_regenerated(app, buffer_output):
+    buffer_output.write_bytes(b'{"type":"FeatureCollection","features":[]}')
+    (buffer_output.parent / "buffer_zones.geojson.sha256").write_text("outdated")
+    with app.app_context():
+        body, _ = buffer_zone_service.get_buffer_zones_payload()
+    assert len(json.loads(body)["features"]) > 0
+
+def test_regenerated_buffer_zones_keep_file_mode(app, buffer_output):
+    buffer_output.write_bytes(b'{"type":"FeatureCollection","features":[]}')
+    os.chmod(buffer_output, 0o644)
+    with app.app_context():
+        buffer_zone_service.get_buffer_zones_payload()
+    assert stat.S_IMODE(os.stat(buffer_output).st_mode) == 0o644
+
+def test_buffers_endpoint_conditional_get(client, buffer_output):
+    response = client.get("/api/buffer_zones/buffers")
+    assert response.status_code == 200
+    assert response.get_json()["type"] == "FeatureCollection"
+    etag = response.headers["ETag"]
+
+    response = client.get("/api/buffer_zones/buffers", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+
+def test_project_geometries_matches_pyproj():
+    from pyproj import Transformer
+    from shapely.geometry import Polygon
+    from shapely.ops import transform
+
+    polygon = Polygon([(-84.43, 33.63), (-84.42, 33.63), (-84.42, 33.64), (-84.43, 33.63)])
+    transformer = Transformer.from_crs("EPSG:4326", "EPSG:2240", always_xy=True)
+    expected = transform(transformer.transform, polygon)
+
+    projected = buffer_zone_service.project_geometries([polygon])[0]
+    assert projected.equals_exact(expected, 1e-6)
+    assert buffer_zone_service.transform_to_local_crs(polygon).area == pytest.approx(expected.area)
+
+def test_available_storage_areas(app, buffer_output):
+    with app.app_context():
+        results = buffer_zone_service.calculate_available_storage_areas(storage_volume_gal=5000)
+
+    assert len(results) == len(buffer_zone_service.load_potential_storage_areas())
+    for result in results:
+        assert 0 <= result["available_area_sqft"] <= result["original_area_sqft"] + 1e-6
+        if not result["overlapping_buffers"]:
+            assert result["available_area_sqft"] == pytest.approx(result["original_area_sqft"])
+        assert result["available_geometry"]["type"] in ("Polygon", "MultiPolygon")
+
+    overlapped = [r for r in results if r["overlapping_buffers"]]
+    assert overlapped, "expected at least one storage area to overlap a safety buffer"
+    assert all(r["area_reduction_percent"] > 0 for r in overlapped)
+
+def test_available_storage_areas_match_pairwise_subtraction(app, buffer_output):
+    with app.app_context():
+        results = buffer_zone_service.calculate_available_storage_areas()
+        buffer_properties, buffer_geoms, _ = buffer_zone_service.get_buffer_index()
+
+    areas = buffer_zone_service.load_potential_storage_areas()
+    area_geoms = buffer_zone_service.project_geometries([shape(area["geometry"]) for area in areas])
+    for area, area_geom, result in zip(areas, area_geoms, results):
+        area_name = area["properties"].get("name", area["properties"].get("id"))
+        available, overlaps = area_geom, []
+        for props, buffer_geom in zip(buffer_properties, buffer_geoms):
+            if props["facility_name"] != area_name and buffer_geom.intersects(area_geom):
+                available = available.difference(buffer_geom)
+                overlaps.append(props["facility_name"])
+
+        assert [b["buffer_id"] for b in result["overlapping_buffers"]] == overlaps
+        assert result["available_area_sqft"] == pytest.approx(available.area, rel=1e-6, abs=1e-6)
+
+def test_storage_compliance_sweep_matches_single_volume_analysis(app, buffer_output):
+    volumes = [1000.0, 50000.0, 500000.0, 5000000.0]
+    with app.app_context():
+        sweep = buffer_zone_service.calculate_storage_compliance_sweep(volumes)
+        for j, volume in enumerate(volumes):
+            results = buffer_zone_service.calculate_available_storage_areas(volume)
+            assert [row[j] for row in sweep["compliance"]] == [r["compliance_status"] == "compliant" for r in results]
+            assert sweep["compliant_areas"][j] == sum(r["compliance_status"] == "compliant" for r in results)
+
+    assert len(sweep["compliance"]) == len(sweep["sites"])
+    assert sweep["required_area_sqft"] == sorted(sweep["required_area_sqft"])
+
+def test_storage_compliance_sweep_endpoint(client, buffer_output):
+    response = client.get("/api/buffer_zones/storage-area-analysis/sweep?volume_start=1000&volume_stop=5000&volume_step=1000")
+    assert response.status_code == 200
+    data = response.get_json()
+    assert data["storage_volumes_gal"] == [1000.0, 2000.0, 3000.0, 4000.0, 5000.0]
+    assert all(len(row) == 5 for row in data["compliance"])
+
+    response = client.get("/api/buffer_zones/storage-area-analysis/sweep?storage_volumes_gal=1000,-5")
+    assert response.status_code == 400
+    response = client.get("/api/buffer_zones/storage-area-analysis/sweep")
+    assert response.status_code == 400
+
+def test_buffers_endpoint_simplified_by_zoom(client, buffer_output):
+    full = client.get("/api/buffer_zones/buffers").get_json()
+    coarse = client.get("/api/buffer_zones/buffers?zoom=10").get_json()
+    assert len(coarse["features"]) == len(full["features"])
+    count = lambda fc: sum(len(ring) for f in fc["features"] for ring in f["geometry"]["coordinates"])
+    assert count(coarse) < count(full)
+
+def test_buffers_endpoint_amenity_filter(client, buffer_output):
+    cargo = client.get("/api/map/facilities?amenity=Cargo").get_json()["features"]
+    cargo_names = {f["properties"]["name"] for f in cargo}
+
+    buffers = client.get("/api/buffer_zones/buffers?amenity=Cargo").get_json()["features"]
+    assert buffers
+    assert {f["properties"]["facility_name"] for f in buffers} <= cargo_names
+
+def test_buffer_amenity_filter_matches_facility_names(app, buffer_output):
+    from app.services.map_layer_service import filter_layer_positions
+    from app.services.zoning_violations_service import FACILITIES_GEOJSON_PATH
+    from app.utils.geo_cache import load_feature_index
+
+    with app.app_context():
+        buffer_zone_service.get_buffer_zones_payload()
+        path = buffer_zone_service.BUFFER_ZONES_PATH
+        facilities = load_feature_index(FACILITIES_GEOJSON_PATH)["properties"]
+        buffers = load_feature_index(path)["properties"]
+        for amenity in ("Cargo", "Deicing", "Free Space"):
+            names = {p.get("name") or p.get("id") for p in facilities if p.get("amenity") == amenity}
+            expected = [i for i, p in enumerate(buffers) if p.get("facility_name") in names]
+            assert filter_layer_positions("buffers", path, amenity=amenity).tolist() == expected
@@ -3,6 +3,7 @@
 import os
 import pytest
 import pandas as pd
+from sqlalchemy import create_engine, text
 from app.utils.data_loader import (
     load_utilization_data,
     load_operations_data,
@@ -12,8 +13,22 @@ from app.utils.data_loader import (
     load_ac_data,
     load_gse_data,
     load_csv,
+    populate_database,
+    query_cached_table,
+    invalidate_table_cache,
+    populate_database_if_changed,
+    read_source_metadata,
+    bulk_load_table,
+    create_db_engine,
+    get_engine,
+    load_data_from_db,
+    check_tables_ready,
+    start_readiness_check,
+    is_table_ready,
     DATA_PATH
 )
+from sqlalchemy import inspect
+from app.utils import data_loader
 
 # Test for utilization_data.csv
 def test_load_utilization_data():
@@ -97,6 +112,221 @@ def test_load_csv_generic(file_name, expected_column):
     assert expected_column in df.columns, \
         f"Missing expected column '{expected_column}' in {file_name}"
 
+@pytest.fixture
+def ac_db_engine(tmp_path):
+    """Throwaway SQLite engine holding a populated ac_data table."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'ac_data.db'}")
+    populate_database("ac_data.csv", engine, "ac_data")
+    yield engine
+    invalidate_table_cache()
+    engine.dispose()
+
+def test_cached_table_matches_sql(ac_db_engine):
+    """Mask-based filtering returns the same rows as the equivalent SQL query."""
+    csv_file = os.path.join(DATA_PATH, "ac_data.csv")
+    cached = query_cached_table(
+        "ac_data", ac_db_engine, csv_file, filters={"MONTH": 7, "DATA_SOURCE": " DU "}
+    )
+    expected = pd.read_sql(
+        text("SELECT * FROM ac_data WHERE MONTH = 7 AND DATA_SOURCE = 'DU'"), ac_db_engine
+    )
+    assert len(cached) == len(expected) > 0
+    assert list(cached.columns) == list(expected.columns)
+    assert cached["FUEL_CONSUMPTION"].sum() == expected["FUEL_CONSUMPTION"].sum()
+
+def test_cached_table_list_filter(ac_db_engine):
+    """List filters behave like SQL IN clauses."""
+    csv_file = os.path.join(DATA_PATH, "ac_data.csv")
+    cached = query_cached_table("ac_data", ac_db_engine, csv_file, filters={"MONTH": [1, 2]})
+    assert set(cached["MONTH"].unique()) == {1, 2}
+
+def test_cached_table_invalidated_on_populate(ac_db_engine):
+    """Rewriting a table with populate_database drops its cached arrays."""
+    csv_file = os.path.join(DATA_PATH, "ac_data.csv")
+    before = query_cached_table("ac_data", ac_db_engine, csv_file)
+
+    # Out-of-band writes are not seen while the table is cached
+    with ac_db_engine.begin() as conn:
+        conn.execute(text("DELETE FROM ac_data WHERE MONTH = 1"))
+    assert len(query_cached_table("ac_data", ac_db_engine, csv_file)) == len(before)
+    invalidate_table_cache("ac_data")
+    assert len(query_cached_table("ac_data", ac_db_engine, csv_file)) < len(before)
+
+    # populate_database rewrites the table and invalidates the cache
+    populate_database("ac_data.csv", ac_db_engine, "ac_data")
+    assert len(query_cached_table("ac_data", ac_db_engine, csv_file)) == len(before)
+
+def test_cached_table_unknown_column(ac_db_engine):
+    """Filtering on a column the table does not have is an error."""
+    csv_file = os.path.join(DATA_PATH, "ac_data.csv")
+    with pytest.raises(KeyError):
+        query_cached_table("ac_data", ac_db_engine, csv_file, filters={"NOT_A_COLUMN": 1})
+
+def test_population_skipped_when_csv_unchanged(tmp_path, monkeypatch):
+    """A second load of an unchanged CSV is skipped; a content change triggers a rebuild."""
+    monkeypatch.setattr(data_loader, "DATA_PATH", str(tmp_path))
+    csv_path = tmp_path / "gse_data.csv"
+    csv_path.write_bytes(open(os.path.join(DATA_PATH, "gse_data.csv"), "rb").read())
+    engine = create_engine(f"sqlite:///{tmp_path / 'gse_data.db'}")
+
+    assert populate_database_if_changed("gse_data.csv", engine, "gse_data") is True
+    metadata = read_source_metadata(engine, "gse_data")
+    assert metadata["size"] == csv_path.stat().st_size
+    assert populate_database_if_changed("gse_data.csv", engine, "gse_data") is False
+
+    # Touching the file without changing its contents does not reload it
+    os.utime(csv_path, ns=(csv_path.stat().st_atime_ns, csv_path.stat().st_mtime_ns + 10**9))
+    assert populate_database_if_changed("gse_data.csv", engine, "gse_data") is False
+    assert read_source_metadata(engine, "gse_data")["mtime_ns"] == csv_path.stat().st_mtime_ns
+
+    # Dropping the last row changes the contents
+    lines = csv_path.read_text().splitlines(keepends=True)
+    csv_path.write_text("".join(lines[:-1]))
+    assert populate_database_if_changed("gse_data.csv", engine, "gse_data") is True
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM gse_data")).scalar() == len(lines) - 2
+    invalidate_table_cache()
+    engine.dispose()
+
+def test_bulk_load_declares_types_and_indexes(ac_db_engine):
+    """populate_database creates typed columns and indexes the filter columns."""
+    inspector = inspect(ac_db_engine)
+    types = {column["name"]: str(column["type"]) for column in inspector.get_columns("ac_data")}
+    assert types["MONTH"] == "INTEGER"
+    assert types["FUEL_CONSUMPTION"] == "REAL"
+    assert types["ORIGIN"] == "TEXT"
+
+    indexed = {tuple(index["column_names"]) for index in inspector.get_indexes("ac_data")}
+    for column in ("MONTH", "DATA_SOURCE", "UNIQUE_CARRIER", "ORIGIN"):
+        assert (column,) in indexed
+
+    expected = pd.read_csv(os.path.join(DATA_PATH, "ac_data.csv"))
+    with ac_db_engine.connect() as conn:
+        assert conn.execute(text("SELECT COUNT(*) FROM ac_data")).scalar() == len(expected)
+        assert conn.execute(text("PRAGMA synchronous")).scalar() != 0
+
+def test_bulk_load_keeps_configured_pragmas(tmp_path):
+    """The loader restores the engine's synchronous level and leaves the journal mode alone."""
+    engine = create_db_engine(
+        f"sqlite:///{tmp_path / 'pragmas.db'}", pool_size=1, max_overflow=0,
+        sqlite_pragmas={"journal_mode": "DELETE", "synchronous": "FULL"}
+    )
+    bulk_load_table(pd.DataFrame({"value": [1, 2, 3]}), engine, "pragma_test")
+    # Same pooled connection the load ran on
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 2
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
+
+def test_bulk_load_coerces_bad_numbers_to_null(tmp_path):
+    """Values that don't parse as the declared type are stored as NULL."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'typed.db'}")
+    df = pd.read_csv(os.path.join(DATA_PATH, "ac_data.csv")).head(3).astype({"AIR_TIME": object})
+    df.loc[1, "AIR_TIME"] = "n/a"
+    bulk_load_table(df, engine, "ac_data")
+    loaded = pd.read_sql(text("SELECT AIR_TIME FROM ac_data"), engine)["AIR_TIME"]
+    assert loaded.isna().tolist() == [False, True, False]
+    engine.dispose()
+
+def test_bulk_load_failure_keeps_previous_rows(tmp_path):
+    """A reload that fails while inserting leaves the previous table untouched."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'reload.db'}")
+    bulk_load_table(pd.DataFrame({"name": ["a", "b", "c"], "value": [1, 2, 3]}), engine, "reload_test")
+
+    # sqlite3 cannot bind a dict, so the INSERT fails after DROP/CREATE ran
+    bad = pd.DataFrame({"name": ["x", {"not": "bindable"}], "value": [4, 5]})
+    with pytest.raises(Exception):
+        bulk_load_table(bad, engine, "reload_test")
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("SELECT name, value FROM reload_test ORDER BY value")).fetchall()
+    assert [tuple(row) for row in rows] == [("a", 1), ("b", 2), ("c", 3)]
+    engine.dispose()
+
+def test_sqlite_engine_pragmas_and_threads(tmp_path):
+    """File engines use WAL and the configured pragmas, and connections can cross threads."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'gse_data.db'}", sqlite_pragmas={"journal_mode": "WAL", "cache_size": -2048})
+    populate_database("gse_data.csv", engine, "gse_data")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -2048
+
+    def count(_):
+        with engine.connect() as conn:
+            return conn.execute(text("SELECT COUNT(*) FROM gse_data")).scalar()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        assert len(set(pool.map(count, range(32)))) == 1
+    engine.dispose()
+
+def test_get_engine_uses_app_engines(app):
+    """Inside an app context the engines registered by create_app are used."""
+    assert get_engine("ac") is app.extensions["db_engines"]["ac"]
+    assert get_engine("gse") is app.extensions["db_engines"]["gse"]
+    assert str(get_engine("ac").url) == app.config["AC_DB_URI"]
+    with pytest.raises(ValueError):
+        get_engine("unknown")
+
+def test_load_data_from_db_rejects_unknown_tables(app):
+    """Only whitelisted tables can be queried."""
+    with pytest.raises(ValueError):
+        load_data_from_db("gse_data; DROP TABLE gse_data")
+    with pytest.raises(ValueError):
+        load_data_from_db("sqlite_master")
+
+def test_tables_checked_once(app, monkeypatch):
+    """After the readiness check, queries no longer probe the table."""
+    assert check_tables_ready() == {"ac_data": True, "gse_data": True, "ac_fuel_index": True}
+    assert is_table_ready("gse_data", get_engine("gse"))
+
+    probes = []
+    monkeypatch.setattr(data_loader, "_has_rows", lambda *args: probes.append(args) or True)
+    invalidate_table_cache()
+    df = load_data_from_db("gse_data", filters={"Ground support Equipment": "F250"})
+    assert len(df) == 1
+    assert probes == []
+
+def test_background_readiness_check(app):
+    """start_readiness_check records the status of every table on the app."""
+    start_readiness_check(app).join(timeout=30)
+    assert all(app.extensions["db_readiness"].values())
+
+@pytest.mark.parametrize("query", [
+    {"columns": ["Ground support Equipment"], "distinct": True},
+    {"columns": ["Fuel used"], "distinct": True},
+    {"filters": {"Fuel used": "Diesel"}, "columns": ["Ground support Equipment", "Operating time - Departure"]},
+    {"group_by": ["Fuel used"], "aggregates": {"n": ("count", "*"), "departure_min": ("sum", "Operating time - Departure")}},
+    {"filters": {"Fuel used": "Hydrogen"}, "aggregates": {"total": ("sum", "Operating time - Departure"), "n": ("count", "*")}},
+])
+def test_projection_sql_matches_cache(app, query):
+    """Projected and aggregated queries give the same result in SQL and from the cache."""
+    invalidate_table_cache()
+    from_sql = load_data_from_db("gse_data", **query)
+    load_data_from_db("gse_data")  # make the table resident
+    from_cache = load_data_from_db("gse_data", **query)
+    pd.testing.assert_frame_equal(
+        from_sql.reset_index(drop=True), from_cache.reset_index(drop=True)
+    )
+
+def test_projection_reads_only_requested_columns(app):
+    """gse_options-style queries return one column of distinct values."""
+    invalidate_table_cache()
+    df = load_data_from_db("gse_data", columns=["Ground support Equipment"], distinct=True)
+    assert list(df.columns) == ["Ground support Equipment"]
+    assert df["Ground support Equipment"].is_unique
+
+def test_projection_validation(app):
+    """Unknown columns and aggregate functions are rejected."""
+    invalidate_table_cache()
+    with pytest.raises(KeyError):
+        load_data_from_db("gse_data", columns=["NOT_A_COLUMN"])
+    with pytest.raises(ValueError):
+        load_data_from_db("gse_data", aggregates={"x": ("median", "Fuel used")})
+    with pytest.raises(ValueError):
+        load_data_from_db("gse_data", columns=["Fuel used"], group_by=["Fuel used"])
+
 if __name__ == "__main__":
     test_load_utilization_data()
     test_load_operations_data()
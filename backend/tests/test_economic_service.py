@@ -6,11 +6,23 @@ import pandas as pd
 import numpy as np
 from app.services.economic_service import (
     calculate_economic_impact,
+    clear_baseline_cache,
+    compute_baseline_index,
+    get_baselines,
+    lookup_baselines,
+    hydrogen_uti_rev,
     load_data,
     validate_data,
     EconomicCalculationError
 )
 
+@pytest.fixture(autouse=True)
+def fresh_baseline_cache():
+    """Keep cached baselines from leaking between tests that mock load_data."""
+    clear_baseline_cache()
+    yield
+    clear_baseline_cache()
+
 @pytest.fixture
 def mock_operational_data():
     return pd.DataFrame({
@@ -101,6 +113,141 @@ class TestEconomicService:
                 calculate_economic_impact()
             assert "Total departures cannot be zero" in str(exc.value)
 
+@pytest.fixture
+def mock_bts_data():
+    """Minimal datasets with every column the Delta/ATL filters use."""
+    return {
+        "uti_data": pd.DataFrame({
+            "UNIQUE_CARRIER": ["DL", "DL", "AA"],
+            "UNIQUE_CARRIER_NAME": ["Delta Air Lines Inc.", "Delta Air Lines Inc.", "American Airlines Inc."],
+            "REGION": ["D", "D", "D"],
+            "REV_ACRFT_HRS_AIRBORNE_610": [1000.0, 2000.0, 500.0]
+        }),
+        "operations_data": pd.DataFrame({
+            "UNIQUE_CARRIER_NAME": ["Delta Air Lines Inc.", "Delta Air Lines Inc.", "American Airlines Inc."],
+            "ORIGIN": ["ATL", "JFK", "ATL"],
+            "DEPARTURES_PERFORMED": [100, 50, 25]
+        }),
+        "income_data": pd.DataFrame({
+            "UNIQUE_CARRIER_NAME": ["Delta Air Lines Inc.", "American Airlines Inc."],
+            "REGION": ["D", "D"],
+            "OP_REVENUES": [3_000_000.0, 1_000_000.0]
+        })
+    }
+
+class TestScenarioGrid:
+    def test_hydrogen_uti_rev_broadcasts(self):
+        """Array inputs give the same values as scalar calls, cell by cell"""
+        fractions = np.array([0.1, 0.3])
+        turn_times = np.array([[30.0, 20.0], [10.0, 0.0]])
+        grid = hydrogen_uti_rev(fractions, 150.0, 0.6, 1e5, turn_times, 3.0, 900.0)
+
+        for i in range(2):
+            for j in range(2):
+                cell = hydrogen_uti_rev(fractions[j], 150.0, 0.6, 1e5, turn_times[i, j], 3.0, 900.0)
+                for grid_value, cell_value in zip(grid, cell):
+                    assert np.broadcast_to(grid_value, (2, 2))[i, j] == pytest.approx(float(cell_value))
+
+    def test_hydrogen_uti_rev_zero_baselines(self):
+        """Zero utilization, revenue and demand yield zeros instead of division errors"""
+        _, _, tax_credit, _, new_revenue, pct_drop = hydrogen_uti_rev(0.0, 150.0, 0.6, 0.0, 30.0, 3.0, 0.0)
+        assert float(tax_credit) == 0.0
+        assert float(new_revenue) == 0.0
+        assert float(pct_drop) == 0.0
+
+    def test_calculate_economic_impact_grid(self, mock_bts_data):
+        """Every rate gets a full year table and summary computed from it"""
+        rates = [0, 1, 2.5]
+        with patch('app.services.economic_service.load_data', return_value=mock_bts_data):
+            result = calculate_economic_impact(
+                total_h2_demand=1e5, fleet_percentage=0.3, start_year=2023, end_year=2035,
+                growth_rate=0.02, extra_turn_time=30, turn_time_decrease_rates=rates,
+                final_h2_year=2030
+            )
+
+        assert list(result["scenarios"]) == rates
+        for rate in rates:
+            table = pd.DataFrame(result["scenarios"][rate])
+            assert table["Year"].tolist() == list(range(2023, 2036))
+            assert table["Turn_Time_min"].tolist() == [max(0, 30 - rate * n) for n in range(13)]
+            summary = result["summary"][rate]
+            assert summary["max_tax_credit"] == pytest.approx(table["Req_Tax_Credit_per_gal"].max())
+            assert summary["avg_revenue_drop_pct"] == pytest.approx(table["Pct_Drop"].mean())
+            assert summary["final_year_revenue_drop"] == pytest.approx(table["Pct_Drop"].iloc[-1])
+
+        assert isinstance(result["scenarios"][1][0]["Turn_Time_min"], int)
+
+class TestBaselineCache:
+    @pytest.fixture
+    def source_files(self, tmp_path):
+        """Stand-in BTS files so the cache has something to fingerprint."""
+        for name in ["utilization_data.csv", "operations_data.csv", "income_data.csv"]:
+            (tmp_path / name).write_text("placeholder\n")
+        with patch('app.services.economic_service.get_data_file_path',
+                   side_effect=lambda name: str(tmp_path / name)):
+            yield tmp_path
+
+    def test_baselines_cached_until_source_changes(self, source_files, mock_bts_data):
+        """Baselines are computed once and rebuilt only after a source file changes"""
+        with patch('app.services.economic_service.load_data', return_value=mock_bts_data) as mock_load:
+            first = get_baselines()
+            assert get_baselines() == first
+            assert mock_load.call_count == 1
+
+            (source_files / "income_data.csv").write_text("placeholder, but longer\n")
+            get_baselines()
+            assert mock_load.call_count == 2
+
+        assert first["carrier_departures"] == 150.0
+        assert first["origin_share"] == pytest.approx(100 / 150)
+        assert first["total_rev"] == pytest.approx(3.0)
+        assert first["airborne_hours"] == 3000.0
+
+    def test_baselines_not_cached_when_file_missing(self, source_files, mock_bts_data):
+        """Without a fingerprint for every file, baselines are recomputed each time"""
+        (source_files / "operations_data.csv").unlink()
+        with patch('app.services.economic_service.load_data', return_value=mock_bts_data) as mock_load:
+            get_baselines()
+            get_baselines()
+            assert mock_load.call_count == 2
+
+class TestBaselineIndex:
+    def test_index_covers_every_carrier_origin_pair(self, mock_bts_data):
+        """One index row per (carrier, origin) with carrier- and airport-level shares"""
+        index = compute_baseline_index(mock_bts_data)
+
+        assert set(index.index) == {("DL", "ATL"), ("DL", "JFK"), ("AA", "ATL")}
+        assert index.loc[("DL", "ATL"), "airport_share"] == pytest.approx(100 / 125)
+        assert index.loc[("AA", "ATL"), "airport_share"] == pytest.approx(25 / 125)
+        assert index.loc[("DL", "JFK"), "origin_share"] == pytest.approx(50 / 150)
+        assert index.loc[("AA", "ATL"), "total_rev"] == pytest.approx(1.0)
+        assert index.loc[("AA", "ATL"), "airborne_hours"] == 500.0
+
+    def test_lookup_unknown_pair(self, mock_bts_data):
+        """Pairs missing from the BTS data are reported by carrier and airport"""
+        index = compute_baseline_index(mock_bts_data)
+        with pytest.raises(EconomicCalculationError) as exc:
+            lookup_baselines(index, "AA", "JFK")
+        assert "No AA flights departing from JFK found" in str(exc.value)
+
+    def test_calculate_economic_impact_other_carrier(self, mock_bts_data):
+        """calculate_economic_impact serves other carriers from the same index"""
+        with patch('app.services.economic_service.load_data', return_value=mock_bts_data):
+            delta = calculate_economic_impact(
+                total_h2_demand=1e5, fleet_percentage=0.3, start_year=2023, end_year=2030,
+                growth_rate=0.02, extra_turn_time=30, turn_time_decrease_rates=[1],
+                final_h2_year=2030
+            )
+            american = calculate_economic_impact(
+                total_h2_demand=1e5, fleet_percentage=0.3, start_year=2023, end_year=2030,
+                growth_rate=0.02, extra_turn_time=30, turn_time_decrease_rates=[1],
+                final_h2_year=2030, carrier="AA", airport="ATL"
+            )
+
+        # AA flies only from ATL, so its whole domestic revenue is attributed there
+        assert american["scenarios"][1][0]["Baseline_Revenue_M"] == pytest.approx(0.3 * 1.0 * 1.0)
+        assert delta["scenarios"][1][0]["Baseline_Revenue_M"] == pytest.approx(0.3 * (100 / 150) * 3.0)
+
 def test_calculate_economic_impact_integration():
     """
     Integration test for calculate_economic_impact using the actual CSV files.
@@ -127,4 +274,18 @@ def test_calculate_economic_impact_integration():
         assert isinstance(result[key], float), f"Value for {key} is not float"
 
     # Additional checks: for example, baseline revenue should be positive.
-    assert result["baseline_revenue"] > 0, "Baseline revenue should be positive"
\ No newline at end of file
+    assert result["baseline_revenue"] > 0, "Baseline revenue should be positive"
+
+
+@pytest.mark.parametrize("codes", [
+    {"carrier": ["DL"]},
+    {"airport": {"x": 1}},
+    {"carrier": "  "},
+])
+def test_economic_impact_route_rejects_malformed_codes(client, codes):
+    """Carrier/airport codes that are not non-empty strings are rejected before any lookup"""
+    with patch("app.routes.economic.calculate_economic_impact") as calculate:
+        response = client.post("/api/economic/impact", json={"totalH2Demand": 1000, **codes})
+    assert response.status_code == 400
+    assert "must be a non-empty string" in response.get_json()["message"]
+    calculate.assert_not_called()
@@ -0,0 +1,77 @@
+# File: backend/tests/test_geo_cache.py
+import os
+import json
+import pytest
+from shapely.geometry import shape
+from app.utils import geo_cache
+
+def _feature(name, coords):
+    return {
+        "type": "Feature",
+        "properties": {"name": name, "distance_requirements": {"contains_people": True}},
+        "geometry": {"type": "Polygon", "coordinates": [coords]}
+    }
+
+@pytest.fixture
+def geojson_file(tmp_path):
+    path = tmp_path / "layer.geojson"
+    features = [
+        _feature("A", [[0, 0], [1, 0], [1, 1], [0, 0]]),
+        _feature("B", [[2, 2], [3, 2], [3, 3], [2, 2]]),
+    ]
+    path.write_text(json.dumps({"type": "FeatureCollection", "features": features}))
+    geo_cache.clear_compiled_cache()
+    yield path
+    geo_cache.clear_compiled_cache()
+
+def test_compiled_geojson_round_trip(geojson_file):
+    geometries, properties = geo_cache.load_compiled_geojson(str(geojson_file))
+    source = json.loads(geojson_file.read_text())["features"]
+
+    assert properties == [feature["properties"] for feature in source]
+    assert all(geom.equals(shape(feature["geometry"])) for geom, feature in zip(geometries, source))
+    assert os.path.exists(os.path.join(geo_cache.compiled_dir(str(geojson_file)), geo_cache.META_FILE))
+
+def test_compiled_copy_is_reused_across_workers(geojson_file, monkeypatch):
+    geo_cache.load_compiled_geojson(str(geojson_file))
+    geo_cache.clear_compiled_cache()
+
+    def fail(source_path):
+        raise AssertionError("recompiled unchanged source")
+    monkeypatch.setattr(geo_cache, "compile_geojson", fail)
+
+    # A fresh process only reads the compiled arrays, even if the source was touched
+    os.utime(geojson_file)
+    geometries, properties = geo_cache.load_compiled_geojson(str(geojson_file))
+    assert [props["name"] for props in properties] == ["A", "B"]
+
+def test_compiled_copy_follows_source_changes(geojson_file):
+    geo_cache.load_compiled_geojson(str(geojson_file))
+
+    data = json.loads(geojson_file.read_text())
+    data["features"] = data["features"][:1]
+    geojson_file.write_text(json.dumps(data))
+    stat = os.stat(geojson_file)
+    os.utime(geojson_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    gdf = geo_cache.load_geodataframe(str(geojson_file))
+    assert list(gdf["name"]) == ["A"]
+    assert gdf.crs.to_string() == "EPSG:4326"
+
+def test_write_atomic_keeps_file_mode(tmp_path):
+    import stat
+    path = tmp_path / "data.json"
+    path.write_bytes(b"old")
+    os.chmod(path, 0o640)
+    geo_cache.write_atomic(str(path), b"new")
+    assert path.read_bytes() == b"new"
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o640
+
+    # New files get the mode open() would give them, not mkstemp's 0600
+    umask = os.umask(0o022)
+    try:
+        created = tmp_path / "created.json"
+        geo_cache.write_atomic(str(created), b"{}")
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(os.stat(created).st_mode) == 0o644
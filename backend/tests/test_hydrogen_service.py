@@ -4,11 +4,13 @@ import pytest
 from unittest.mock import patch, Mock
 import pandas as pd
 from app.services.hydrogen_service import (
-    get_growth_rate, compute_h2_demand_ac, compute_h2_demand_gse, compute_storage_area, compute_emissions
+    get_growth_rate, growth_rates, get_base_fuel_weight, get_carrier_shares,
+    compute_h2_demand_ac, compute_h2_demand_ac_batch, compute_h2_demand_gse_bulk, compute_h2_demand_gse, compute_storage_area, compute_emissions,
+    MAX_BULK_GSE
 )
-from app.utils.data_loader import load_data_from_db
+from app.utils.data_loader import load_data_from_db, load_ac_data
 from app.utils.validation import ValidationError
-from app.constants import growth_rate_data
+from app.constants import growth_rate_data, DELTA_PART_DOMESTIC, DELTA_PART_FLIGHTS
 
 class TestGrowthRate:
     def test_get_growth_rate_valid(self):
@@ -23,6 +25,30 @@ class TestGrowthRate:
             get_growth_rate(2020)
         assert "Year must be 2023 or later" in str(exc.value)
 
+    def test_get_growth_rate_matches_taf_projection(self):
+        """Precomputed table reproduces the TAF-based formula"""
+        ops = growth_rate_data.set_index("Year")["Projected Operations"]
+        expected = (ops[2040] - ops[2023]) / ops[2023] * DELTA_PART_DOMESTIC * DELTA_PART_FLIGHTS
+        assert get_growth_rate(2040) == pytest.approx(expected)
+        assert get_growth_rate(2023) == 0
+
+    def test_growth_rates_extrapolates_beyond_taf(self):
+        """Years after 2050 continue the final yearly increase linearly"""
+        rates = growth_rates([2049, 2050, 2051, 2060])
+        step = rates[1] - rates[0]
+        assert rates[2] == pytest.approx(rates[1] + step)
+        assert rates[3] == pytest.approx(rates[1] + 10 * step)
+        assert get_growth_rate(2060) == pytest.approx(rates[3])
+
+    def test_growth_rates_invalid_years(self):
+        """Vectorized lookup applies the same validation as get_growth_rate"""
+        with pytest.raises(ValidationError) as exc:
+            growth_rates([2030, 2020])
+        assert "Year must be 2023 or later" in str(exc.value)
+        with pytest.raises(ValidationError) as exc:
+            growth_rates([2030, "2031"])
+        assert "Year must be an integer" in str(exc.value)
+
 class TestH2DemandAC:
     @pytest.mark.usefixtures("setup_test_databases")
     def test_compute_h2_demand_ac_valid(self):
@@ -37,6 +63,40 @@ class TestH2DemandAC:
         assert isinstance(h2_demand_ac, float), "H2 demand should be a float"
         assert isinstance(fuel_weight, float), "Fuel weight should be a float"
 
+    def test_base_fuel_weight_matches_raw_rows(self):
+        """The fuel-burn index gives the same total as summing the raw rows"""
+        ac_data = load_ac_data()
+        july_domestic = ac_data[(ac_data["MONTH"] == 7) & (ac_data["DATA_SOURCE"] == "DU")]
+        expected = (july_domestic["FUEL_CONSUMPTION"] * july_domestic["AIR_TIME"] / 60).sum()
+
+        assert get_base_fuel_weight() == pytest.approx(expected)
+        assert get_base_fuel_weight(carrier="DL", origin="ATL") == pytest.approx(expected)
+        assert get_base_fuel_weight(month=1) != pytest.approx(expected)
+
+    def test_carrier_shares(self):
+        """Delta at ATL keeps the calibrated constants; other pairs are derived from BTS data"""
+        assert get_carrier_shares("DL", "ATL") == (DELTA_PART_FLIGHTS, DELTA_PART_DOMESTIC)
+
+        departures = pd.DataFrame({
+            "UNIQUE_CARRIER": ["AA", "AA", "DL", "DL"],
+            "DATA_SOURCE": ["DU", "IU", "DU", "IU"],
+            "DEPARTURES": [75, 25, 90, 10]
+        })
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=departures):
+            assert get_carrier_shares("AA", "ATL") == (0.5, 0.75)
+
+    def test_carrier_shares_from_fuel_index(self):
+        """Non-default pairs only need the fuel-burn index (no economic CSVs)"""
+        with pytest.raises(ValidationError) as exc:
+            get_carrier_shares("AA", "ATL")
+        assert "No aircraft data found for AA at ATL" in str(exc.value)
+
+    def test_compute_h2_demand_ac_unknown_airport(self):
+        """Carriers/airports without aircraft data are rejected"""
+        with pytest.raises(ValidationError) as exc:
+            compute_h2_demand_ac(0.5, 2030, carrier="DL", airport="XXX")
+        assert "No aircraft data found for DL at XXX" in str(exc.value)
+
     def test_compute_h2_demand_ac_invalid_slider(self):
         """Test with invalid slider percentage"""
         with pytest.raises(ValidationError) as exc:
@@ -60,6 +120,46 @@ class TestH2DemandAC:
         with pytest.raises((ValidationError, TypeError)):
             compute_h2_demand_ac(slider_perc, end_year)
 
+    def test_h2_demand_ac_route_null_carrier_uses_default(self, client):
+        """An explicit null carrier/airport falls back to the defaults like a missing key"""
+        body = {"slider_perc": 0.1, "end_year": 2035}
+        expected = client.post("/api/hydrogen/h2_demand/ac", json=body)
+        response = client.post("/api/hydrogen/h2_demand/ac", json={**body, "carrier": None, "airport": None})
+        assert expected.status_code == response.status_code == 200
+        assert response.get_json()["data"] == expected.get_json()["data"]
+
+class TestH2DemandACBatch:
+    def test_batch_matches_single_requests(self):
+        """Every cell of the batch matrix equals the single-point calculation"""
+        slider_percs = [0.1, 0.5, 1.0]
+        end_years = [2023, 2030, 2050]
+
+        h2_demand, fuel_weight = compute_h2_demand_ac_batch(slider_percs, end_years)
+
+        assert h2_demand.shape == (3, 3)
+        for i, slider_perc in enumerate(slider_percs):
+            for j, end_year in enumerate(end_years):
+                expected_demand, expected_fuel = compute_h2_demand_ac(slider_perc, end_year)
+                assert h2_demand[i, j] == pytest.approx(expected_demand)
+                assert fuel_weight[i, j] == pytest.approx(expected_fuel)
+
+    def test_growth_rates_matches_scalar(self):
+        """Vectorized growth rates agree with get_growth_rate"""
+        years = [2023, 2035, 2050]
+        assert growth_rates(years) == pytest.approx([get_growth_rate(y) for y in years])
+
+    @pytest.mark.parametrize("slider_percs,end_years,message", [
+        ([], [2030], "slider_percs cannot be empty"),
+        ([0.5], [], "end_years cannot be empty"),
+        ([1.5], [2030], "slider_perc must be between 0 and 1"),
+        ([0.5], [2020], "Year must be 2023 or later"),
+    ])
+    def test_batch_invalid_inputs(self, slider_percs, end_years, message):
+        """Invalid sweep values are rejected"""
+        with pytest.raises(ValidationError) as exc:
+            compute_h2_demand_ac_batch(slider_percs, end_years)
+        assert message in str(exc.value)
+
 class TestH2DemandGSE:
     @pytest.fixture
     def mock_gse_data(self):
@@ -89,6 +189,98 @@ class TestH2DemandGSE:
             assert isinstance(tot_diesel, float), "Diesel total should be a float"
             assert isinstance(tot_gasoline, float), "Gasoline total should be a float"
 
+    def test_compute_h2_demand_gse_matches_row_formula(self, mock_gse_data):
+        """Vectorized totals match the per-row conversion formulas"""
+        mock_gse_data.loc[1, "Fuel used"] = "Gasoline"
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=mock_gse_data):
+            _, tot_diesel, tot_gasoline = compute_h2_demand_gse(["F250", "FMC Commander 15"], 2030)
+
+        assert tot_diesel == pytest.approx(2.0 * 2.0 * 52.28)
+        assert tot_gasoline == pytest.approx(2.5 * 3.0 * 46.38)
+
+    def test_compute_h2_demand_gse_unknown_fuel(self, mock_gse_data):
+        """Unknown fuel types are reported instead of silently skipped"""
+        mock_gse_data.loc[0, "Fuel used"] = "Electric"
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=mock_gse_data):
+            with pytest.raises(ValidationError) as exc:
+                compute_h2_demand_gse(["F250", "FMC Commander 15"], 2030)
+        assert "Unknown fuel type(s) for GSE: Electric" in str(exc.value)
+
+    def test_compute_h2_demand_gse_bulk(self, mock_gse_data):
+        """Bulk mode returns every subset, each matching the single-list result"""
+        gse_list = ["F250", "FMC Commander 15"]
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=mock_gse_data):
+            subsets = compute_h2_demand_gse_bulk(gse_list, 2030)
+            assert len(subsets) == 4
+            assert subsets[0]["gse_list"] == []
+            assert subsets[0]["daily_h2_demand_ft3"] == 0
+
+            for subset in subsets[1:]:
+                single_data = mock_gse_data[mock_gse_data["Ground support Equipment"].isin(subset["gse_list"])]
+                with patch('app.services.hydrogen_service.load_data_from_db', return_value=single_data):
+                    h2_demand, tot_diesel, tot_gasoline = compute_h2_demand_gse(subset["gse_list"], 2030)
+                assert subset["daily_h2_demand_ft3"] == pytest.approx(h2_demand)
+                assert subset["total_diesel_used_lb"] == pytest.approx(tot_diesel)
+                assert subset["total_gasoline_used_lb"] == pytest.approx(tot_gasoline)
+
+    def test_compute_h2_demand_gse_bulk_unknown_equipment(self, mock_gse_data):
+        """Bulk mode rejects equipment with no data instead of counting it as zero"""
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=mock_gse_data):
+            with pytest.raises(ValidationError) as exc:
+                compute_h2_demand_gse_bulk(["F250", "nope", "nope2"], 2030)
+        assert "No data found for GSE equipment: nope, nope2" in str(exc.value)
+
+    def test_compute_h2_demand_gse_bulk_too_many_before_query(self):
+        """The bulk size limit is checked before the database is queried"""
+        gse_list = [f"GSE {i}" for i in range(MAX_BULK_GSE + 1)]
+        with patch('app.services.hydrogen_service.load_data_from_db') as load:
+            with pytest.raises(ValidationError) as exc:
+                compute_h2_demand_gse_bulk(gse_list, 2030)
+        assert f"at most {MAX_BULK_GSE} GSE types" in str(exc.value)
+        load.assert_not_called()
+
+    def test_compute_h2_demand_gse_bulk_duplicates(self, mock_gse_data):
+        """Duplicate equipment is counted once"""
+        with patch('app.services.hydrogen_service.load_data_from_db', return_value=mock_gse_data):
+            subsets = compute_h2_demand_gse_bulk(["F250", " F250", "FMC Commander 15"], 2030)
+        assert len(subsets) == 4
+        assert subsets[-1]["gse_list"] == ["F250", "FMC Commander 15"]
+
+    def test_h2_demand_gse_bulk_route(self, client):
+        """Each subset returned by the route matches the single-list endpoint"""
+        body = {"gse_list": ["F250", "FMC Commander 15"], "end_year": 2030}
+        response = client.post("/api/hydrogen/h2_demand/gse/bulk", json=body)
+        assert response.status_code == 200
+
+        subsets = response.get_json()["data"]
+        assert [subset["gse_list"] for subset in subsets] == [
+            [], ["F250"], ["FMC Commander 15"], ["F250", "FMC Commander 15"]
+        ]
+        for subset in subsets[1:]:
+            h2_demand, tot_diesel, tot_gasoline = compute_h2_demand_gse(subset["gse_list"], 2030)
+            assert subset["daily_h2_demand_ft3"] == pytest.approx(h2_demand)
+            assert subset["total_diesel_used_lb"] == pytest.approx(tot_diesel)
+            assert subset["total_gasoline_used_lb"] == pytest.approx(tot_gasoline)
+
+    @pytest.mark.parametrize("gse_list, message", [
+        (["F250", "nope"], "No data found for GSE equipment: nope"),
+        ([f"GSE {i}" for i in range(MAX_BULK_GSE + 1)], f"at most {MAX_BULK_GSE} GSE types"),
+    ])
+    def test_h2_demand_gse_bulk_route_rejects(self, client, gse_list, message):
+        """Unknown equipment and oversized lists return 400"""
+        response = client.post("/api/hydrogen/h2_demand/gse/bulk", json={"gse_list": gse_list, "end_year": 2030})
+        assert response.status_code == 400
+        assert message in response.get_json()["message"]
+
+    def test_h2_demand_gse_bulk_route_duplicates(self, client):
+        """Duplicate equipment in the request does not multiply the subsets"""
+        response = client.post(
+            "/api/hydrogen/h2_demand/gse/bulk",
+            json={"gse_list": ["F250", "F250"], "end_year": 2030}
+        )
+        assert response.status_code == 200
+        assert [subset["gse_list"] for subset in response.get_json()["data"]] == [[], ["F250"]]
+
     def test_compute_h2_demand_gse_empty_list(self):
         """Test with empty GSE list"""
         with pytest.raises(ValidationError) as exc:
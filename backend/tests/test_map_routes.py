@@ -0,0 +1,121 @@
+# File: backend/tests/test_map_routes.py
+import os
+import gzip
+import json
+import pytest
+from app import create_app
+from app.utils import http_cache
+
+FACILITIES_PATH = os.path.join(os.path.dirname(__file__), "../data/geojson/facilities.geojson")
+
+@pytest.fixture
+def app():
+    _app = create_app("testing")
+    _app.config["TESTING"] = True
+    http_cache.clear_file_payloads()
+    yield _app
+    http_cache.clear_file_payloads()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def test_facilities_served_as_file_bytes(client):
+    response = client.get("/api/map/facilities")
+    assert response.status_code == 200
+    with open(FACILITIES_PATH, "rb") as f:
+        assert response.data == f.read()
+    assert response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    assert response.headers.get("Content-Encoding") is None
+
+def test_facilities_gzip_variant(client):
+    response = client.get("/api/map/facilities", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert json.loads(gzip.decompress(response.data))["type"] == "FeatureCollection"
+
+def test_facilities_conditional_get(client):
+    etag = client.get("/api/map/facilities").headers["ETag"]
+    response = client.get("/api/map/facilities", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+    # The compressed representation has its own validator
+    gzip_etag = client.get("/api/map/facilities", headers={"Accept-Encoding": "gzip"}).headers["ETag"]
+    assert gzip_etag != etag
+    response = client.get("/api/map/facilities", headers={"Accept-Encoding": "gzip", "If-None-Match": gzip_etag})
+    assert response.status_code == 304
+
+def test_file_payload_reloads_on_change(tmp_path):
+    path = tmp_path / "layer.geojson"
+    path.write_bytes(b'{"type":"FeatureCollection","features":[]}')
+    first = http_cache.load_file_payload(str(path))
+    assert http_cache.load_file_payload(str(path)) is first
+
+    path.write_bytes(b'{"type":"FeatureCollection","features":[{}]}')
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = http_cache.load_file_payload(str(path))
+    assert second["body"] != first["body"]
+    assert second["etag"] != first["etag"]
+
+def test_missing_map_layer(client):
+    response = client.get("/api/map/safety_buffers")
+    assert response.status_code == 500
+
+def test_tolerance_levels():
+    from app.services.map_layer_service import pick_tolerance, tolerance_for_zoom, SIMPLIFY_TOLERANCES_FT
+    assert pick_tolerance(0) == 0
+    assert pick_tolerance(10) == 8.0
+    assert pick_tolerance(1e6) == max(SIMPLIFY_TOLERANCES_FT)
+    # Coarser levels at lower zoom
+    levels = [tolerance_for_zoom(zoom) for zoom in range(8, 20)]
+    assert levels == sorted(levels, reverse=True)
+    assert tolerance_for_zoom(20) == 0
+
+def test_simplified_facilities_by_zoom(client):
+    from app.services.map_layer_service import clear_pyramids
+    clear_pyramids()
+    full = client.get("/api/map/facilities?zoom=20").get_json()
+    coarse = client.get("/api/map/facilities?zoom=8").get_json()
+
+    assert len(full["features"]) == len(coarse["features"])
+    assert [f["properties"] for f in full["features"]] == [f["properties"] for f in coarse["features"]]
+    count = lambda fc: sum(len(f["geometry"]["coordinates"][0]) for f in fc["features"])
+    assert count(coarse) < count(full)
+
+    etag = client.get("/api/map/facilities?zoom=8").headers["ETag"]
+    assert client.get("/api/map/facilities?zoom=8", headers={"If-None-Match": etag}).status_code == 304
+
+def test_invalid_simplification(client):
+    assert client.get("/api/map/facilities?zoom=40").status_code == 400
+    assert client.get("/api/map/facilities?tolerance=abc").status_code == 400
+
+def test_facilities_bbox_filter(client):
+    from shapely.geometry import box, shape
+    bbox = (-84.44, 33.62, -84.42, 33.64)
+    everything = client.get("/api/map/facilities?zoom=20").get_json()["features"]
+    expected = [f["properties"]["name"] for f in everything if shape(f["geometry"]).intersects(box(*bbox))]
+
+    response = client.get("/api/map/facilities?bbox=" + ",".join(map(str, bbox)))
+    assert response.status_code == 200
+    names = [f["properties"]["name"] for f in response.get_json()["features"]]
+    assert names == expected
+    assert 0 < len(names) < len(everything)
+
+def test_facilities_amenity_filter(client):
+    features = client.get("/api/map/facilities?amenity=Cargo").get_json()["features"]
+    assert features
+    assert all(f["properties"]["amenity"] == "Cargo" for f in features)
+
+def test_filtered_layer_gzip_variant(client):
+    plain = client.get("/api/map/facilities?amenity=Cargo")
+    response = client.get("/api/map/facilities?amenity=Cargo", headers={"Accept-Encoding": "gzip"})
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(response.data) == plain.data
+
+def test_invalid_bbox(client):
+    assert client.get("/api/map/facilities?bbox=1,2,3").status_code == 400
+    assert client.get("/api/map/facilities?bbox=3,0,1,1").status_code == 400
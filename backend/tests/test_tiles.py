@@ -0,0 +1,81 @@
+# File: backend/tests/test_tiles.py
+import math
+import pytest
+from shapely.geometry import Polygon
+from app import create_app
+from app.services import buffer_zone_service, tile_service
+from app.utils import mvt
+
+# Tile over the ATL facilities at zoom 13
+ATL_LON, ATL_LAT = -84.4277, 33.6407
+
+def _tile_for(lon, lat, z):
+    n = 2 ** z
+    x = int((lon + 180) / 360 * n)
+    y = int((1 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2 * n)
+    return z, x, y
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.setattr(buffer_zone_service, "BUFFER_ZONES_PATH", str(tmp_path / "buffer_zones.geojson"))
+    buffer_zone_service.clear_buffer_zones_cache()
+    tile_service.clear_tile_cache()
+    app = create_app("testing")
+    app.config["TESTING"] = True
+    yield app.test_client()
+    buffer_zone_service.clear_buffer_zones_cache()
+    tile_service.clear_tile_cache()
+
+def test_encode_polygon_geometry():
+    # Example from the vector tile specification
+    geom_type, commands = mvt.encode_geometry(Polygon([(3, 6), (8, 12), (20, 34)]))
+    assert geom_type == mvt.GEOM_POLYGON
+    assert commands == [9, 6, 12, 18, 10, 12, 24, 44, 15]
+
+def test_encode_polygon_orients_exterior_ring():
+    counter_clockwise = Polygon([(3, 6), (20, 34), (8, 12)])
+    assert mvt.encode_geometry(counter_clockwise) == mvt.encode_geometry(Polygon([(3, 6), (8, 12), (20, 34)]))
+
+def test_tile_bounds_cover_the_world():
+    half = tile_service.WEB_MERCATOR_HALF_WORLD
+    assert tile_service.tile_bounds(0, 0, 0) == pytest.approx((-half, -half, half, half))
+    minx, miny, maxx, maxy = tile_service.tile_bounds(1, 1, 0)
+    assert (minx, miny) == pytest.approx((0, 0))
+
+@pytest.mark.parametrize("layer", ["facilities", "buffers", "available_areas"])
+def test_vector_tile_endpoint(client, layer):
+    z, x, y = _tile_for(ATL_LON, ATL_LAT, 13)
+    response = client.get(f"/api/map/tiles/{layer}/{z}/{x}/{y}.pbf")
+    assert response.status_code == 200
+    assert response.mimetype == "application/vnd.mapbox-vector-tile"
+    assert layer.encode() in response.data
+    assert len(response.data) > 100
+
+    response = client.get(f"/api/map/tiles/{layer}/{z}/{x}/{y}.pbf", headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+def test_empty_tile_outside_airport(client):
+    response = client.get("/api/map/tiles/facilities/13/0/0.pbf")
+    assert response.status_code == 200
+    assert b"facilities" in response.data
+
+def test_tiles_are_cached(client):
+    z, x, y = _tile_for(ATL_LON, ATL_LAT, 12)
+    with client.application.app_context():
+        assert tile_service.get_tile("facilities", z, x, y) is tile_service.get_tile("facilities", z, x, y)
+
+def test_invalid_tile_requests(client):
+    assert client.get("/api/map/tiles/unknown/1/0/0.pbf").status_code == 404
+    assert client.get("/api/map/tiles/facilities/1/2/0.pbf").status_code == 400
+    assert client.get("/api/map/tiles/facilities/30/0/0.pbf").status_code == 400
+
+def test_unknown_layer_error_type(client, monkeypatch):
+    with client.application.app_context():
+        with pytest.raises(tile_service.UnknownTileLayerError):
+            tile_service.get_tile("unknown", 1, 0, 0)
+
+    # The 404 follows the exception type, not its wording
+    def missing_layer(layer, z, x, y):
+        raise tile_service.UnknownTileLayerError(f"No such layer: {layer}")
+    monkeypatch.setattr("app.routes.map.get_tile", missing_layer)
+    assert client.get("/api/map/tiles/other/1/0/0.pbf").status_code == 404